@@ -0,0 +1,127 @@
+"""
+Admin user changelist latency on a large users table.
+
+Seeds ``--rows`` users straight into the table (``generate_series``, no
+password hashing), runs ``ANALYZE`` and then times the changelist page and
+a search, each twice: as configured (trigram indexes, estimated counts) and
+the old way (``COUNT(*)`` on every load, index scans disabled)::
+
+    $ DJANGO_SETTINGS_MODULE=config.settings.local \\
+        python -m benchmarks.admin_changelist --rows 2000000
+    $ DJANGO_SETTINGS_MODULE=config.settings.local \\
+        python -m benchmarks.admin_changelist --cleanup
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+
+import django
+
+from benchmarks.utils import Timings
+
+EMAIL_PREFIX = "bench-user-"
+ADMIN_EMAIL = "bench-admin@example.com"
+
+SEED_SQL = """
+INSERT INTO {table} (
+    password, is_superuser, email, is_staff, is_active, date_joined, name,
+    avatar, avatar_renditions
+)
+SELECT
+    '!', false, %(prefix)s || n || '@example.com', false, true, now(),
+    initcap(substr(md5(n::text), 1, 8)) || ' ' || initcap(substr(md5(n::text), 9, 10)),
+    '', '{{}}'
+FROM generate_series(%(start)s, %(stop)s) AS n
+"""
+
+
+def _seed(connection, table, rows):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT count(*) FROM {table} WHERE email LIKE %s",  # noqa: S608
+            [f"{EMAIL_PREFIX}%"],
+        )
+        (existing,) = cursor.fetchone()
+        if existing < rows:
+            cursor.execute(
+                SEED_SQL.format(table=table),
+                {"prefix": EMAIL_PREFIX, "start": existing + 1, "stop": rows},
+            )
+        cursor.execute(f"ANALYZE {table}")
+    return max(rows - existing, 0)
+
+
+def _time(client, url, params, iterations):
+    timings = Timings()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        request_started = time.perf_counter()
+        response = client.get(url, params)
+        timings.samples.append(time.perf_counter() - request_started)
+        if response.status_code != 200:  # noqa: PLR2004
+            timings.errors += 1
+    return timings.summary(time.perf_counter() - started)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--query", default="ab12")
+    parser.add_argument("--cleanup", action="store_true")
+    args = parser.parse_args(argv)
+
+    django.setup()
+    from django.core.paginator import Paginator
+    from django.db import connection
+    from django.db.models import Q
+    from django.test import Client
+    from django.urls import reverse
+
+    from soclone.users.admin import UserAdmin
+    from soclone.users.models import User
+
+    table = connection.ops.quote_name(User._meta.db_table)  # noqa: SLF001
+    if args.cleanup:
+        deleted, _ = User.objects.filter(
+            Q(email__startswith=EMAIL_PREFIX) | Q(email=ADMIN_EMAIL),
+        ).delete()
+        json.dump({"deleted": deleted}, sys.stdout)
+        sys.stdout.write("\n")
+        return
+
+    inserted = _seed(connection, table, args.rows)
+    admin, _ = User.objects.get_or_create(
+        email=ADMIN_EMAIL,
+        defaults={"is_staff": True, "is_superuser": True},
+    )
+    client = Client(HTTP_HOST="localhost")
+    client.force_login(admin)
+    url = reverse("admin:users_user_changelist")
+    search = {"q": args.query}
+
+    result = {
+        "rows": args.rows,
+        "inserted": inserted,
+        "changelist": _time(client, url, {}, args.iterations),
+        "search": _time(client, url, search, args.iterations),
+    }
+
+    UserAdmin.paginator = Paginator
+    UserAdmin.show_full_result_count = True
+    result["changelist_exact_count"] = _time(client, url, {}, args.iterations)
+    with connection.cursor() as cursor:
+        cursor.execute("SET enable_bitmapscan = off")
+        cursor.execute("SET enable_indexscan = off")
+    result["search_sequential_scan"] = _time(client, url, search, args.iterations)
+
+    json.dump(result, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
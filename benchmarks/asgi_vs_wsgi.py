@@ -0,0 +1,197 @@
+"""
+Requests per second and memory per connection: WSGI versus ASGI.
+
+Starts gunicorn twice on the same settings, once with ``config.wsgi`` on
+threaded sync workers and once with ``config.asgi`` on Uvicorn workers, with
+every database query delayed by ``--delay`` seconds (benchmarks.slow_upstream).
+``--concurrency`` clients then each hold a keep-alive connection and request a
+signed-in user's profile page, which reads the session, the user and the
+profile through the database.
+
+The debug toolbar middleware of config.settings.local is sync only and would
+put every async view back on a thread, so use benchmarks.settings instead::
+
+    $ DJANGO_SETTINGS_MODULE=benchmarks.settings \\
+        python -m benchmarks.asgi_vs_wsgi --concurrency 64 --delay 0.02
+
+Memory is the RSS of the server's process tree, sampled while idle and under
+load; the difference is divided by the number of connections.
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from importlib import import_module
+from pathlib import Path
+
+import django
+
+from benchmarks.utils import Timings
+from benchmarks.utils import wait_for_port
+
+BENCH_EMAIL = "bench-asgi@example.com"
+CLIENT_ERROR = 400
+SERVERS = {
+    "wsgi": ["config.wsgi:application", "--worker-class", "gthread"],
+    "asgi": [
+        "config.asgi:application",
+        "--worker-class",
+        "uvicorn.workers.UvicornWorker",
+    ],
+}
+
+
+def _session_cookie():
+    from django.conf import settings
+    from django.contrib.auth import BACKEND_SESSION_KEY
+    from django.contrib.auth import HASH_SESSION_KEY
+    from django.contrib.auth import SESSION_KEY
+    from django.contrib.auth import get_user_model
+
+    user, _ = get_user_model().objects.get_or_create(
+        email=BENCH_EMAIL,
+        defaults={"name": "Bench"},
+    )
+    session = import_module(settings.SESSION_ENGINE).SessionStore()
+    session[SESSION_KEY] = str(user.pk)
+    session[BACKEND_SESSION_KEY] = settings.AUTHENTICATION_BACKENDS[0]
+    session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+    session.create()
+    return f"{settings.SESSION_COOKIE_NAME}={session.session_key}", user
+
+
+def _rss(pid):
+    """Return the resident memory in bytes of ``pid`` and its descendants."""
+    total = 0
+    pending = [pid]
+    while pending:
+        current = pending.pop()
+        try:
+            status = Path(f"/proc/{current}/status").read_text()
+            children = Path(f"/proc/{current}/task/{current}/children").read_text()
+        except OSError:
+            continue
+        for line in status.splitlines():
+            if line.startswith("VmRSS:"):
+                total += int(line.split()[1]) * 1024
+        pending.extend(int(child) for child in children.split())
+    return total
+
+
+def _client(port, path, cookie, stop, timings):
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+    while not stop.is_set():
+        started = time.perf_counter()
+        try:
+            connection.request("GET", path, headers={"Cookie": cookie})
+            response = connection.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            timings.errors += 1
+            connection.close()
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+            continue
+        if response.status >= CLIENT_ERROR:
+            timings.errors += 1
+        else:
+            timings.samples.append(time.perf_counter() - started)
+    connection.close()
+
+
+def _run(kind, args, path, cookie):
+    command = [
+        sys.executable,
+        "-m",
+        "gunicorn",
+        *SERVERS[kind],
+        "--config",
+        "python:benchmarks.slow_upstream",
+        "--bind",
+        f"127.0.0.1:{args.port}",
+        "--workers",
+        str(args.workers),
+        "--threads",
+        str(args.threads),
+        "--log-level",
+        "warning",
+    ]
+    env = {**os.environ, "BENCH_UPSTREAM_DELAY": str(args.delay)}
+    server = subprocess.Popen(command, env=env)  # noqa: S603
+    try:
+        wait_for_port(args.port, time.monotonic() + 30)
+        # Warm up every worker before taking the idle sample.
+        warmup = Timings()
+        stop = threading.Event()
+        threading.Timer(2, stop.set).start()
+        _client(args.port, path, cookie, stop, warmup)
+        idle = _rss(server.pid)
+
+        timings = Timings()
+        stop = threading.Event()
+        clients = [
+            threading.Thread(
+                target=_client,
+                args=(args.port, path, cookie, stop, timings),
+            )
+            for _ in range(args.concurrency)
+        ]
+        started = time.perf_counter()
+        for client in clients:
+            client.start()
+        peak = idle
+        while time.perf_counter() - started < args.duration:
+            time.sleep(0.2)
+            peak = max(peak, _rss(server.pid))
+        stop.set()
+        for client in clients:
+            client.join()
+        summary = timings.summary(time.perf_counter() - started)
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+    summary["rss_idle_mb"] = idle / 2**20
+    summary["rss_peak_mb"] = peak / 2**20
+    summary["rss_per_connection_kb"] = (peak - idle) / args.concurrency / 1024
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=15)
+    parser.add_argument("--delay", type=float, default=0.02)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=4,
+        help="Threads per WSGI worker (ignored by Uvicorn workers).",
+    )
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--only", choices=sorted(SERVERS))
+    args = parser.parse_args(argv)
+
+    django.setup()
+    cookie, user = _session_cookie()
+    path = user.get_absolute_url()
+
+    result = {
+        "concurrency": args.concurrency,
+        "upstream_delay_ms": args.delay * 1000,
+        "workers": args.workers,
+    }
+    for kind in [args.only] if args.only else SERVERS:
+        result[kind] = _run(kind, args, path, cookie)
+    json.dump(result, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+Celery beat CPU time and database queries per minute on a large schedule.
+
+Seeds ``--schedules`` interval tasks (every minute to every hour, spread over
+their interval) and runs each scheduler in turn for ``--duration`` seconds the
+way ``celery beat`` does: ``tick()``, sleep for the interval it returns, sync
+when it's time. Every ``60 / --changes-per-minute`` seconds a random task's
+arguments are edited. Tasks that come due are counted rather than sent, so the
+broker isn't measured::
+
+    $ DJANGO_SETTINGS_MODULE=config.settings.local \\
+        python -m benchmarks.beat --schedules 10000 --duration 120
+    $ DJANGO_SETTINGS_MODULE=config.settings.local python -m benchmarks.beat --cleanup
+
+Queries are those of the scheduler, not of the edits; ``startup`` is the cost
+of loading the schedule.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from datetime import timedelta
+
+import django
+
+NAME_PREFIX = "bench-beat-"
+TASK = "soclone.users.tasks.get_users_count"
+# Intervals of the seeded tasks, in seconds.
+INTERVALS = (60, 300, 600, 900, 1800, 3600)
+SCHEDULERS = {
+    "database": "django_celery_beat.schedulers:DatabaseScheduler",
+    "cached": "soclone.core.beat:CachedDatabaseScheduler",
+}
+
+
+def _seed(count, seed):
+    from django.utils import timezone
+    from django_celery_beat.models import IntervalSchedule
+    from django_celery_beat.models import PeriodicTask
+
+    existing = PeriodicTask.objects.filter(name__startswith=NAME_PREFIX).count()
+    if existing >= count:
+        return
+    rng = random.Random(seed)
+    intervals = [
+        IntervalSchedule.objects.get_or_create(
+            every=every,
+            period=IntervalSchedule.SECONDS,
+        )[0]
+        for every in INTERVALS
+    ]
+    now = timezone.now()
+    tasks = []
+    for n in range(existing, count):
+        interval = rng.choice(intervals)
+        tasks.append(
+            PeriodicTask(
+                name=f"{NAME_PREFIX}{n:06d}",
+                task=TASK,
+                interval=interval,
+                last_run_at=now - timedelta(seconds=rng.uniform(0, interval.every)),
+            ),
+        )
+    PeriodicTask.objects.bulk_create(tasks, batch_size=1000)
+
+
+def _cleanup():
+    from django_celery_beat.models import PeriodicTask
+
+    deleted, _ = PeriodicTask.objects.filter(name__startswith=NAME_PREFIX).delete()
+    return deleted
+
+
+def _edit(rng):
+    from django_celery_beat.models import PeriodicTask
+
+    task = (
+        PeriodicTask.objects.filter(name__startswith=NAME_PREFIX).order_by("?").first()
+    )
+    task.args = json.dumps([rng.randrange(1000)])
+    task.save()
+
+
+def _run(path, duration, changes_per_minute, seed):
+    from celery.utils.imports import symbol_by_name
+
+    from config.celery_app import app
+    from soclone.core.testing import record_queries
+
+    scheduler_class = symbol_by_name(path)
+    rng = random.Random(seed)
+    sent = 0
+
+    def count(entry, producer=None):
+        nonlocal sent
+        sent += 1
+
+    cpu, started = time.process_time(), time.perf_counter()
+    with record_queries() as recorder:
+        scheduler = scheduler_class(app=app, lazy=False)
+        scheduler.producer = None
+        scheduler.apply_entry = count
+    startup = {
+        "seconds": time.perf_counter() - started,
+        "cpu_seconds": time.process_time() - cpu,
+        "queries": len(recorder),
+    }
+
+    edit_every = 60 / changes_per_minute if changes_per_minute else None
+    next_edit = time.monotonic() + (edit_every or duration)
+    cpu, queries = 0.0, 0
+    started = time.monotonic()
+    deadline = started + duration
+    while (now := time.monotonic()) < deadline:
+        if edit_every and now >= next_edit:
+            _edit(rng)
+            next_edit += edit_every
+        before = time.process_time()
+        with record_queries() as recorder:
+            interval = scheduler.tick()
+            if scheduler.should_sync():
+                scheduler._do_sync()  # noqa: SLF001
+        cpu += time.process_time() - before
+        queries += len(recorder)
+        if interval:
+            time.sleep(max(0, min(interval, deadline - now, next_edit - now)))
+    scheduler.close()
+    minutes = (time.monotonic() - started) / 60
+    return {
+        "startup": startup,
+        "cpu_seconds_per_minute": cpu / minutes,
+        "queries_per_minute": queries / minutes,
+        "sent_per_minute": sent / minutes,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--schedules", type=int, default=10_000)
+    parser.add_argument("--duration", type=float, default=60, help="Per scheduler.")
+    parser.add_argument("--changes-per-minute", type=float, default=6)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--only", action="append", choices=sorted(SCHEDULERS))
+    parser.add_argument("--cleanup", action="store_true")
+    args = parser.parse_args(argv)
+
+    django.setup()
+    if args.cleanup:
+        json.dump({"deleted": _cleanup()}, sys.stdout)
+        sys.stdout.write("\n")
+        return
+    _seed(args.schedules, args.seed)
+    result = {
+        "schedules": args.schedules,
+        "duration": args.duration,
+        "changes_per_minute": args.changes_per_minute,
+        "schedulers": {
+            name: _run(
+                SCHEDULERS[name],
+                args.duration,
+                args.changes_per_minute,
+                args.seed,
+            )
+            for name in args.only or SCHEDULERS
+        },
+    }
+    json.dump(result, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Per-request cache overhead: plain django_redis versus the two-tier cache.
+
+Each simulated request reads ``--keys`` hot keys, as the session user, feature
+switches and counters are read on every page. Point ``--location`` at a real
+Redis to include network round trips; ``--fake`` uses an in-process fakeredis
+server, which only measures client-side costs::
+
+    $ DJANGO_SETTINGS_MODULE=config.settings.local \\
+        python -m benchmarks.cache_overhead --location redis://localhost:6379/1
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from typing import Any
+
+import django
+
+from benchmarks.utils import Timings
+
+
+def _options(args):
+    options: dict[str, Any] = {"CLIENT_CLASS": "django_redis.client.DefaultClient"}
+    if args.fake:
+        import fakeredis
+
+        options["CONNECTION_POOL_KWARGS"] = {
+            "connection_class": fakeredis.FakeConnection,
+            "server": fakeredis.FakeServer(),
+        }
+    return options
+
+
+def _run(cache, keys, requests):
+    cache.set_many({key: {"key": key, "payload": "x" * 200} for key in keys})
+    timings = Timings()
+    started = time.perf_counter()
+    for _ in range(requests):
+        request_started = time.perf_counter()
+        for key in keys:
+            cache.get(key)
+        timings.samples.append(time.perf_counter() - request_started)
+    summary = timings.summary(time.perf_counter() - started)
+    cache.delete_many(keys)
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--location", default="redis://localhost:6379/1")
+    parser.add_argument("--fake", action="store_true")
+    parser.add_argument("--keys", type=int, default=5)
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args(argv)
+
+    django.setup()
+    from django_redis.cache import RedisCache
+
+    from soclone.core.cache.backends import TwoTierCache
+
+    options = _options(args)
+    keys = [f"bench:hot:{n}" for n in range(args.keys)]
+    redis_cache = RedisCache(args.location, {"OPTIONS": options})
+    two_tier = TwoTierCache(args.location, {"OPTIONS": options})
+    deadline = time.monotonic() + 5
+    while not two_tier.local.connected and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    result = {
+        "keys_per_request": args.keys,
+        "redis": _run(redis_cache, keys, args.requests),
+        "two_tier": _run(two_tier, keys, args.requests),
+        "two_tier_stats": two_tier.stats(),
+    }
+    json.dump(result, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
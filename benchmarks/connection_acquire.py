@@ -0,0 +1,90 @@
+"""
+Connection-acquire latency with and without the psycopg pool backend.
+
+Every thread repeatedly opens a connection, runs ``SELECT 1`` and closes it,
+the way a request does with ``CONN_MAX_AGE = 0``. Without the pool each
+acquire pays TCP setup and authentication; with it, connections are borrowed
+from ``soclone.core.db.backends.postgresql_pool``::
+
+    $ DJANGO_SETTINGS_MODULE=config.settings.local \\
+        python -m benchmarks.connection_acquire --threads 32 --iterations 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import threading
+import time
+
+import django
+
+from benchmarks.utils import Timings
+
+
+def _run(wrapper_class, settings_dict, threads, iterations):
+    acquire = Timings()
+
+    def worker():
+        # Threads share one alias, just like request threads share "default";
+        # it must be a configured alias for django.contrib.postgres' handlers.
+        wrapper = wrapper_class(settings_dict)
+        for _ in range(iterations):
+            started = time.perf_counter()
+            wrapper.ensure_connection()
+            acquire.samples.append(time.perf_counter() - started)
+            with wrapper.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            wrapper.close()
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return acquire.summary(time.perf_counter() - started)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--pool-size", type=int, default=8)
+    args = parser.parse_args(argv)
+
+    django.setup()
+    from django.db import connection
+    from django.db.backends.postgresql.base import DatabaseWrapper
+
+    from soclone.core.db.backends.postgresql_pool import base as pooled
+    from soclone.core.db.backends.postgresql_pool.base import pool_stats
+
+    settings_dict = {**connection.settings_dict, "CONN_MAX_AGE": 0}
+    pooled_settings_dict = {
+        **settings_dict,
+        "OPTIONS": {
+            **settings_dict["OPTIONS"],
+            "pool": {"min_size": args.pool_size, "max_size": args.pool_size},
+        },
+    }
+    result = {
+        "threads": args.threads,
+        "iterations": args.iterations,
+        "direct": _run(DatabaseWrapper, settings_dict, args.threads, args.iterations),
+        "pooled": _run(
+            pooled.DatabaseWrapper,
+            pooled_settings_dict,
+            args.threads,
+            args.iterations,
+        ),
+        "pool_stats": pool_stats(),
+    }
+    pooled.close_pools()
+    json.dump(result, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
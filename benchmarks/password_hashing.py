@@ -0,0 +1,98 @@
+"""
+Page latency under a concurrent login load.
+
+Start the site twice, once as-is and once with
+``DJANGO_PASSWORD_HASHING_POOL=True``, and run this script against each::
+
+    $ python -m benchmarks.password_hashing --base-url http://127.0.0.1:8000 \\
+        --email bench@example.com --password ... --label baseline > baseline.json
+    $ python -m benchmarks.password_hashing ... --label pooled > pooled.json
+
+Login threads keep posting the sign in form (every attempt runs Argon2 once)
+while page threads request ``--page`` and record their latency; compare the
+``pages`` p50/p99 of both runs.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import threading
+import time
+
+from benchmarks.utils import Client
+from benchmarks.utils import Timings
+
+SERVER_ERROR = 500
+
+
+def _worker(stop, timings, action):
+    while not stop.is_set():
+        try:
+            status, _, _, seconds = action()
+        except OSError:
+            timings.errors += 1
+            time.sleep(0.1)
+            continue
+        if status >= SERVER_ERROR:
+            timings.errors += 1
+        else:
+            timings.samples.append(seconds)
+
+
+def run(args) -> dict:
+    logins, pages = Timings(), Timings()
+    stop = threading.Event()
+    threads = []
+    for _ in range(args.logins):
+        client = Client(args.base_url)
+        threads.append(
+            threading.Thread(
+                target=_worker,
+                args=(
+                    stop,
+                    logins,
+                    lambda c=client: c.login(args.email, args.password),
+                ),
+            ),
+        )
+    for _ in range(args.pages):
+        client = Client(args.base_url)
+        threads.append(
+            threading.Thread(
+                target=_worker,
+                args=(stop, pages, lambda c=client: c.request(args.page)),
+            ),
+        )
+    for thread in threads:
+        thread.start()
+    time.sleep(args.duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return {
+        "label": args.label,
+        "duration": args.duration,
+        "logins": logins.summary(args.duration),
+        "pages": pages.summary(args.duration),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--page", default="/about/")
+    parser.add_argument("--logins", type=int, default=16, help="Login threads.")
+    parser.add_argument("--pages", type=int, default=4, help="Page view threads.")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds.")
+    parser.add_argument("--label", default="run")
+    result = run(parser.parse_args(argv))
+    json.dump(result, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,331 @@
+"""
+Throughput, latency and database queries per request of the main routes.
+
+Seeds ``--users`` users (verified addresses, one shared password hash),
+starts gunicorn with the ``web`` command of the ``Procfile`` and drives each
+route in turn with ``--concurrency`` clients for ``--duration`` seconds:
+
+- ``home``, ``about``: anonymous GETs;
+- ``users:detail``: signed-in users opening other users' profiles;
+- ``users:update``: signed-in users posting the profile form;
+- ``account_login``: new sessions posting the sign in form;
+- ``account_signup``: new sessions signing up with fresh addresses.
+
+Queries per request are read from the ``Server-Timing`` header, which the
+server sends to clients holding the metrics token. Run it against a local
+Postgres (and Redis, with ``REDIS_URL``) and keep the JSON of each commit to
+compare them::
+
+    $ DJANGO_SETTINGS_MODULE=benchmarks.settings \\
+        python -m benchmarks.routes --users 1000 > before.json
+    $ DJANGO_SETTINGS_MODULE=benchmarks.settings \\
+        python -m benchmarks.routes --users 1000 --compare before.json > after.json
+    $ DJANGO_SETTINGS_MODULE=benchmarks.settings python -m benchmarks.routes --cleanup
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import os
+import re
+import secrets
+import shlex
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import django
+
+from benchmarks.utils import Client
+from benchmarks.utils import Timings
+from benchmarks.utils import wait_for_port
+
+EMAIL_PREFIX = "bench-route-"
+SIGNUP_PREFIX = "bench-signup-"
+PASSWORD = "bench-route-password"  # noqa: S105
+PROCFILE = Path(__file__).resolve().parent.parent / "Procfile"
+QUERIES_RE = re.compile(r'db;[^,]*desc="(\d+) queries"')
+CLIENT_ERROR = 400
+# Seeded users are inserted in batches of this size.
+BATCH_SIZE = 1000
+
+
+def _web_command():
+    """The ``web`` process of the Procfile, as an argument list."""
+    for line in PROCFILE.read_text().splitlines():
+        name, _, command = line.partition(":")
+        if name.strip() == "web":
+            return shlex.split(command)
+    msg = f"No web process in {PROCFILE}."
+    raise RuntimeError(msg)
+
+
+def _seed(rows):
+    """Create users up to ``rows``; return their pks and emails."""
+    from allauth.account.models import EmailAddress
+    from django.contrib.auth.hashers import make_password
+    from django.db import transaction
+
+    from soclone.users.models import User
+
+    existing = set(
+        User.objects.filter(email__startswith=EMAIL_PREFIX).values_list(
+            "email",
+            flat=True,
+        ),
+    )
+    # Hash once: every seeded user shares the password.
+    password = make_password(PASSWORD)
+    missing = (
+        email
+        for email in (f"{EMAIL_PREFIX}{n}@example.com" for n in range(rows))
+        if email not in existing
+    )
+    while batch := list(itertools.islice(missing, BATCH_SIZE)):
+        # Not built by UserFactory, whose password hook hashes every user.
+        users = [
+            User(email=email, name=email.partition("@")[0], password=password)
+            for email in batch
+        ]
+        with transaction.atomic():
+            User.objects.bulk_create(users)
+            EmailAddress.objects.bulk_create(
+                EmailAddress(user=user, email=user.email, verified=True, primary=True)
+                for user in users
+            )
+    return list(
+        User.objects.filter(email__startswith=EMAIL_PREFIX)
+        .order_by("pk")
+        .values_list("pk", "email")[:rows],
+    )
+
+
+def _cleanup():
+    from django.db.models import Q
+
+    from soclone.users.models import User
+
+    deleted, _ = User.objects.filter(
+        Q(email__startswith=EMAIL_PREFIX) | Q(email__startswith=SIGNUP_PREFIX),
+    ).delete()
+    return deleted
+
+
+class Session:
+    """One simulated client, with its own cookies and seeded user."""
+
+    def __init__(self, base_url, token, user, users):
+        self.base_url = base_url
+        self.headers = {"Authorization": f"Bearer {token}"}
+        self.pk, self.email = user
+        self.others = itertools.cycle(pk for pk, _ in users if pk != self.pk)
+        self.client = self._client()
+        self.signed_in = False
+        self.update_token = ""
+
+    def _client(self):
+        return Client(self.base_url, follow_redirects=False)
+
+    def _get(self, client, path):
+        return client.request(path, headers=self.headers)
+
+    def _post(self, client, path, data):
+        headers = {**self.headers, "Referer": f"{self.base_url}{path}"}
+        token = client.csrf_token(path)
+        return client.request(path, {"csrfmiddlewaretoken": token, **data}, headers)
+
+    def sign_in(self):
+        if not self.signed_in:
+            self._post(
+                self.client,
+                "/accounts/login/",
+                {"login": self.email, "password": PASSWORD},
+            )
+            self.signed_in = True
+            self.update_token = self.client.csrf_token("/users/~update/")
+
+    # Routes: each returns (status, headers, body, seconds) of the timed
+    # request.
+
+    def home(self):
+        return self._get(self.client, "/")
+
+    def about(self):
+        return self._get(self.client, "/about/")
+
+    def users_detail(self):
+        return self._get(self.client, f"/users/{next(self.others)}/")
+
+    def users_update(self):
+        path = "/users/~update/"
+        return self.client.request(
+            path,
+            {"csrfmiddlewaretoken": self.update_token, "name": secrets.token_hex(4)},
+            {**self.headers, "Referer": f"{self.base_url}{path}"},
+        )
+
+    def account_login(self):
+        # A new session every time, as a returning visitor would have.
+        return self._post(
+            self._client(),
+            "/accounts/login/",
+            {"login": self.email, "password": PASSWORD},
+        )
+
+    def account_signup(self):
+        return self._post(
+            self._client(),
+            "/accounts/signup/",
+            {
+                "email": f"{SIGNUP_PREFIX}{secrets.token_hex(8)}@example.com",
+                "password1": PASSWORD,
+                "password2": PASSWORD,
+            },
+        )
+
+
+# URL name: (Session method, whether the client signs in first).
+ROUTES = {
+    "home": ("home", False),
+    "about": ("about", False),
+    "users:detail": ("users_detail", True),
+    "users:update": ("users_update", True),
+    "account_login": ("account_login", False),
+    "account_signup": ("account_signup", False),
+}
+
+
+def _drive(action, stop, timings):
+    while not stop.is_set():
+        try:
+            status, headers, _, seconds = action()
+        except OSError:
+            timings.errors += 1
+            time.sleep(0.1)
+            continue
+        if status >= CLIENT_ERROR:
+            timings.errors += 1
+            continue
+        timings.samples.append(seconds)
+        match = QUERIES_RE.search(headers.get("Server-Timing", ""))
+        if match:
+            timings.queries.append(int(match.group(1)))
+
+
+def _run_route(sessions, method, duration):
+    timings = Timings()
+    stop = threading.Event()
+    threads = [
+        threading.Thread(target=_drive, args=(getattr(s, method), stop, timings))
+        for s in sessions
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return timings.summary(time.perf_counter() - started)
+
+
+def _compare(result, baseline):
+    """Relative change of each route's numbers against an earlier run."""
+    changes = {}
+    for name, summary in result["routes"].items():
+        before = baseline.get("routes", {}).get(name)
+        if not before:
+            continue
+        changes[name] = {
+            key: (summary[key] - before[key]) / before[key]
+            for key in ("rps", "p50_ms", "p95_ms", "p99_ms", "queries_per_request")
+            if before.get(key) and key in summary
+        }
+    return changes
+
+
+def _commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],  # noqa: S603, S607
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=1000, help="Users to seed.")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10, help="Per route.")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--only", action="append", choices=sorted(ROUTES))
+    parser.add_argument("--compare", type=Path, help="JSON of an earlier run.")
+    parser.add_argument("--cleanup", action="store_true")
+    args = parser.parse_args(argv)
+
+    django.setup()
+    if args.cleanup:
+        json.dump({"deleted": _cleanup()}, sys.stdout)
+        sys.stdout.write("\n")
+        return
+    if args.users <= args.concurrency:
+        parser.error("--users has to be larger than --concurrency.")
+    users = _seed(args.users)
+
+    token = secrets.token_urlsafe()
+    command = [
+        *_web_command(),
+        "--bind",
+        f"127.0.0.1:{args.port}",
+        "--workers",
+        str(args.workers),
+        "--log-level",
+        "warning",
+    ]
+    env = {**os.environ, "DJANGO_METRICS_TOKEN": token}
+    server = subprocess.Popen(command, env=env)  # noqa: S603
+    base_url = f"http://127.0.0.1:{args.port}"
+    routes = {}
+    try:
+        wait_for_port(args.port, time.monotonic() + 30)
+        sessions = [
+            Session(base_url, token, user, users) for user in users[: args.concurrency]
+        ]
+        for name in args.only or ROUTES:
+            method, signed_in = ROUTES[name]
+            for session in sessions:
+                if signed_in:
+                    session.sign_in()
+                # Warm up the worker's connections and caches.
+                getattr(session, method)()
+            routes[name] = _run_route(sessions, method, args.duration)
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    result = {
+        "commit": _commit(),
+        "settings": os.environ.get("DJANGO_SETTINGS_MODULE"),
+        "command": shlex.join(command),
+        "users": args.users,
+        "concurrency": args.concurrency,
+        "duration": args.duration,
+        "routes": routes,
+    }
+    if args.compare:
+        result["change"] = _compare(result, json.loads(args.compare.read_text()))
+    json.dump(result, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+"""
+Settings for benchmarks that start their own servers.
+
+config.settings.test without the debug toolbar and with local hosts allowed,
+but with the production password hasher and, with ``REDIS_URL``, the
+production cache.
+"""
+
+from config.settings.base import PASSWORD_HASHERS as BASE_PASSWORD_HASHERS
+from config.settings.base import env
+from config.settings.test import *  # noqa: F403
+
+ALLOWED_HOSTS = ["127.0.0.1", "localhost"]
+# Sign in costs what it does in production.
+PASSWORD_HASHERS = BASE_PASSWORD_HASHERS
+
+if env("REDIS_URL", default=""):
+    CACHES = {
+        "default": {
+            "BACKEND": "soclone.core.cache.backends.TwoTierCache",
+            "LOCATION": env("REDIS_URL"),
+            "OPTIONS": {
+                "CLIENT_CLASS": "django_redis.client.DefaultClient",
+                "IGNORE_EXCEPTIONS": True,
+            },
+        },
+    }
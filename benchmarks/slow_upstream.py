@@ -0,0 +1,31 @@
+"""
+Gunicorn configuration that delays every database query.
+
+Simulates a slow upstream (a remote or overloaded Postgres) for benchmarks::
+
+    $ BENCH_UPSTREAM_DELAY=0.02 gunicorn config.wsgi:application \\
+        -c python:benchmarks.slow_upstream
+
+The delay is a blocking sleep in the thread running the query, like waiting
+on a socket.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+
+
+def _delay_query(execute, sql, params, many, context):
+    time.sleep(float(os.environ.get("BENCH_UPSTREAM_DELAY", "0")))
+    return execute(sql, params, many, context)
+
+
+def _install(sender, connection, **kwargs):
+    connection.execute_wrappers.append(_delay_query)
+
+
+def post_worker_init(worker):
+    from django.db.backends.signals import connection_created
+
+    connection_created.connect(_install, weak=False)
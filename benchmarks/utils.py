@@ -0,0 +1,116 @@
+"""Helpers shared by the benchmark scripts."""
+
+from __future__ import annotations
+
+import http.cookiejar
+import re
+import socket
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from dataclasses import dataclass
+from dataclasses import field
+
+CSRF_INPUT_RE = re.compile(r'name="csrfmiddlewaretoken" value="([^"]+)"')
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Return the ``q``-th percentile (0-100) using nearest-rank."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(q / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+@dataclass
+class Timings:
+    """Latency samples (seconds) and error count for one kind of request."""
+
+    samples: list[float] = field(default_factory=list)
+    errors: int = 0
+    # Database queries per request, when the server reports them.
+    queries: list[int] = field(default_factory=list)
+
+    def summary(self, duration: float | None = None) -> dict[str, float]:
+        result = {
+            "requests": len(self.samples),
+            "errors": self.errors,
+            "p50_ms": percentile(self.samples, 50) * 1000,
+            "p95_ms": percentile(self.samples, 95) * 1000,
+            "p99_ms": percentile(self.samples, 99) * 1000,
+        }
+        if duration:
+            result["rps"] = len(self.samples) / duration
+        if self.queries:
+            result["queries_per_request"] = sum(self.queries) / len(self.queries)
+        return result
+
+
+def wait_for_port(port: int, deadline: float) -> None:
+    """Wait until a server accepts connections on ``port`` of localhost."""
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+        except OSError:
+            time.sleep(0.1)
+        else:
+            return
+    msg = f"Server on port {port} did not start."
+    raise RuntimeError(msg)
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class Client:
+    """Minimal cookie-aware HTTP client built on ``urllib``."""
+
+    def __init__(
+        self,
+        base_url: str,
+        timeout: float = 30,
+        *,
+        follow_redirects: bool = True,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.cookies = http.cookiejar.CookieJar()
+        handlers: list[urllib.request.BaseHandler] = [
+            urllib.request.HTTPCookieProcessor(self.cookies),
+        ]
+        if not follow_redirects:
+            # Redirects are then returned like errors, with their status.
+            handlers.append(_NoRedirect())
+        self.opener = urllib.request.build_opener(*handlers)
+
+    def request(self, path: str, data: dict | None = None, headers=None):
+        """Return ``(status, headers, body, seconds)`` for one request."""
+        url = f"{self.base_url}{path}"
+        body = urllib.parse.urlencode(data).encode() if data is not None else None
+        request = urllib.request.Request(url, data=body, headers=headers or {})  # noqa: S310
+        started = time.perf_counter()
+        try:
+            with self.opener.open(request, timeout=self.timeout) as response:
+                content = response.read()
+                status, response_headers = response.status, response.headers
+        except urllib.error.HTTPError as error:
+            content = error.read()
+            status, response_headers = error.code, error.headers
+        return status, response_headers, content, time.perf_counter() - started
+
+    def csrf_token(self, path: str) -> str:
+        _, _, content, _ = self.request(path)
+        match = CSRF_INPUT_RE.search(content.decode())
+        return match.group(1) if match else ""
+
+    def login(self, email: str, password: str, path: str = "/accounts/login/"):
+        token = self.csrf_token(path)
+        return self.request(
+            path,
+            {"csrfmiddlewaretoken": token, "login": email, "password": password},
+            headers={"Referer": f"{self.base_url}{path}"},
+        )
@@ -0,0 +1,39 @@
+# ruff: noqa
+"""
+ASGI config for Stack Overflow Clone project.
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+The Procfile's web process serves it with Uvicorn workers under gunicorn::
+
+    gunicorn config.asgi:application -k uvicorn.workers.UvicornWorker
+
+Async views (the home page, user profiles) then wait on the database, Redis
+or S3 without holding a worker; sync views run in a thread pool. Compare it
+with config/wsgi.py for your workload with benchmarks/asgi_vs_wsgi.py.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/dev/howto/deployment/asgi/
+
+"""
+
+import os
+import sys
+from pathlib import Path
+
+from django.core.asgi import get_asgi_application
+
+# This allows easy placement of apps within the interior
+# soclone directory.
+BASE_DIR = Path(__file__).resolve(strict=True).parent.parent
+sys.path.append(str(BASE_DIR / "soclone"))
+# We defer to a DJANGO_SETTINGS_MODULE already in the environment.
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.production")
+
+# This application object is used by any ASGI server configured to use this
+# file.
+application = get_asgi_application()
+# Serve collected static files (precompressed, content-hashed) without going
+# through Django; see soclone.core.staticfiles.
+from soclone.core.staticfiles import static_asgi_application
+
+application = static_asgi_application(application)
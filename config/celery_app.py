@@ -1,6 +1,9 @@
 import os
 
 from celery import Celery
+from celery import signals
+
+from soclone.core import metrics
 
 # set the default Django settings module for the 'celery' program.
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.local")
@@ -15,3 +18,26 @@ app.config_from_object("django.conf:settings", namespace="CELERY")
 
 # Load task modules from all registered Django app configs.
 app.autodiscover_tasks()
+
+# Task metrics (soclone.core.metrics). Run the worker with
+# PROMETHEUS_MULTIPROC_DIR set so the pool processes share them.
+signals.before_task_publish.connect(metrics.task_published, weak=False)
+signals.task_prerun.connect(metrics.task_started, weak=False)
+signals.task_postrun.connect(metrics.task_finished, weak=False)
+signals.task_retry.connect(metrics.task_retried, weak=False)
+
+
+@signals.worker_init.connect
+def _start_metrics(**kwargs):
+    # In the main worker process, before the pool is forked.
+    metrics.reset_multiprocess_dir()
+    port = os.environ.get("CELERY_METRICS_PORT")
+    if port:
+        from prometheus_client import start_http_server
+
+        start_http_server(int(port), registry=metrics.registry())
+
+
+@signals.worker_process_shutdown.connect
+def _forget_pool_process(pid=None, **kwargs):
+    metrics.mark_process_dead(pid or os.getpid())
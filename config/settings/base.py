@@ -4,6 +4,7 @@
 from pathlib import Path
 
 import environ
+from kombu import Queue
 
 BASE_DIR = Path(__file__).resolve(strict=True).parent.parent.parent
 # soclone/
@@ -53,6 +54,21 @@ DATABASES = {
     ),
 }
 DATABASES["default"]["ATOMIC_REQUESTS"] = True
+# Read replicas, e.g. postgres://replica-1/soclone,postgres://replica-2/soclone
+DATABASE_REPLICAS = []
+for index, url in enumerate(env.list("DATABASE_REPLICA_URLS", default=[])):
+    alias = f"replica_{index}"
+    DATABASES[alias] = env.db_url_config(url)
+    DATABASES[alias]["TEST"] = {"MIRROR": "default"}
+    DATABASE_REPLICAS.append(alias)
+# https://docs.djangoproject.com/en/dev/ref/settings/#database-routers
+DATABASE_ROUTERS = ["soclone.core.db.routing.ReplicaRouter"]
+# Seconds a client reads from the primary after a request of theirs wrote.
+DATABASE_REPLICA_PIN_SECONDS = env.int("DATABASE_REPLICA_PIN_SECONDS", default=5)
+DATABASE_REPLICA_PIN_COOKIE_NAME = "db_pin"
+# Replicas lagging more than this many seconds are skipped (None disables it).
+DATABASE_REPLICA_MAX_LAG = env.float("DATABASE_REPLICA_MAX_LAG", default=2.0)
+DATABASE_REPLICA_LAG_CHECK_INTERVAL = 5
 # https://docs.djangoproject.com/en/stable/ref/settings/#std:setting-DEFAULT_AUTO_FIELD
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
@@ -74,6 +90,7 @@ DJANGO_APPS = [
     "django.contrib.staticfiles",
     # "django.contrib.humanize", # Handy template tags
     "django.contrib.admin",
+    "django.contrib.postgres",
     "django.forms",
 ]
 THIRD_PARTY_APPS = [
@@ -86,7 +103,12 @@ THIRD_PARTY_APPS = [
 ]
 
 LOCAL_APPS = [
+    "soclone.core",
     "soclone.users",
+    "soclone.mail",
+    "soclone.stats",
+    "soclone.jobs",
+    "soclone.questions",
     # Your stuff: custom apps go here
 ]
 # https://docs.djangoproject.com/en/dev/ref/settings/#installed-apps
@@ -101,9 +123,11 @@ MIGRATION_MODULES = {"sites": "soclone.contrib.sites.migrations"}
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#authentication-backends
 AUTHENTICATION_BACKENDS = [
-    "django.contrib.auth.backends.ModelBackend",
-    "allauth.account.auth_backends.AuthenticationBackend",
+    "soclone.users.backends.CachedModelBackend",
+    "soclone.users.backends.CachedAuthenticationBackend",
 ]
+# Seconds a user loaded for a session stays cached; saves invalidate it sooner.
+USER_CACHE_TIMEOUT = env.int("DJANGO_USER_CACHE_TIMEOUT", default=300)
 # https://docs.djangoproject.com/en/dev/ref/settings/#auth-user-model
 AUTH_USER_MODEL = "users.User"
 # https://docs.djangoproject.com/en/dev/ref/settings/#login-redirect-url
@@ -121,6 +145,25 @@ PASSWORD_HASHERS = [
     "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
     "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
 ]
+# Run Argon2 in a bounded per-process pool instead of the request thread.
+# Every web worker gets its own pool of PASSWORD_HASHING_POOL_SIZE processes.
+if env.bool("DJANGO_PASSWORD_HASHING_POOL", default=False):
+    PASSWORD_HASHERS[0] = "soclone.users.hashers.PooledArgon2PasswordHasher"
+PASSWORD_HASHING_POOL_SIZE = env.int("DJANGO_PASSWORD_HASHING_POOL_SIZE", default=2)
+# Calls allowed to wait on the pool before new ones are rejected with a 503.
+# The bound is per web process: each Uvicorn worker of the Procfile runs every
+# sync view in a thread of its own, so a burst of sign-ins reaches it there.
+# Under sync WSGI workers, one request at a time each, it never would.
+PASSWORD_HASHING_POOL_MAX_PENDING = env.int(
+    "DJANGO_PASSWORD_HASHING_POOL_MAX_PENDING",
+    default=8,
+)
+# Seconds a call may wait for a pending slot before it is rejected.
+PASSWORD_HASHING_POOL_TIMEOUT = env.float(
+    "DJANGO_PASSWORD_HASHING_POOL_TIMEOUT",
+    default=0.5,
+)
+PASSWORD_HASHING_POOL_RETRY_AFTER = 1
 # https://docs.djangoproject.com/en/dev/ref/settings/#auth-password-validators
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -131,11 +174,19 @@ AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.NumericPasswordValidator"},
 ]
 
+# PAGE CACHE
+# ------------------------------------------------------------------------------
+# Cache holding pages rendered for anonymous visitors (soclone.core.pagecache).
+PAGE_CACHE_ALIAS = "default"
+PAGE_CACHE_TIMEOUT = env.int("DJANGO_PAGE_CACHE_TIMEOUT", default=300)
+
 # MIDDLEWARE
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#middleware
 MIDDLEWARE = [
+    "soclone.core.middleware.ServerTimingMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "soclone.core.middleware.ReplicaRoutingMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.locale.LocaleMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -144,8 +195,22 @@ MIDDLEWARE = [
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "allauth.account.middleware.AccountMiddleware",
+    "soclone.users.middleware.PasswordHashingBackpressureMiddleware",
 ]
 
+# Bearer token that lets a scraper read /metrics/ without a staff session;
+# empty means staff only.
+METRICS_TOKEN = env("DJANGO_METRICS_TOKEN", default="")
+# PROMETHEUS_MULTIPROC_DIR of each Celery worker in the Procfile, which
+# /metrics/ adds to the web processes' metrics.
+METRICS_WORKER_DIRS = env.list(
+    "DJANGO_METRICS_WORKER_DIRS",
+    default=[
+        f"/tmp/soclone-metrics-{queue}"  # noqa: S108
+        for queue in ("interactive", "bulk", "scheduled")
+    ],
+)
+
 # STATIC
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#static-root
@@ -159,6 +224,14 @@ STATICFILES_FINDERS = [
     "django.contrib.staticfiles.finders.FileSystemFinder",
     "django.contrib.staticfiles.finders.AppDirectoriesFinder",
 ]
+# Serve STATIC_ROOT from config/wsgi.py and config/asgi.py
+# (soclone.core.staticfiles).
+STATIC_WSGI_HANDLER = env.bool("DJANGO_STATIC_WSGI_HANDLER", default=False)
+# Cache lifetime, in seconds, of static files without a content hash in the name.
+STATIC_MAX_AGE = env.int("DJANGO_STATIC_MAX_AGE", default=60)
+# Load Bootstrap from soclone/static/vendor rather than cdnjs; populate it with
+# "manage.py vendor_bootstrap".
+VENDOR_BOOTSTRAP = env.bool("DJANGO_VENDOR_BOOTSTRAP", default=False)
 
 # MEDIA
 # ------------------------------------------------------------------------------
@@ -167,6 +240,15 @@ MEDIA_ROOT = str(APPS_DIR / "media")
 # https://docs.djangoproject.com/en/dev/ref/settings/#media-url
 MEDIA_URL = "/media/"
 
+# AVATARS
+# ------------------------------------------------------------------------------
+# Square renditions generated for each uploaded avatar, in pixels.
+AVATAR_SIZES = [64, 256]
+# Largest avatar upload accepted, in bytes.
+AVATAR_MAX_UPLOAD_SIZE = env.int("DJANGO_AVATAR_MAX_UPLOAD_SIZE", default=5_000_000)
+# How long browsers and the server cache identicon placeholders, in seconds.
+AVATAR_PLACEHOLDER_MAX_AGE = 60 * 60 * 24 * 7
+
 # TEMPLATES
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#templates
@@ -190,6 +272,7 @@ TEMPLATES = [
                 "django.template.context_processors.tz",
                 "django.contrib.messages.context_processors.messages",
                 "soclone.users.context_processors.allauth_settings",
+                "soclone.core.context_processors.static_assets",
             ],
         },
     },
@@ -211,6 +294,9 @@ FIXTURE_DIRS = (str(APPS_DIR / "fixtures"),)
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#session-cookie-httponly
 SESSION_COOKIE_HTTPONLY = True
+# With soclone.core.sessions, unchanged sessions get their expiry pushed back at
+# most this often (seconds).
+SESSION_REFRESH_INTERVAL = env.int("DJANGO_SESSION_REFRESH_INTERVAL", default=300)
 # https://docs.djangoproject.com/en/dev/ref/settings/#csrf-cookie-httponly
 CSRF_COOKIE_HTTPONLY = True
 # https://docs.djangoproject.com/en/dev/ref/settings/#x-frame-options
@@ -225,6 +311,15 @@ EMAIL_BACKEND = env(
 )
 # https://docs.djangoproject.com/en/dev/ref/settings/#email-timeout
 EMAIL_TIMEOUT = 5
+# Outbox messages claimed at a time by soclone.mail.tasks.drain_outbox.
+MAIL_OUTBOX_BATCH_SIZE = env.int("DJANGO_MAIL_OUTBOX_BATCH_SIZE", default=50)
+# Seconds a claimed message is left to its drain before another may send it.
+MAIL_OUTBOX_LEASE = 10 * 60
+# Attempts before a message is marked failed; the delay between attempts
+# doubles from MAIL_OUTBOX_RETRY_DELAY up to MAIL_OUTBOX_RETRY_DELAY_MAX seconds.
+MAIL_OUTBOX_MAX_ATTEMPTS = env.int("DJANGO_MAIL_OUTBOX_MAX_ATTEMPTS", default=8)
+MAIL_OUTBOX_RETRY_DELAY = 60
+MAIL_OUTBOX_RETRY_DELAY_MAX = 60 * 60
 
 # ADMIN
 # ------------------------------------------------------------------------------
@@ -289,12 +384,63 @@ CELERY_TASK_TIME_LIMIT = 5 * 60
 # https://docs.celeryq.dev/en/stable/userguide/configuration.html#task-soft-time-limit
 # TODO: set to whatever value is adequate in your circumstances
 CELERY_TASK_SOFT_TIME_LIMIT = 60
+# django_celery_beat's DatabaseScheduler, with the schedule cached in memory and
+# reloaded on change notifications (soclone.core.beat).
 # https://docs.celeryq.dev/en/stable/userguide/configuration.html#beat-scheduler
-CELERY_BEAT_SCHEDULER = "django_celery_beat.schedulers:DatabaseScheduler"
+CELERY_BEAT_SCHEDULER = "soclone.core.beat:CachedDatabaseScheduler"
+# https://docs.celeryq.dev/en/stable/userguide/configuration.html#beat-schedule
+CELERY_BEAT_SCHEDULE = {
+    # Delivers retries and messages whose on-commit drain was lost.
+    "mail-drain-outbox": {
+        "task": "soclone.mail.tasks.drain_outbox",
+        "schedule": 60,
+        # Sign-ups drain the outbox on the interactive queue already.
+        "options": {"queue": "scheduled"},
+    },
+    # Fixes counters after writes that bypass model signals.
+    "stats-reconcile-counters": {
+        "task": "soclone.stats.tasks.reconcile_counters",
+        "schedule": 60 * 60,
+    },
+}
 # https://docs.celeryq.dev/en/stable/userguide/configuration.html#worker-send-task-events
 CELERY_WORKER_SEND_TASK_EVENTS = True
 # https://docs.celeryq.dev/en/stable/userguide/configuration.html#std-setting-task_send_sent_event
 CELERY_TASK_SEND_SENT_EVENT = True
+# "interactive" for work someone is waiting on, "bulk" for batch jobs and
+# "scheduled" for periodic maintenance; each has its own workers (Procfile).
+# https://docs.celeryq.dev/en/stable/userguide/configuration.html#task-queues
+CELERY_TASK_QUEUES = (
+    Queue("interactive"),
+    Queue("bulk"),
+    Queue("scheduled"),
+)
+# https://docs.celeryq.dev/en/stable/userguide/configuration.html#task-default-queue
+CELERY_TASK_DEFAULT_QUEUE = "interactive"
+# Priorities go from 0 (first) to 9 (last) on Redis.
+# https://docs.celeryq.dev/en/stable/userguide/routing.html#redis-message-priorities
+CELERY_BROKER_TRANSPORT_OPTIONS = {
+    "priority_steps": list(range(10)),
+    "sep": ":",
+    "queue_order_strategy": "priority",
+}
+# https://docs.celeryq.dev/en/stable/userguide/configuration.html#task-default-priority
+CELERY_TASK_DEFAULT_PRIORITY = 5
+# https://docs.celeryq.dev/en/stable/userguide/configuration.html#task-routes
+CELERY_TASK_ROUTES = {
+    # Verification and password reset emails.
+    "soclone.mail.tasks.drain_outbox": {"queue": "interactive", "priority": 0},
+    "soclone.core.tasks.revalidate_cached": {"queue": "interactive", "priority": 3},
+    "soclone.users.tasks.generate_avatar_renditions": {"queue": "interactive"},
+    "soclone.stats.tasks.*": {"queue": "scheduled"},
+    "soclone.jobs.tasks.*": {"queue": "bulk"},
+    # Buffered view counts, written a minute late anyway.
+    "soclone.questions.tasks.flush_views": {"queue": "bulk"},
+}
+# Most tasks are fire-and-forget: only those declared with ignore_result=False
+# write to the result backend.
+# https://docs.celeryq.dev/en/stable/userguide/configuration.html#task-ignore-result
+CELERY_TASK_IGNORE_RESULT = True
 # django-allauth
 # ------------------------------------------------------------------------------
 ACCOUNT_ALLOW_REGISTRATION = env.bool("DJANGO_ACCOUNT_ALLOW_REGISTRATION", True)
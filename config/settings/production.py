@@ -21,23 +21,50 @@ ALLOWED_HOSTS = env.list("DJANGO_ALLOWED_HOSTS", default=["soclone.com"])
 
 # DATABASES
 # ------------------------------------------------------------------------------
-DATABASES["default"]["CONN_MAX_AGE"] = env.int("CONN_MAX_AGE", default=60)
+for database in DATABASES.values():
+    database["CONN_MAX_AGE"] = env.int("CONN_MAX_AGE", default=60)
+# Borrow connections from a per-process psycopg pool instead of keeping one
+# persistent connection per worker thread.
+if env.bool("DJANGO_DB_POOL", default=False):
+    for database in DATABASES.values():
+        database["ENGINE"] = "soclone.core.db.backends.postgresql_pool"
+        database["CONN_MAX_AGE"] = 0
+        database.setdefault("OPTIONS", {})["pool"] = {
+            "min_size": env.int("DJANGO_DB_POOL_MIN_SIZE", default=2),
+            "max_size": env.int("DJANGO_DB_POOL_MAX_SIZE", default=10),
+            # Seconds to wait for a free connection before giving up.
+            "timeout": env.float("DJANGO_DB_POOL_TIMEOUT", default=10),
+            "max_idle": env.float("DJANGO_DB_POOL_MAX_IDLE", default=600),
+        }
 
 # CACHES
 # ------------------------------------------------------------------------------
 CACHES = {
     "default": {
-        "BACKEND": "django_redis.cache.RedisCache",
+        # django_redis with a per-process LRU in front of it.
+        "BACKEND": "soclone.core.cache.backends.TwoTierCache",
         "LOCATION": env("REDIS_URL"),
         "OPTIONS": {
             "CLIENT_CLASS": "django_redis.client.DefaultClient",
             # Mimicing memcache behavior.
             # https://github.com/jazzband/django-redis#memcached-exceptions-behavior
             "IGNORE_EXCEPTIONS": True,
+            "LOCAL_MAX_ENTRIES": env.int(
+                "DJANGO_CACHE_LOCAL_MAX_ENTRIES",
+                default=1000,
+            ),
+            "LOCAL_TIMEOUT": env.int("DJANGO_CACHE_LOCAL_TIMEOUT", default=10),
         },
     },
 }
 
+# SESSIONS
+# ------------------------------------------------------------------------------
+# https://docs.djangoproject.com/en/dev/ref/settings/#session-engine
+SESSION_ENGINE = "soclone.core.sessions"
+# https://docs.djangoproject.com/en/dev/ref/settings/#session-save-every-request
+SESSION_SAVE_EVERY_REQUEST = True
+
 # SECURITY
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#secure-proxy-ssl-header
@@ -103,17 +130,14 @@ STORAGES = {
             "file_overwrite": False,
         },
     },
+    # Content-hashed names plus Brotli/gzip variants, written at collectstatic
+    # time and served by config/wsgi.py.
     "staticfiles": {
-        "BACKEND": "storages.backends.s3.S3Storage",
-        "OPTIONS": {
-            "location": "static",
-            "default_acl": "public-read",
-        },
+        "BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage",
     },
 }
 MEDIA_URL = f"https://{aws_s3_domain}/media/"
-COLLECTFAST_STRATEGY = "collectfast.strategies.boto3.Boto3Strategy"
-STATIC_URL = f"https://{aws_s3_domain}/static/"
+STATIC_WSGI_HANDLER = env.bool("DJANGO_STATIC_WSGI_HANDLER", default=True)
 
 # EMAIL
 # ------------------------------------------------------------------------------
@@ -149,11 +173,6 @@ ANYMAIL = {
     "MAILGUN_API_URL": env("MAILGUN_API_URL", default="https://api.mailgun.net/v3"),
 }
 
-# Collectfast
-# ------------------------------------------------------------------------------
-# https://github.com/antonagestam/collectfast#installation
-INSTALLED_APPS = ["collectfast", *INSTALLED_APPS]
-
 # LOGGING
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#logging
@@ -2,24 +2,36 @@
 from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib import admin
+from django.db import transaction
 from django.urls import include
 from django.urls import path
 from django.views import defaults as default_views
 from django.views.generic import TemplateView
 
+from soclone.core.pagecache import cache_anonymous_page
+from soclone.core.views import home_view
+from soclone.core.views import metrics_view
+
 urlpatterns = [
-    path("", TemplateView.as_view(template_name="pages/home.html"), name="home"),
+    path("", view=home_view, name="home"),
     path(
         "about/",
-        TemplateView.as_view(template_name="pages/about.html"),
+        transaction.non_atomic_requests(
+            cache_anonymous_page(
+                TemplateView.as_view(template_name="pages/about.html"),
+            ),
+        ),
         name="about",
     ),
+    # Prometheus metrics, for staff or METRICS_TOKEN holders.
+    path("metrics/", view=metrics_view, name="metrics"),
     # Django Admin, use {% url 'admin:index' %}
     path(settings.ADMIN_URL, admin.site.urls),
     # User management
     path("users/", include("soclone.users.urls", namespace="users")),
     path("accounts/", include("allauth.urls")),
     # Your stuff: custom urls includes go here
+    path("questions/", include("soclone.questions.urls", namespace="questions")),
     # ...
     # Media files
     *static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT),
@@ -35,6 +35,11 @@ os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.production")
 # file. This includes Django's development server, if the WSGI_APPLICATION
 # setting points here.
 application = get_wsgi_application()
+# Serve collected static files (precompressed, content-hashed) without going
+# through Django; see soclone.core.staticfiles.
+from soclone.core.staticfiles import static_application
+
+application = static_application(application)
 # Apply WSGI middleware here.
 # from helloworld.wsgi import HelloWorldApplication
 # application = HelloWorldApplication(application)
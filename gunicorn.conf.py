@@ -0,0 +1,30 @@
+"""
+Gunicorn configuration, read by default from the working directory.
+
+Metrics are shared between the workers through memory-mapped files in
+``PROMETHEUS_MULTIPROC_DIR`` (soclone.core.metrics). It has to be set before
+anything imports ``prometheus_client``, so it is defaulted here, before the
+application is loaded, and emptied whenever gunicorn starts so counters
+don't carry over from an earlier run.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+
+os.environ.setdefault(
+    "PROMETHEUS_MULTIPROC_DIR",
+    str(Path(tempfile.gettempdir()) / "soclone-metrics-web"),
+)
+
+
+def on_starting(server):
+    from soclone.core.metrics import reset_multiprocess_dir
+
+    reset_multiprocess_dir()
+
+
+def child_exit(server, worker):
+    from soclone.core.metrics import mark_process_dead
+
+    mark_process_dead(worker.pid)
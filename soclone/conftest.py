@@ -1,5 +1,6 @@
 import pytest
 
+from soclone.core import testing
 from soclone.users.models import User
 from soclone.users.tests.factories import UserFactory
 
@@ -12,3 +13,28 @@ def _media_storage(settings, tmpdir) -> None:
 @pytest.fixture()
 def user(db) -> User:
     return UserFactory()
+
+
+@pytest.fixture()
+def query_budget():
+    """``with query_budget(2): ...`` fails if the block runs over 2 queries."""
+    return testing.query_budget
+
+
+@pytest.fixture(scope="session")
+def query_baseline():
+    baseline = testing.QueryBaseline()
+    yield baseline
+    baseline.save()
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    # @pytest.mark.query_budget(n): the test body, without its fixtures, may
+    # run at most n queries.
+    marker = item.get_closest_marker("query_budget")
+    if marker is None:
+        return (yield)
+    (budget,) = marker.args
+    with testing.query_budget(budget, label=item.name):
+        return (yield)
@@ -0,0 +1,13 @@
+from django.apps import AppConfig
+from django.utils.translation import gettext_lazy as _
+
+
+class CoreConfig(AppConfig):
+    name = "soclone.core"
+    label = "core"
+    verbose_name = _("Core")
+
+    def ready(self):
+        from soclone.core import beat
+
+        beat.connect_signals()
@@ -0,0 +1,302 @@
+"""
+A Celery beat scheduler for schedules of thousands of entries.
+
+django_celery_beat's ``DatabaseScheduler`` asks the database whether anything
+changed on every tick, reloads every entry when something did (with a query
+per entry for its schedule) and compares the whole schedule with a copy of it
+before sending each task. ``CachedDatabaseScheduler`` keeps the entries in
+memory instead:
+
+* saving or deleting a periodic task or one of its schedules sends a Postgres
+  ``NOTIFY`` on ``CHANNEL``, in the writing transaction, so it arrives once
+  the change is committed (``connect_signals()``, called at startup, in place
+  of django_celery_beat's signal handlers that update ``PeriodicTasks``);
+* beat ``LISTEN``\\s on a connection of its own and reads the notifications on
+  each tick without sending a query, then reloads the entries they name in a
+  single query and pushes them on the heap. Events of replaced or removed
+  entries are dropped as they reach the top of the heap;
+* the run times of the tasks sent are written with one ``bulk_update()`` per
+  sync, rather than two queries per task.
+
+Changes made without signals, such as ``QuerySet.update()``, have to be
+followed by ``PeriodicTasks.update_changed()``, as with django_celery_beat:
+``PeriodicTasks`` is checked every ``resync_interval`` seconds, and a change
+there reloads everything. So does (re)connecting the listener.
+``PeriodicTask.save()`` and ``delete()`` update ``PeriodicTasks`` themselves,
+so while tasks are being edited there is also a full reload per interval.
+"""
+
+from __future__ import annotations
+
+import heapq
+import logging
+import time
+
+import psycopg
+from celery.beat import event_t
+from django.db import DEFAULT_DB_ALIAS
+from django.db import DatabaseError
+from django.db import close_old_connections
+from django.db import connections
+from django.db.models import Q
+from django.db.models import signals
+from django_celery_beat.models import PeriodicTask
+from django_celery_beat.models import PeriodicTasks
+from django_celery_beat.schedulers import DatabaseScheduler
+from django_celery_beat.schedulers import ModelEntry
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "soclone_beat"
+# Payload of a change to the task with that primary key.
+TASK = "task"
+# Foreign keys of PeriodicTask to the schedule models, by model.
+SCHEDULE_FIELDS = {model: field for _, model, field in ModelEntry.model_schedules}
+HEAP_PRIORITY = 5
+
+
+def notify(payload, using=DEFAULT_DB_ALIAS):
+    """Tell the schedulers that the rows ``payload`` names changed."""
+    with connections[using].cursor() as cursor:
+        cursor.execute("SELECT pg_notify(%s, %s)", [CHANNEL, payload])
+
+
+def _task_changed(sender, instance, using, **kwargs):
+    # Beat sets no_changes when it saves a run time, as the library does.
+    if not instance.no_changes:
+        notify(f"{TASK}:{instance.pk}", using)
+
+
+def _schedule_changed(sender, instance, using, created, **kwargs):
+    # A new schedule has no tasks yet, and deleting one deletes its tasks.
+    if not created:
+        notify(f"{SCHEDULE_FIELDS[sender]}:{instance.pk}", using)
+
+
+def connect_signals():
+    # Notifications replace django_celery_beat's signal handlers, which update
+    # PeriodicTasks on every change to a schedule.
+    for signal in (signals.pre_save, signals.pre_delete):
+        signal.disconnect(PeriodicTasks.changed, sender=PeriodicTask)
+    for model in SCHEDULE_FIELDS:
+        for signal in (signals.post_save, signals.pre_delete, signals.post_delete):
+            signal.disconnect(PeriodicTasks.update_changed, sender=model)
+    signals.post_save.connect(_task_changed, sender=PeriodicTask)
+    signals.post_delete.connect(_task_changed, sender=PeriodicTask)
+    for model in SCHEDULE_FIELDS:
+        signals.post_save.connect(_schedule_changed, sender=model)
+
+
+def _parse(payloads):
+    """Split notification payloads into task and schedule primary keys."""
+    tasks: set[int] = set()
+    schedules: dict[str, set[int]] = {
+        field: set() for field in SCHEDULE_FIELDS.values()
+    }
+    for payload in payloads:
+        kind, _, pk = payload.partition(":")
+        if kind == TASK:
+            tasks.add(int(pk))
+        elif kind in schedules:
+            schedules[kind].add(int(pk))
+    return tasks, schedules
+
+
+class CachedDatabaseScheduler(DatabaseScheduler):
+    # Seconds between checks for changes that sent no notification.
+    resync_interval = 5 * 60
+    # Seconds before listening again after a failure, doubling with every
+    # failure in a row up to resync_interval.
+    listen_retry_delay = 5
+
+    def __init__(self, *args, **kwargs):
+        self._listener = None
+        self._listen_failures = 0
+        self._next_listen = 0.0
+        self._names = {}
+        self._next_resync = 0.0
+        super().__init__(*args, **kwargs)
+
+    # The listener connection.
+
+    def _listen(self):
+        params = connections[DEFAULT_DB_ALIAS].get_connection_params()
+        try:
+            self._listener = psycopg.connect(**params, autocommit=True)
+            self._listener.execute(f"LISTEN {CHANNEL}")
+        except psycopg.Error as exc:
+            logger.warning("Beat can't listen for schedule changes: %r", exc)
+            self._close_listener()
+            self._listen_failures += 1
+            delay = min(
+                self.listen_retry_delay * 2 ** (self._listen_failures - 1),
+                self.resync_interval,
+            )
+            self._next_listen = time.monotonic() + delay
+            return False
+        self._listen_failures = 0
+        return True
+
+    def _close_listener(self):
+        if self._listener is not None:
+            self._listener.close()
+            self._listener = None
+
+    def _notifications(self):
+        """
+        Return the payloads received since the last call, or ``None`` when
+        the listener was reconnected and changes may have been missed.
+
+        Without a listener, no payloads are returned, so changes are only
+        found by the check every ``resync_interval``.
+        """
+        if self._listener is None:
+            if time.monotonic() < self._next_listen:
+                return []
+            return None if self._listen() else []
+        pgconn = self._listener.pgconn
+        try:
+            # Reads what the server sent without blocking or sending a query.
+            pgconn.consume_input()
+        except psycopg.Error as exc:
+            logger.warning("Lost the beat listener connection: %r", exc)
+            self._close_listener()
+            return []
+        payloads = []
+        while (notification := pgconn.notifies()) is not None:
+            payloads.append(notification.extra.decode())
+        return payloads
+
+    # Loading entries.
+
+    def _entries(self, models):
+        entries = {}
+        for model in models:
+            try:
+                entries[model.name] = self.Entry(model, app=self.app)
+            except ValueError:
+                continue
+        return entries
+
+    def all_as_schedule(self):
+        logger.debug("CachedDatabaseScheduler: loading the schedule")
+        schedule = self._entries(
+            self.Model.objects.enabled().select_related(*SCHEDULE_FIELDS.values()),
+        )
+        self._names = {entry.model.pk: name for name, entry in schedule.items()}
+        self._heap = None
+        return schedule
+
+    def _reload(self, tasks, schedules):
+        """Reload the named tasks and the tasks using the named schedules."""
+        query = Q(pk__in=tasks)
+        for field, pks in schedules.items():
+            if pks:
+                query |= Q(**{f"{field}__in": pks})
+        models = self.Model.objects.filter(query).select_related(
+            *SCHEDULE_FIELDS.values(),
+        )
+        found = set()
+        for model in models:
+            found.add(model.pk)
+            self._forget(model.pk)
+            if model.enabled:
+                self._add(self._entries([model]))
+        for pk in tasks - found:
+            self._forget(pk)
+
+    def _forget(self, pk):
+        name = self._names.pop(pk, None)
+        if name is not None:
+            self._schedule.pop(name, None)
+
+    def _add(self, entries):
+        for name, entry in entries.items():
+            self._schedule[name] = entry
+            self._names[entry.model.pk] = name
+            if self._heap is not None:
+                is_due, next_call_delay = entry.is_due()
+                heapq.heappush(
+                    self._heap,
+                    event_t(
+                        self._when(entry, 0 if is_due else next_call_delay) or 0,
+                        HEAP_PRIORITY,
+                        entry,
+                    ),
+                )
+
+    def _is_current(self, entry):
+        # The entries sent and requeued by reserve() share their model with
+        # the one in the schedule; a reload replaces it.
+        current = self._schedule.get(entry.name)
+        return current is not None and current.model is entry.model
+
+    def _full_reload(self):
+        self.sync()
+        self._schedule = self.all_as_schedule()
+        self._last_timestamp = PeriodicTasks.last_change()
+
+    def _apply_changes(self):
+        payloads = self._notifications()
+        now = time.monotonic()
+        if payloads == [] and now < self._next_resync:
+            return
+        close_old_connections()
+        try:
+            if payloads is None:
+                self._full_reload()
+            elif payloads:
+                logger.debug("CachedDatabaseScheduler: %d changes", len(payloads))
+                self.sync()
+                self._reload(*_parse(payloads))
+            elif self.schedule_changed():
+                logger.info("CachedDatabaseScheduler: unnotified schedule changes")
+                self._full_reload()
+        except DatabaseError as exc:
+            logger.warning("Beat couldn't reload the schedule: %r", exc)
+            return
+        self._next_resync = now + self.resync_interval
+
+    # Scheduler API.
+
+    @property
+    def schedule(self):
+        if self._schedule is None:
+            # Listen first, so no change made while loading goes unnoticed.
+            self._listen()
+            self._schedule = self.all_as_schedule()
+            self._last_timestamp = PeriodicTasks.last_change()
+            self._next_resync = time.monotonic() + self.resync_interval
+        return self._schedule
+
+    def schedules_equal(self, *args, **kwargs):
+        # The heap is kept up to date as entries change.
+        return True
+
+    def tick(self, *args, **kwargs):
+        self._apply_changes()
+        heap = self._heap
+        while heap and not self._is_current(heap[0][2]):
+            heapq.heappop(heap)
+        return super().tick(*args, **kwargs)
+
+    def sync(self):
+        names = set()
+        while self._dirty:
+            names.add(self._dirty.pop())
+        models = [
+            self._schedule[name].model for name in names if name in self._schedule
+        ]
+        if not models:
+            return
+        try:
+            close_old_connections()
+            # No signals: the run times are no changes to the schedule.
+            self.Model.objects.bulk_update(models, ["last_run_at", "total_run_count"])
+        except DatabaseError as exc:
+            logger.warning("Beat couldn't save run times: %r", exc)
+            self._dirty |= names
+
+    def close(self):
+        super().close()
+        self._close_listener()
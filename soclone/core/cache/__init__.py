@@ -0,0 +1,3 @@
+from soclone.core.cache.compute import get_or_compute
+
+__all__ = ["get_or_compute"]
@@ -0,0 +1,323 @@
+"""
+A ``django_redis`` cache with a small in-process LRU in front of it.
+
+Hot keys read on every request (the cached session user, feature switches,
+counters) are served from worker memory instead of a network round trip::
+
+    CACHES = {
+        "default": {
+            "BACKEND": "soclone.core.cache.backends.TwoTierCache",
+            "LOCATION": "redis://...",
+            "OPTIONS": {
+                "CLIENT_CLASS": "django_redis.client.DefaultClient",
+                "LOCAL_MAX_ENTRIES": 1000,
+                "LOCAL_TIMEOUT": 10,
+            },
+        },
+    }
+
+Every write through the cache drops the key locally and publishes it on a
+Redis channel; each worker process runs a subscriber thread that drops
+published keys from its own LRU. While that subscriber isn't connected the
+local tier is bypassed. Local entries live for ``LOCAL_TIMEOUT`` seconds at
+most, which bounds how long a lost invalidation, or a key expiring in Redis,
+can go unnoticed.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+from asgiref.sync import sync_to_async
+from django_redis.cache import RedisCache
+from redis.exceptions import RedisError
+
+from soclone.core.metrics import CACHE_TIER_EVENTS
+
+logger = logging.getLogger(__name__)
+
+CLEAR = "*"
+MISSING = object()
+# Values of these types are immutable, so they're stored without pickling.
+IMMUTABLE_TYPES = (str, bytes, int, float, bool, type(None))
+RECONNECT_DELAY = 1
+# Prometheus counters of the LocalTier.stats entries.
+TIER_EVENTS = {
+    "local_hits": CACHE_TIER_EVENTS.labels("local", "hit"),
+    "local_misses": CACHE_TIER_EVENTS.labels("local", "miss"),
+    "local_evictions": CACHE_TIER_EVENTS.labels("local", "eviction"),
+    "remote_hits": CACHE_TIER_EVENTS.labels("remote", "hit"),
+    "remote_misses": CACHE_TIER_EVENTS.labels("remote", "miss"),
+    "invalidations": CACHE_TIER_EVENTS.labels("local", "invalidation"),
+}
+
+
+class LocalTier:
+    """
+    Process-wide LRU shared by the cache instances of all threads.
+
+    Django creates a cache instance per thread; the entries, counters and
+    the invalidation subscriber belong to the process.
+    """
+
+    def __init__(self, max_entries, timeout, max_value_size):
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self.max_value_size = max_value_size
+        self.connected = False
+        # Bumped by every invalidation; a value read from Redis is only
+        # stored if no invalidation arrived while it was being read.
+        self.generation = 0
+        self.stats = dict.fromkeys(TIER_EVENTS, 0)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._subscriber = None
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] < time.monotonic():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self._count("local_misses")
+                return MISSING
+            self._entries.move_to_end(key)
+            self._count("local_hits")
+        expires, pickled, value = entry
+        return pickle.loads(value) if pickled else value  # noqa: S301
+
+    def set(self, key, value, generation):
+        pickled = not isinstance(value, IMMUTABLE_TYPES)
+        if pickled:
+            value = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        if isinstance(value, str | bytes) and len(value) > self.max_value_size:
+            return
+        with self._lock:
+            if generation != self.generation or not self.connected:
+                return
+            self._entries[key] = (time.monotonic() + self.timeout, pickled, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._count("local_evictions")
+
+    def invalidate(self, key):
+        with self._lock:
+            self.generation += 1
+            self._count("invalidations")
+            if key == CLEAR:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def count(self, stat, n=1):
+        with self._lock:
+            self._count(stat, n)
+
+    def _count(self, stat, n=1):
+        # Called with the lock held.
+        self.stats[stat] += n
+        TIER_EVENTS[stat].inc(n)
+
+    def ensure_subscriber(self, redis_client, channel):
+        with self._lock:
+            if self._subscriber is not None:
+                return
+            self._subscriber = threading.Thread(
+                target=self._subscribe,
+                args=(redis_client, channel),
+                name=f"cache-invalidation-{channel}",
+                daemon=True,
+            )
+        self._subscriber.start()
+
+    def _set_connected(self, *, connected):
+        with self._lock:
+            self.connected = connected
+            self.generation += 1
+            self._entries.clear()
+
+    def _subscribe(self, redis_client, channel):
+        while True:
+            pubsub = redis_client.pubsub()
+            try:
+                pubsub.subscribe(channel)
+                for message in pubsub.listen():
+                    if message["type"] == "subscribe":
+                        self._set_connected(connected=True)
+                    elif message["type"] == "message":
+                        self.invalidate(message["data"].decode())
+            except (RedisError, OSError):
+                logger.exception("Cache invalidation subscriber disconnected")
+            finally:
+                self._set_connected(connected=False)
+                pubsub.close()
+            time.sleep(RECONNECT_DELAY)
+
+
+_tiers: dict[tuple, LocalTier] = {}
+_tiers_lock = threading.Lock()
+
+
+def _forget_tiers():
+    # Subscriber threads don't survive a fork: each child starts its own.
+    _tiers.clear()
+
+
+os.register_at_fork(after_in_child=_forget_tiers)
+
+
+class TwoTierCache(RedisCache):
+    def __init__(self, server, params):
+        super().__init__(server, params)
+        options = params.get("OPTIONS", {})
+        self._local_options = (
+            options.get("LOCAL_MAX_ENTRIES", 1000),
+            options.get("LOCAL_TIMEOUT", 10),
+            options.get("LOCAL_MAX_VALUE_SIZE", 64 * 1024),
+        )
+        self._channel = options.get(
+            "INVALIDATION_CHANNEL",
+            f"{self.key_prefix}:cache-invalidation",
+        )
+
+    @property
+    def local(self):
+        tier_key = (self._server, self._channel)
+        tier = _tiers.get(tier_key)
+        if tier is None:
+            with _tiers_lock:
+                tier = _tiers.setdefault(tier_key, LocalTier(*self._local_options))
+        if tier.max_entries and not tier.connected:
+            tier.ensure_subscriber(self.client.get_client(write=True), self._channel)
+        return tier
+
+    def stats(self):
+        """Return this process's hit, miss and eviction counters per tier."""
+        return dict(self.local.stats)
+
+    def _publish(self, *keys):
+        local = self.local
+        for key in keys:
+            local.invalidate(key)
+        try:
+            redis_client = self.client.get_client(write=True)
+            for key in keys:
+                redis_client.publish(self._channel, key)
+        except (RedisError, OSError):
+            if not self._ignore_exceptions:
+                raise
+            logger.warning("Could not publish cache invalidation", exc_info=True)
+
+    # Reads
+
+    def get(self, key, default=None, version=None, client=None):
+        full_key = self.make_key(key, version=version)
+        value = self._get_local(full_key)
+        if value is MISSING:
+            value = self._get_remote(key, full_key, version, client)
+        return default if value is MISSING else value
+
+    async def aget(self, key, default=None, version=None):
+        # Local hits are served on the event loop; only a miss pays for the
+        # thread hop to the synchronous Redis client.
+        full_key = self.make_key(key, version=version)
+        value = self._get_local(full_key)
+        if value is MISSING:
+            value = await sync_to_async(self._get_remote)(key, full_key, version)
+        return default if value is MISSING else value
+
+    def _get_local(self, full_key):
+        local = self.local
+        return local.get(full_key) if local.connected else MISSING
+
+    def _get_remote(self, key, full_key, version, client=None):
+        local = self.local
+        generation = local.generation
+        value = super().get(key, MISSING, version=version, client=client)
+        if value is MISSING:
+            local.count("remote_misses")
+        else:
+            local.count("remote_hits")
+            local.set(full_key, value, generation)
+        return value
+
+    def get_many(self, keys, version=None, client=None):
+        local = self.local
+        found = {}
+        remaining = []
+        for key in keys:
+            full_key = self.make_key(key, version=version)
+            value = local.get(full_key) if local.connected else MISSING
+            if value is MISSING:
+                remaining.append(key)
+            else:
+                found[key] = value
+        if remaining:
+            generation = local.generation
+            fetched = super().get_many(remaining, version=version, client=client)
+            local.count("remote_hits", len(fetched))
+            local.count("remote_misses", len(remaining) - len(fetched))
+            for key, value in fetched.items():
+                local.set(self.make_key(key, version=version), value, generation)
+            found.update(fetched)
+        return found
+
+    # Writes: each one invalidates the key in every process.
+
+    def set(self, key, *args, version=None, **kwargs):
+        result = super().set(key, *args, version=version, **kwargs)
+        self._publish(self.make_key(key, version=version))
+        return result
+
+    def add(self, key, *args, version=None, **kwargs):
+        result = super().add(key, *args, version=version, **kwargs)
+        if result:
+            self._publish(self.make_key(key, version=version))
+        return result
+
+    def set_many(self, data, *args, version=None, **kwargs):
+        result = super().set_many(data, *args, version=version, **kwargs)
+        self._publish(*(self.make_key(key, version=version) for key in data))
+        return result
+
+    def delete(self, key, *args, version=None, **kwargs):
+        result = super().delete(key, *args, version=version, **kwargs)
+        self._publish(self.make_key(key, version=version))
+        return result
+
+    def delete_many(self, keys, *args, version=None, **kwargs):
+        result = super().delete_many(keys, *args, version=version, **kwargs)
+        self._publish(*(self.make_key(key, version=version) for key in keys))
+        return result
+
+    def incr(self, key, *args, version=None, **kwargs):
+        result = super().incr(key, *args, version=version, **kwargs)
+        self._publish(self.make_key(key, version=version))
+        return result
+
+    def decr(self, key, *args, version=None, **kwargs):
+        result = super().decr(key, *args, version=version, **kwargs)
+        self._publish(self.make_key(key, version=version))
+        return result
+
+    def incr_version(self, key, *args, version=None, **kwargs):
+        result = super().incr_version(key, *args, version=version, **kwargs)
+        self._publish(self.make_key(key, version=version))
+        return result
+
+    def delete_pattern(self, *args, **kwargs):
+        result = super().delete_pattern(*args, **kwargs)
+        self._publish(CLEAR)
+        return result
+
+    def clear(self):
+        result = super().clear()
+        self._publish(CLEAR)
+        return result
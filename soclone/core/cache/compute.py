@@ -0,0 +1,190 @@
+"""
+Stampede-safe caching of expensive computations.
+
+``get_or_compute()`` stores the value together with its expiry and how long
+it took to compute, which lets it avoid a thundering herd when a hot key
+expires:
+
+* probabilistic early recomputation ("XFetch"): as the expiry approaches,
+  an increasing share of readers recompute ahead of time, so the key is
+  usually refreshed by a single request before it ever expires;
+* ``lock=True``: only the reader holding a short cache lock (``SET NX`` on
+  Redis) computes; the others serve the old value or wait for the new one;
+* ``stale=N``: entries stay readable for ``N`` seconds past their expiry.
+  Readers get the stale value at once and a Celery task recomputes it.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+import time
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+
+LOCK_SUFFIX = ":computing"
+POLL_INTERVAL = 0.05
+
+
+@dataclass
+class _Computation:
+    key: str
+    compute: Any
+    timeout: float
+    args: tuple = ()
+    kwargs: dict = field(default_factory=dict)
+    stale: float = 0
+    lock_timeout: float = 30
+    cache_alias: str = "default"
+    version: int | None = None
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    def get(self):
+        return self.cache.get(self.key, version=self.version)
+
+    def store(self):
+        started = time.monotonic()
+        value = self.compute(*self.args, **self.kwargs)
+        entry = {
+            "value": value,
+            "delta": time.monotonic() - started,
+            "expires": time.time() + self.timeout,
+        }
+        self.cache.set(self.key, entry, self.timeout + self.stale, version=self.version)
+        return value
+
+    def acquire(self):
+        return self.cache.add(
+            self.key + LOCK_SUFFIX,
+            1,
+            self.lock_timeout,
+            version=self.version,
+        )
+
+    def release(self):
+        self.cache.delete(self.key + LOCK_SUFFIX, version=self.version)
+
+    def store_locked(self):
+        try:
+            return self.store()
+        finally:
+            self.release()
+
+    def fill(self, *, lock, wait):
+        """Compute a missing entry, single-flight if ``lock``."""
+        if not lock:
+            return self.store()
+        deadline = time.monotonic() + wait
+        while not self.acquire():
+            time.sleep(POLL_INTERVAL)
+            entry = self.get()
+            if entry is not None:
+                return entry["value"]
+            if time.monotonic() > deadline:
+                # The lock holder is too slow or gone; stop waiting for it.
+                return self.store()
+        # Another reader may have stored it between our get and the lock.
+        entry = self.get()
+        if entry is not None:
+            self.release()
+            return entry["value"]
+        return self.store_locked()
+
+    def refresh(self, entry, *, lock):
+        """Replace an expiring ``entry``; readers keep getting its value."""
+        if self.stale:
+            self.revalidate()
+            return entry["value"]
+        if not lock:
+            return self.store()
+        if not self.acquire():
+            # Another reader is refreshing it already.
+            return entry["value"]
+        return self.store_locked()
+
+    def revalidate(self):
+        from soclone.core.tasks import revalidate_cached
+
+        # The lock keeps concurrent readers from queueing duplicate tasks;
+        # the task releases it.
+        if not self.acquire():
+            return
+        revalidate_cached.delay(
+            self.key,
+            f"{self.compute.__module__}.{self.compute.__qualname__}",
+            self.timeout,
+            args=list(self.args),
+            kwargs=self.kwargs,
+            stale=self.stale,
+            cache_alias=self.cache_alias,
+            version=self.version,
+        )
+
+
+def _refresh_early(entry, now, beta):
+    # XFetch: recompute once now - delta * beta * log(rand) passes the expiry.
+    # log(rand) is negative, so slow computations start refreshing earlier.
+    if not beta:
+        return False
+    jitter = math.log(1 - random.random())  # noqa: S311
+    return now - entry["delta"] * beta * jitter >= entry["expires"]
+
+
+def get_or_compute(  # noqa: PLR0913
+    key,
+    compute,
+    timeout,
+    *,
+    args=(),
+    kwargs=None,
+    beta=1.0,
+    lock=False,
+    lock_timeout=30,
+    wait=5.0,
+    stale=0,
+    cache_alias="default",
+    version=None,
+):
+    """
+    Return the cached value of ``compute(*args, **kwargs)``, computing it on a
+    miss.
+
+    ``timeout`` is the freshness lifetime in seconds. ``beta`` scales early
+    recomputation (0 disables it). With ``lock`` a single reader computes at a
+    time while others wait up to ``wait`` seconds before computing anyway.
+    With ``stale`` expired values are served for that many more seconds while
+    ``soclone.core.tasks.revalidate_cached`` recomputes them; ``compute`` must
+    then be importable by its dotted path and its arguments serializable.
+    """
+    computation = _Computation(
+        key,
+        compute,
+        timeout,
+        args=tuple(args),
+        kwargs=kwargs or {},
+        stale=stale,
+        lock_timeout=lock_timeout,
+        cache_alias=cache_alias,
+        version=version,
+    )
+    entry = computation.get()
+    if entry is None:
+        return computation.fill(lock=lock, wait=wait)
+    now = time.time()
+    if now < entry["expires"] and not _refresh_early(entry, now, beta):
+        return entry["value"]
+    return computation.refresh(entry, lock=lock)
+
+
+def recompute(key, compute_path, timeout, **options):
+    """Recompute and store a ``get_or_compute()`` entry, releasing its lock."""
+    computation = _Computation(key, import_string(compute_path), timeout, **options)
+    computation.args = tuple(computation.args)
+    return computation.store_locked()
@@ -0,0 +1,8 @@
+from django.conf import settings
+
+
+def static_assets(request):
+    """Expose how third-party static assets are loaded in templates."""
+    return {
+        "VENDOR_BOOTSTRAP": settings.VENDOR_BOOTSTRAP,
+    }
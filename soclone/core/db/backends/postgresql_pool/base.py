@@ -0,0 +1,134 @@
+"""
+PostgreSQL backend that borrows connections from a ``psycopg_pool`` pool.
+
+Enable it by pointing ``ENGINE`` at ``soclone.core.db.backends.postgresql_pool``
+and configuring the pool under ``OPTIONS["pool"]``; any keyword accepted by
+``psycopg_pool.ConnectionPool`` may be given there::
+
+    "OPTIONS": {"pool": {"min_size": 2, "max_size": 10, "timeout": 5}}
+
+Django "closes" the connection at the end of every request, which hands it
+back to the pool, so ``CONN_MAX_AGE`` must be 0.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.postgresql import base
+from django.db.backends.postgresql.psycopg_any import IsolationLevel
+from django.db.backends.postgresql.psycopg_any import is_psycopg3
+from django.utils.asyncio import async_unsafe
+
+if not is_psycopg3:
+    msg = "The postgresql_pool backend requires psycopg 3."
+    raise ImproperlyConfigured(msg)
+
+from psycopg_pool import ConnectionPool
+
+_pools_lock = threading.Lock()
+_pools: dict[tuple, ConnectionPool] = {}
+
+
+def _forget_pools():
+    # Connections inherited from a parent process must not be reused.
+    global _pools_lock  # noqa: PLW0603
+    _pools.clear()
+    _pools_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_forget_pools)
+
+
+def pool_stats() -> dict[str, dict[str, int]]:
+    """
+    Return ``ConnectionPool.get_stats()`` for every pool in this process.
+
+    The interesting keys are ``requests_num`` (checkouts), ``requests_wait_ms``
+    (time spent waiting for a connection), ``requests_errors`` (timeouts and
+    rejected requests), ``pool_size`` and ``pool_available``.
+    """
+    with _pools_lock:
+        pools = list(_pools.values())
+    return {pool.name: pool.get_stats() for pool in pools}
+
+
+def close_pools() -> None:
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.settings_dict["CONN_MAX_AGE"]:
+            msg = "The postgresql_pool backend requires CONN_MAX_AGE = 0."
+            raise ImproperlyConfigured(msg)
+
+    @property
+    def pool(self) -> ConnectionPool:
+        # Keyed on the target as well as the alias: the test runner renames
+        # the database of an alias after it may already have connected.
+        key = (
+            self.alias,
+            *(self.settings_dict[name] for name in ("NAME", "USER", "HOST", "PORT")),
+        )
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                options = self.settings_dict["OPTIONS"].get("pool")
+                options = {
+                    "min_size": 2,
+                    "max_size": 10,
+                    "timeout": 10,
+                    "check": ConnectionPool.check_connection,
+                    **(options if isinstance(options, dict) else {}),
+                }
+                pool = ConnectionPool(
+                    kwargs=self.get_connection_params(),
+                    name=self.alias,
+                    open=True,
+                    **options,
+                )
+                _pools[key] = pool
+            return pool
+
+    def get_connection_params(self):
+        conn_params = super().get_connection_params()
+        conn_params.pop("pool", None)
+        return conn_params
+
+    @async_unsafe
+    def get_new_connection(self, conn_params):
+        # Mirrors the parent implementation, but takes the connection from the
+        # pool (which was built from the same conn_params) instead of
+        # opening a new one.
+        isolation_level = self.settings_dict["OPTIONS"].get("isolation_level")
+        try:
+            self.isolation_level = IsolationLevel(
+                IsolationLevel.READ_COMMITTED
+                if isolation_level is None
+                else isolation_level,
+            )
+        except ValueError as exc:
+            msg = (
+                f"Invalid transaction isolation level {isolation_level} "
+                f"specified. Use one of the psycopg.IsolationLevel values."
+            )
+            raise ImproperlyConfigured(msg) from exc
+        connection = self.pool.getconn()
+        if isolation_level is not None:
+            connection.isolation_level = self.isolation_level
+        return connection
+
+    def _close(self):
+        if self.connection is not None:
+            # The pool rolls back anything left open and discards broken
+            # connections.
+            with self.wrap_database_errors:
+                self.pool.putconn(self.connection)
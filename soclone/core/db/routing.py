@@ -0,0 +1,125 @@
+"""
+Read-replica routing.
+
+``ReplicaRouter`` sends reads to one of ``settings.DATABASE_REPLICAS`` only
+while ``ReplicaRoutingMiddleware`` has marked the current request as safe for
+it: a GET/HEAD request from a client that has not written recently, running
+outside a transaction on the primary. Everything else uses ``default``.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.db import DatabaseError
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RoutingState:
+    use_replica: bool = False
+    wrote: bool = False
+
+
+_state: contextvars.ContextVar[RoutingState | None] = contextvars.ContextVar(
+    "db_routing_state",
+    default=None,
+)
+
+
+@contextlib.contextmanager
+def replica_reads(*, enabled: bool = True):
+    """Allow (or forbid) replica reads for the duration of the block."""
+    state = RoutingState(use_replica=enabled)
+    token = _state.set(state)
+    try:
+        yield state
+    finally:
+        _state.reset(token)
+
+
+@contextlib.contextmanager
+def use_primary():
+    """Force reads inside the block to go to the primary."""
+    with replica_reads(enabled=False) as state:
+        yield state
+
+
+# Replication lag is probed at most once per check interval per process.
+_LAG_SQL = """
+    SELECT CASE
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+"""
+_lag_lock = threading.Lock()
+_lag_checks: dict[str, tuple[float, bool]] = {}
+
+
+def _replica_is_fresh(alias: str) -> bool:
+    max_lag = settings.DATABASE_REPLICA_MAX_LAG
+    if max_lag is None:
+        return True
+    now = time.monotonic()
+    with _lag_lock:
+        checked_at, fresh = _lag_checks.get(alias, (None, True))
+    if checked_at is not None and now - checked_at < (
+        settings.DATABASE_REPLICA_LAG_CHECK_INTERVAL
+    ):
+        return fresh
+    try:
+        with connections[alias].cursor() as cursor:
+            cursor.execute(_LAG_SQL)
+            (lag,) = cursor.fetchone()
+    except DatabaseError:
+        logger.warning("Replica %s is unavailable", alias, exc_info=True)
+        fresh = False
+    else:
+        fresh = lag is None or lag <= max_lag
+        if not fresh:
+            logger.warning("Replica %s is %.1fs behind, skipping it", alias, lag)
+    with _lag_lock:
+        _lag_checks[alias] = (now, fresh)
+    return fresh
+
+
+def pick_replica() -> str | None:
+    """Return a random replica alias that is within the allowed lag."""
+    replicas = [
+        alias for alias in settings.DATABASE_REPLICAS if _replica_is_fresh(alias)
+    ]
+    return random.choice(replicas) if replicas else None  # noqa: S311
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is None or not state.use_replica or state.wrote:
+            return None
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            # Reads inside a transaction must see its own writes.
+            return None
+        return pick_replica()
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in settings.DATABASE_REPLICAS
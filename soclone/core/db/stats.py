@@ -0,0 +1,111 @@
+"""
+Per-alias query counting built on ``connection.execute_wrapper``.
+
+Every connection gets one wrapper, which adds each query to the
+``QueryStats`` of the ``track_queries()`` blocks active in the current
+context. Context variables follow a request into the threads that
+``sync_to_async`` runs its queries in, so async middleware count the queries
+of the views below them.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+
+@dataclass
+class AliasStats:
+    count: int = 0
+    duration: float = 0.0
+
+
+class QueryStats(defaultdict):
+    """Mapping of database alias to the ``AliasStats`` recorded for it."""
+
+    def __init__(self):
+        super().__init__(AliasStats)
+
+    @property
+    def count(self) -> int:
+        return sum(stats.count for stats in self.values())
+
+    @property
+    def duration(self) -> float:
+        return sum(stats.duration for stats in self.values())
+
+    def counts(self) -> dict[str, int]:
+        return {alias: stats.count for alias, stats in self.items()}
+
+
+_lock = threading.Lock()
+_totals = QueryStats()
+
+
+def query_counts() -> dict[str, int]:
+    """Queries executed by this process since start-up, per database alias."""
+    with _lock:
+        return _totals.counts()
+
+
+_active: contextvars.ContextVar[tuple[QueryStats, ...]] = contextvars.ContextVar(
+    "tracked_query_stats",
+    default=(),
+)
+
+
+def _record(execute, sql, params, many, context):
+    active = _active.get()
+    if not active:
+        return execute(sql, params, many, context)
+    alias = context["connection"].alias
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration = time.perf_counter() - started
+        for stats in active:
+            stats[alias].count += 1
+            stats[alias].duration += duration
+        with _lock:
+            _totals[alias].count += 1
+            _totals[alias].duration += duration
+
+
+def _install(connection):
+    if _record not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record)
+
+
+def _install_on_connect(sender, connection, **kwargs):
+    _install(connection)
+
+
+# Connections of other threads, such as sync_to_async's, get the wrapper when
+# they connect.
+connection_created.connect(_install_on_connect, dispatch_uid="db_stats_install")
+
+
+@contextlib.contextmanager
+def track_queries():
+    """
+    Record the queries run on every configured database inside the block.
+
+    Yields a ``QueryStats`` that is filled in as queries execute, on any
+    thread running in the block's context.
+    """
+    for alias in connections:
+        _install(connections[alias])
+    stats = QueryStats()
+    token = _active.set((*_active.get(), stats))
+    try:
+        yield stats
+    finally:
+        _active.reset(token)
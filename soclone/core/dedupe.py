@@ -0,0 +1,98 @@
+"""
+Deduplicated Celery tasks.
+
+Tasks declared with ``base=DedupedTask`` are queued with ``enqueue()``, which
+waits for the current transaction to commit and then takes a "pending" key
+(``SET NX`` with a TTL on Redis) for the task and its arguments. While the key
+is held, later enqueues are collapsed into the queued run; the run releases
+it as it starts, so changes committed during the run queue another one. With
+``debounce`` the run is delayed by that many seconds, which turns a burst of
+saves into a single execution.
+
+Runs also hold a "running" key, so a copy queued by other means (``delay()``,
+beat, a redelivered message) never runs at the same time: it is queued again
+``lock_retry_delay`` seconds later instead. ::
+
+    @celery_app.task(base=DedupedTask, debounce=5)
+    def rebuild_feed(user_id): ...
+
+    rebuild_feed.enqueue([user.pk])
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from functools import partial
+
+from celery import Task
+from django.core.cache import caches
+from django.db import transaction
+
+from soclone.core import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class DedupedTask(Task):
+    # Seconds to wait before running, collapsing the enqueues meanwhile.
+    debounce = 0
+    # Seconds a pending key outlives the debounce, in case its run is lost.
+    dedupe_ttl = 10 * 60
+    # Seconds before a run blocked by another one is queued again.
+    lock_retry_delay = 5
+    dedupe_cache = "default"
+
+    @property
+    def _cache(self):
+        return caches[self.dedupe_cache]
+
+    def dedupe_key(self, args, kwargs):
+        """Identify the runs that are interchangeable; override to coarsen."""
+        arguments = json.dumps([args, kwargs], sort_keys=True, default=str)
+        digest = hashlib.sha256(arguments.encode()).hexdigest()[:32]
+        return f"task:{self.name}:{digest}"
+
+    def enqueue(self, args=(), kwargs=None, *, using=None, **options):
+        """
+        Queue the task once the transaction on ``using`` commits, unless an
+        identical run is pending already. ``options`` go to ``apply_async()``.
+        """
+        transaction.on_commit(
+            partial(self._enqueue, list(args), kwargs or {}, options),
+            using=using,
+        )
+
+    def _enqueue(self, args, kwargs, options):
+        key = self.dedupe_key(args, kwargs)
+        if not self._cache.add(f"{key}:pending", 1, self.debounce + self.dedupe_ttl):
+            logger.debug("Collapsed enqueue of %s into the pending run", key)
+            metrics.TASK_ENQUEUES.labels(self.name, "collapsed").inc()
+            return
+        metrics.TASK_ENQUEUES.labels(self.name, "sent").inc()
+        if self.debounce:
+            options.setdefault("countdown", self.debounce)
+        try:
+            self.apply_async(args, kwargs, **options)
+        except Exception:
+            # Don't keep collapsing enqueues into a run that was never sent.
+            self._cache.delete(f"{key}:pending")
+            raise
+
+    def __call__(self, *args, **kwargs):
+        if self.request.called_directly:
+            return super().__call__(*args, **kwargs)
+        key = self.dedupe_key(list(args), kwargs)
+        lock_ttl = self.time_limit or self.app.conf.task_time_limit or self.dedupe_ttl
+        if not self._cache.add(f"{key}:running", 1, lock_ttl):
+            # Keep the pending key: this run still stands for the enqueues it
+            # collapsed.
+            logger.debug("%s is running already; retrying later", key)
+            self.apply_async(list(args), kwargs, countdown=self.lock_retry_delay)
+            return None
+        self._cache.delete(f"{key}:pending")
+        try:
+            return super().__call__(*args, **kwargs)
+        finally:
+            self._cache.delete(f"{key}:running")
@@ -0,0 +1,65 @@
+import base64
+import hashlib
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+BOOTSTRAP_VERSION = "5.2.3"
+CDN_URL = "https://cdnjs.cloudflare.com/ajax/libs/bootstrap/{version}/{name}"
+# The same files and Subresource Integrity hashes base.html loads from cdnjs.
+FILES = {
+    "css/bootstrap.min.css": (
+        "sha512-SbiR/eusphKoMVVXysTKG/7VseWii+Y3FdHrt0EpKgpToZeemhqHeZeLWLhJutz/"
+        "2ut2Vw1uQEj2MbRF+TVBUA=="
+    ),
+    "js/bootstrap.min.js": (
+        "sha512-1/RvZTcCDEUjY/CypiMz+iqqtaoQfAITmNSJY17Myp4Ms5mdxPS5UV7iOfdZoxcGhz"
+        "FbOm6sntTKJppjvuhg4g=="
+    ),
+}
+
+
+def integrity(content):
+    digest = hashlib.sha512(content).digest()
+    return f"sha512-{base64.b64encode(digest).decode()}"
+
+
+class Command(BaseCommand):
+    help = (
+        "Download Bootstrap into the project's static files, so it is "
+        "collected, fingerprinted and served with them when "
+        "DJANGO_VENDOR_BOOTSTRAP is set."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dest",
+            default=Path(settings.STATICFILES_DIRS[0]) / "vendor" / "bootstrap",
+            type=Path,
+            help="Directory to write the files to.",
+        )
+        parser.add_argument("--timeout", type=float, default=30)
+
+    def handle(self, *args, dest, timeout, **options):
+        for name, expected in FILES.items():
+            url = CDN_URL.format(version=BOOTSTRAP_VERSION, name=name)
+            try:
+                with urllib.request.urlopen(url, timeout=timeout) as response:  # noqa: S310
+                    content = response.read()
+            except urllib.error.URLError as exc:
+                msg = f"Could not download {url}: {exc.reason}"
+                raise CommandError(msg) from exc
+            if integrity(content) != expected:
+                msg = f"{url} does not match its integrity hash."
+                raise CommandError(msg)
+            path = dest / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(content)
+            self.stdout.write(f"Wrote {path}")
+        self.stdout.write(
+            self.style.SUCCESS(f"Bootstrap {BOOTSTRAP_VERSION} vendored in {dest}."),
+        )
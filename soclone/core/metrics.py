@@ -0,0 +1,181 @@
+"""
+Prometheus metrics of the web and Celery processes.
+
+Metrics are ``prometheus_client`` counters and histograms. Gunicorn and
+Celery fork several processes, so with ``PROMETHEUS_MULTIPROC_DIR`` set in the
+environment (before anything imports ``prometheus_client``) every process
+writes its values to memory-mapped files in that directory, and ``render()``
+adds them up across processes. ``gunicorn.conf.py`` sets it for the web
+workers and clears it when gunicorn starts; the Procfile sets one per Celery
+worker. Without it, as in tests and ``runserver``, each process only
+exposes its own values.
+
+``metrics_view`` serves ``render()`` to staff and to scrapers sending the
+metrics token, adding the directories of the Procfile's Celery workers
+(``METRICS_WORKER_DIRS``) to the web processes' own, so one scrape covers
+every process of the host. A Celery worker can also serve its own metrics on
+``CELERY_METRICS_PORT``.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import time
+from pathlib import Path
+
+from prometheus_client import CONTENT_TYPE_LATEST
+from prometheus_client import REGISTRY
+from prometheus_client import CollectorRegistry
+from prometheus_client import Counter
+from prometheus_client import Histogram
+from prometheus_client import generate_latest
+from prometheus_client import multiprocess
+from prometheus_client.registry import Collector
+
+MULTIPROC_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
+# Upper bounds of the latency buckets, in seconds.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+TASK_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300, 900)
+# Components of a request's time recorded by REQUEST_DURATION.
+COMPONENTS = ("total", "db", "cache", "template")
+# Message header holding the time a task was sent.
+PUBLISHED_AT_HEADER = "soclone_published_at"
+
+REQUEST_DURATION = Histogram(
+    "soclone_request_duration_seconds",
+    "Time spent per request, by URL name and component.",
+    ["view", "component"],
+    buckets=LATENCY_BUCKETS,
+)
+REQUEST_QUERIES = Histogram(
+    "soclone_request_db_queries",
+    "Database queries run per request, by URL name.",
+    ["view"],
+    buckets=QUERY_BUCKETS,
+)
+REQUEST_CACHE_LOOKUPS = Counter(
+    "soclone_request_cache_lookups",
+    "Cache reads made while handling requests, by URL name and result.",
+    ["view", "result"],
+)
+CACHE_TIER_EVENTS = Counter(
+    "soclone_cache_tier_events",
+    "Events of the two-tier cache, by tier.",
+    ["tier", "event"],
+)
+TASK_DURATION = Histogram(
+    "soclone_celery_task_duration_seconds",
+    "Time Celery tasks ran for, by task name.",
+    ["task"],
+    buckets=TASK_BUCKETS,
+)
+TASK_QUEUE_WAIT = Histogram(
+    "soclone_celery_task_queue_wait_seconds",
+    "Time between sending a task and a worker starting it, by task name.",
+    ["task"],
+    buckets=TASK_BUCKETS,
+)
+TASKS = Counter(
+    "soclone_celery_tasks",
+    "Celery tasks run, by task name and final state.",
+    ["task", "state"],
+)
+TASK_ENQUEUES = Counter(
+    "soclone_celery_task_enqueues",
+    "Enqueues of deduplicated tasks, by task name and whether they were sent "
+    "or collapsed into a pending run.",
+    ["task", "result"],
+)
+TASK_RETRIES = Counter(
+    "soclone_celery_task_retries",
+    "Celery task retries, by task name.",
+    ["task"],
+)
+
+
+def observe_request(view, timings):
+    """Record a request's ``soclone.core.timing.RequestTimings``."""
+    for component in COMPONENTS:
+        REQUEST_DURATION.labels(view, component).observe(getattr(timings, component))
+    REQUEST_QUERIES.labels(view).observe(timings.db_queries)
+    if timings.cache_hits:
+        REQUEST_CACHE_LOOKUPS.labels(view, "hit").inc(timings.cache_hits)
+    if timings.cache_misses:
+        REQUEST_CACHE_LOOKUPS.labels(view, "miss").inc(timings.cache_misses)
+
+
+class _DirectoriesCollector(Collector):
+    """``MultiProcessCollector`` over the files of several directories."""
+
+    def __init__(self, paths):
+        self.paths = paths
+
+    def collect(self):
+        files = [str(file) for path in self.paths for file in Path(path).glob("*.db")]
+        return multiprocess.MultiProcessCollector.merge(files, accumulate=True)
+
+
+def registry(extra_dirs=()):
+    """
+    The registry to expose: in multiprocess mode, the values of every process
+    writing to ``PROMETHEUS_MULTIPROC_DIR`` or to one of ``extra_dirs``.
+    """
+    path = os.environ.get(MULTIPROC_DIR_ENV)
+    if not path:
+        return REGISTRY
+    collector_registry = CollectorRegistry()
+    paths = dict.fromkeys(
+        Path(directory).resolve() for directory in [path, *extra_dirs]
+    )
+    collector_registry.register(_DirectoriesCollector(list(paths)))
+    return collector_registry
+
+
+def render(extra_dirs=()):
+    """Return the metrics in the Prometheus text format and its content type."""
+    return generate_latest(registry(extra_dirs)), CONTENT_TYPE_LATEST
+
+
+def reset_multiprocess_dir():
+    """Empty ``PROMETHEUS_MULTIPROC_DIR``; call before forking workers."""
+    path = os.environ.get(MULTIPROC_DIR_ENV)
+    if path:
+        shutil.rmtree(path, ignore_errors=True)
+        Path(path).mkdir(parents=True, exist_ok=True)
+
+
+def mark_process_dead(pid):
+    if os.environ.get(MULTIPROC_DIR_ENV):
+        multiprocess.mark_process_dead(pid)
+
+
+# Celery signal receivers, connected in config/celery_app.py.
+
+_task_starts: dict[str, float] = {}
+
+
+def task_published(sender=None, headers=None, **kwargs):
+    if headers is not None:
+        headers[PUBLISHED_AT_HEADER] = time.time()
+
+
+def task_started(task_id=None, task=None, **kwargs):
+    _task_starts[task_id] = time.perf_counter()
+    published_at = getattr(task.request, PUBLISHED_AT_HEADER, None)
+    if published_at is not None:
+        TASK_QUEUE_WAIT.labels(task.name).observe(
+            max(time.time() - published_at, 0),
+        )
+
+
+def task_finished(task_id=None, task=None, state=None, **kwargs):
+    started = _task_starts.pop(task_id, None)
+    if started is not None:
+        TASK_DURATION.labels(task.name).observe(time.perf_counter() - started)
+    TASKS.labels(task.name, state or "UNKNOWN").inc()
+
+
+def task_retried(sender=None, **kwargs):
+    TASK_RETRIES.labels(sender.name).inc()
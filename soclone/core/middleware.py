@@ -0,0 +1,146 @@
+import contextlib
+import time
+
+from asgiref.sync import iscoroutinefunction
+from asgiref.sync import markcoroutinefunction
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from soclone.core import metrics
+from soclone.core import timing
+from soclone.core.db.routing import replica_reads
+from soclone.core.db.stats import track_queries
+
+SAFE_METHODS = {"GET", "HEAD"}
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Let safe requests read from replicas and pin writers to the primary.
+
+    After a request writes to the database the client gets a cookie that
+    keeps its reads on the primary for ``DATABASE_REPLICA_PIN_SECONDS``, so it
+    always sees its own changes even while replicas catch up. Queries run per
+    database are recorded on ``request.db_queries``.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with self._routing(request) as (state, stats):
+            response = self.get_response(request)
+        return self._finish(response, state, stats)
+
+    async def __acall__(self, request):
+        with self._routing(request) as (state, stats):
+            response = await self.get_response(request)
+        return self._finish(response, state, stats)
+
+    @contextlib.contextmanager
+    def _routing(self, request):
+        cookie_name = settings.DATABASE_REPLICA_PIN_COOKIE_NAME
+        pinned = self._is_pinned(request.COOKIES.get(cookie_name))
+        use_replica = request.method in SAFE_METHODS and not pinned
+        with replica_reads(enabled=use_replica) as state, track_queries() as stats:
+            request.db_queries = stats
+            yield state, stats
+
+    def _finish(self, response, state, stats):
+        if settings.DEBUG:
+            response["X-DB-Queries"] = ", ".join(
+                f"{alias}={count}" for alias, count in stats.counts().items()
+            )
+        if state.wrote:
+            pin_seconds = settings.DATABASE_REPLICA_PIN_SECONDS
+            response.set_cookie(
+                settings.DATABASE_REPLICA_PIN_COOKIE_NAME,
+                str(int(time.time()) + pin_seconds),
+                max_age=pin_seconds,
+                secure=settings.SESSION_COOKIE_SECURE,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+    def _is_pinned(self, value):
+        try:
+            return int(value) > time.time()
+        except (TypeError, ValueError):
+            return False
+
+
+class ServerTimingMiddleware:
+    """
+    Time each request's database, cache and template work.
+
+    Staff users, clients with the metrics token and everyone while ``DEBUG``
+    is on get the timings in a ``Server-Timing`` header; every request is also
+    recorded in the Prometheus metrics of ``soclone.core.metrics``. Put it
+    first in ``MIDDLEWARE`` so the total covers the other middleware too.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        started = time.perf_counter()
+        with self._timing() as (timings, queries):
+            response = self.get_response(request)
+        self._record(request, timings, queries, started)
+        if settings.DEBUG or timing.can_view_timings(request):
+            response["Server-Timing"] = timings.server_timing()
+        return response
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        with self._timing() as (timings, queries):
+            response = await self.get_response(request)
+        self._record(request, timings, queries, started)
+        # request.user may load the session and the user, which mustn't happen
+        # on the event loop.
+        if settings.DEBUG or await sync_to_async(timing.can_view_timings)(request):
+            response["Server-Timing"] = timings.server_timing()
+        return response
+
+    @contextlib.contextmanager
+    def _timing(self):
+        timing.instrument_caches()
+        with timing.record_timings() as timings, track_queries() as queries:
+            yield timings, queries
+
+    def _record(self, request, timings, queries, started):
+        timings.total = time.perf_counter() - started
+        timings.db = queries.duration
+        timings.db_queries = queries.count
+        match = request.resolver_match
+        metrics.observe_request(
+            match.view_name if match else "<unresolved>",
+            timings,
+        )
+
+    def process_template_response(self, request, response):
+        # Called just before the response is rendered.
+        timings = timing.current_timings()
+        if timings is not None:
+            started = time.perf_counter()
+
+            def stop(response):
+                timings.template += time.perf_counter() - started
+
+            response.add_post_render_callback(stop)
+        return response
@@ -0,0 +1,160 @@
+"""
+Full-page cache for anonymous visitors.
+
+``cache_anonymous_page`` stores the rendered response of a view per path and
+language. Only requests that can't be personalised are served from it or
+stored: GET/HEAD without a query string, sent without a session or messages
+cookie. Anything else, such as a logged-in user, renders the view as usual.
+
+Cached pages carry a strong ``ETag`` and ``Last-Modified``, so revalidating
+browsers get a 304. They are marked ``private``, and responses that set a
+cookie (a session, a CSRF token) are never stored.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import time
+from functools import wraps
+from http import HTTPStatus
+
+from asgiref.sync import iscoroutinefunction
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.cache import patch_cache_control
+from django.utils.http import http_date
+from django.utils.translation import get_language
+
+KEY_PREFIX = "pagecache"
+CACHEABLE_METHODS = {"GET", "HEAD"}
+
+
+def page_key(path, language):
+    return f"{KEY_PREFIX}:{language}:{path}"
+
+
+def invalidate_page(path):
+    """Drop ``path`` from the page cache in every language."""
+    caches[settings.PAGE_CACHE_ALIAS].delete_many(
+        [page_key(path, language) for language, _ in settings.LANGUAGES],
+    )
+
+
+def _is_cacheable(request):
+    user = getattr(request, "user", None)
+    return (
+        request.method in CACHEABLE_METHODS
+        and not request.META.get("QUERY_STRING")
+        and settings.SESSION_COOKIE_NAME not in request.COOKIES
+        and "messages" not in request.COOKIES
+        # Without a session cookie this doesn't touch the database.
+        and not (user is not None and user.is_authenticated)
+    )
+
+
+def _respond(request, entry):
+    response = HttpResponse(entry["content"], content_type=entry["content_type"])
+    response["ETag"] = entry["etag"]
+    response["Last-Modified"] = http_date(entry["last_modified"])
+    response["Content-Language"] = entry["language"]
+    patch_cache_control(response, private=True, no_cache=True)
+    return get_conditional_response(
+        request,
+        etag=entry["etag"],
+        last_modified=entry["last_modified"],
+        response=response,
+    )
+
+
+def _entry(request, response, language):
+    """Return the cache entry for a rendered ``response``, if it can be shared."""
+    if (
+        response.status_code != HTTPStatus.OK
+        or response.streaming
+        or response.cookies
+        # The page used a CSRF token, which mustn't be shared.
+        or request.META.get("CSRF_COOKIE_NEEDS_UPDATE")
+    ):
+        return None
+    return {
+        "content": response.content,
+        "content_type": response["Content-Type"],
+        "etag": f'"{hashlib.md5(response.content).hexdigest()}"',  # noqa: S324
+        "last_modified": int(time.time()),
+        "language": language,
+    }
+
+
+def _needs_render(response):
+    return hasattr(response, "render") and callable(response.render)
+
+
+def _timeout(timeout):
+    return settings.PAGE_CACHE_TIMEOUT if timeout is None else timeout
+
+
+def _sync_wrapper(view, timeout):
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not _is_cacheable(request):
+            return view(request, *args, **kwargs)
+        cache = caches[settings.PAGE_CACHE_ALIAS]
+        language = get_language()
+        key = page_key(request.path, language)
+        entry = cache.get(key)
+        if entry is None:
+            response = view(request, *args, **kwargs)
+            if _needs_render(response):
+                response.render()
+            entry = _entry(request, response, language)
+            if entry is None:
+                return response
+            cache.set(key, entry, _timeout(timeout))
+        return _respond(request, entry)
+
+    return wrapper
+
+
+def _async_wrapper(view, timeout):
+    # _is_cacheable() only evaluates request.user without a session cookie,
+    # which doesn't touch the database, so it's safe on the event loop.
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if not _is_cacheable(request):
+            return await view(request, *args, **kwargs)
+        cache = caches[settings.PAGE_CACHE_ALIAS]
+        language = get_language()
+        key = page_key(request.path, language)
+        entry = await cache.aget(key)
+        if entry is None:
+            response = await view(request, *args, **kwargs)
+            if _needs_render(response):
+                await sync_to_async(response.render)()
+            entry = _entry(request, response, language)
+            if entry is None:
+                return response
+            await cache.aset(key, entry, _timeout(timeout))
+        return _respond(request, entry)
+
+    return wrapper
+
+
+def cache_anonymous_page(view=None, *, timeout=None):
+    """
+    Serve ``view`` to anonymous visitors from the page cache.
+
+    Works with both sync and async views; the latter use the cache's async
+    methods.
+    """
+
+    def decorator(view):
+        if iscoroutinefunction(view):
+            return _async_wrapper(view, timeout)
+        return _sync_wrapper(view, timeout)
+
+    if view is not None:
+        return decorator(view)
+    return decorator
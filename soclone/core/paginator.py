@@ -0,0 +1,53 @@
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+
+
+def estimated_count(model, using="default") -> int | None:
+    """
+    Return PostgreSQL's row estimate for ``model``'s table.
+
+    The estimate comes from ``pg_class.reltuples``, which ``ANALYZE`` and
+    autovacuum keep up to date, so reading it costs nothing however large the
+    table is. Returns ``None`` when no estimate is available.
+    """
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+            [connection.ops.quote_name(model._meta.db_table)],  # noqa: SLF001
+        )
+        row = cursor.fetchone()
+    # reltuples is -1 for tables that have never been analyzed.
+    return row[0] if row and row[0] >= 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that skips the exact ``COUNT(*)`` on large, unfiltered tables.
+
+    When the object list is a whole table whose estimated size is at least
+    ``estimate_threshold`` rows, the estimate is used as the count. Filtered
+    querysets and small tables are counted exactly.
+    """
+
+    estimate_threshold = 100_000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if isinstance(queryset, QuerySet):  # type: ignore[misc]
+            query = queryset.query
+            if (
+                not query.where
+                and not query.distinct
+                and not query.low_mark
+                and query.high_mark is None
+            ):
+                estimate = estimated_count(queryset.model, using=queryset.db)
+                if estimate is not None and estimate >= self.estimate_threshold:
+                    return estimate
+        return super().count
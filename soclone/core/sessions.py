@@ -0,0 +1,167 @@
+"""
+Session engine that keeps sessions in the cache and falls back to the database.
+
+Set ``SESSION_ENGINE = "soclone.core.sessions"`` to store sessions in the
+``SESSION_CACHE_ALIAS`` cache (Redis, through ``django_redis``). Compared to
+``django.contrib.sessions.backends.cache`` it:
+
+* skips the write when the session data didn't change, even if it was
+  marked modified;
+* refreshes the expiry of unchanged sessions at most once every
+  ``SESSION_REFRESH_INTERVAL`` seconds, so ``SESSION_SAVE_EVERY_REQUEST``
+  costs one write per interval rather than one per request;
+* reads and writes ``django_session`` while the cache is unreachable. The
+  ``IGNORE_EXCEPTIONS`` option of ``django_redis`` would otherwise turn an
+  outage into logged-out users.
+"""
+
+import logging
+import time
+
+from django.conf import settings
+from django.contrib.sessions.backends.base import CreateError
+from django.contrib.sessions.backends.base import SessionBase
+from django.contrib.sessions.backends.base import UpdateError
+from django.contrib.sessions.backends.db import SessionStore as DBStore
+from django.core.cache import caches
+from django_redis.exceptions import ConnectionInterrupted
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "soclone.core.sessions"
+
+# ``django_redis`` raises ConnectionInterrupted from its client even when the
+# cache swallows errors; other Redis clients raise RedisError or OSError.
+CACHE_ERRORS = (ConnectionInterrupted, RedisError, OSError)
+
+
+class SessionStore(SessionBase):
+    cache_key_prefix = KEY_PREFIX
+
+    def __init__(self, session_key=None):
+        cache = caches[settings.SESSION_CACHE_ALIAS]
+        # The django_redis client raises instead of ignoring connection errors.
+        self._cache = getattr(cache, "client", cache)
+        self._loaded_data = None
+        # Only read once _loaded_data is set.
+        self._refreshed_at = 0
+        super().__init__(session_key)
+
+    @property
+    def cache_key(self):
+        return self.cache_key_prefix + self._get_or_create_session_key()  # type: ignore[attr-defined]
+
+    def _dumps(self, data):
+        return self.serializer().dumps(data)
+
+    def load(self):
+        try:
+            entry = self._cache.get(self.cache_key)
+        except CACHE_ERRORS:
+            logger.warning("Session cache unavailable, loading from the database")
+            return self._load_from_db(promote=False)
+        if entry is None:
+            return self._load_from_db(promote=True)
+        data = entry["data"]
+        self._loaded_data = self._dumps(data)
+        self._refreshed_at = entry["refreshed_at"]
+        return data
+
+    def _load_from_db(self, *, promote):
+        store = DBStore(self.session_key)
+        data = store.load()
+        if store.session_key is None:
+            self._session_key = None
+            return {}
+        if promote:
+            # Written during an outage: move it back into the cache. The row
+            # stays if the cache fails again, as the session was saved there.
+            self._session_cache = data
+            if self._write(data):
+                store.delete()
+        return data
+
+    def exists(self, session_key):
+        try:
+            return self._cache.has_key(self.cache_key_prefix + session_key)
+        except CACHE_ERRORS:
+            return DBStore().exists(session_key)
+
+    def create(self):
+        for _ in range(10000):
+            self._session_key = self._get_new_session_key()  # type: ignore[attr-defined]
+            try:
+                self.save(must_create=True)
+            except CreateError:
+                continue
+            self.modified = True
+            return
+        msg = "Unable to create a new session key."
+        raise RuntimeError(msg)
+
+    def save(self, must_create=False):  # noqa: FBT002
+        if self.session_key is None:
+            return self.create()
+        data = self._get_session(no_load=must_create)  # type: ignore[attr-defined]
+        self._write(data, must_create=must_create)
+        return None
+
+    def _write(self, data, *, must_create=False):
+        """
+        Store the session's ``data``; returns whether the cache holds it,
+        rather than the database.
+        """
+        dumped = self._dumps(data)
+        now = int(time.time())
+        if (
+            not must_create
+            and dumped == self._loaded_data
+            and now - self._refreshed_at < settings.SESSION_REFRESH_INTERVAL
+        ):
+            return True
+        entry = {"data": data, "refreshed_at": now}
+        cached = True
+        try:
+            if must_create:
+                if not self._cache.add(
+                    self.cache_key,
+                    entry,
+                    self.get_expiry_age(),
+                ):
+                    raise CreateError
+            else:
+                self._cache.set(self.cache_key, entry, self.get_expiry_age())
+        except CACHE_ERRORS:
+            logger.warning("Session cache unavailable, saving to the database")
+            self._save_to_db(data, must_create=must_create)
+            cached = False
+        self._loaded_data = dumped
+        self._refreshed_at = now
+        return cached
+
+    def _save_to_db(self, data, *, must_create):
+        store = DBStore(self.session_key)
+        store._session_cache = data  # type: ignore[attr-defined]  # noqa: SLF001
+        try:
+            store.save(must_create=must_create)
+        except UpdateError:
+            # The session only exists in the cache so far.
+            store.save(must_create=True)
+
+    def delete(self, session_key=None):
+        if session_key is None:
+            if self.session_key is None:
+                return
+            session_key = self.session_key
+        try:
+            self._cache.delete(self.cache_key_prefix + session_key)
+        except CACHE_ERRORS:
+            logger.warning("Session cache unavailable, deleting from the database")
+        # A copy may have been written while the cache was down.
+        DBStore().delete(session_key)
+
+    @classmethod
+    def clear_expired(cls):
+        # The cache expires sessions itself; only fallback rows need clearing.
+        DBStore.clear_expired()
@@ -0,0 +1,67 @@
+"""
+Serving collected static files from the application server.
+
+``collectstatic`` with ``whitenoise.storage.CompressedManifestStaticFilesStorage``
+writes content-hashed copies of every file (``project.3f2a9c0d1e4b.css``) plus
+Brotli and gzip variants of them. ``static_application()`` wraps the WSGI
+application so those files are served straight from ``STATIC_ROOT``, before
+Django's request handling: the best variant the client accepts is picked from
+``Accept-Encoding``, and hashed names are cached as immutable.
+``static_asgi_application()`` does the same for the ASGI application.
+"""
+
+from __future__ import annotations
+
+import re
+from http import HTTPStatus
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from asgiref.wsgi import WsgiToAsgi
+from django.conf import settings
+
+# ManifestStaticFilesStorage appends the first 12 hex digits of the MD5.
+HASHED_NAME_RE = re.compile(r"\.[0-9a-f]{12}\.[^/.]+$")
+
+
+def is_hashed(path, url):
+    """``immutable_file_test`` for WhiteNoise: content-hashed names never change."""
+    return bool(HASHED_NAME_RE.search(url))
+
+
+def static_application(application):
+    """Wrap ``application`` with a static file handler if it is enabled."""
+    if not settings.STATIC_WSGI_HANDLER:
+        return application
+
+    from whitenoise import WhiteNoise
+
+    return WhiteNoise(
+        application,
+        root=settings.STATIC_ROOT if Path(settings.STATIC_ROOT).is_dir() else None,
+        prefix=settings.STATIC_URL,
+        max_age=settings.STATIC_MAX_AGE,
+        immutable_file_test=is_hashed,
+    )
+
+
+def _not_found(environ, start_response):
+    start_response(f"{HTTPStatus.NOT_FOUND.value} Not Found", [])
+    return [b""]
+
+
+def static_asgi_application(application):
+    """Route ``STATIC_URL`` requests of an ASGI ``application`` to WhiteNoise."""
+    if not settings.STATIC_WSGI_HANDLER:
+        return application
+    # WhiteNoise is WSGI only: run it in a thread, as asgiref does for any
+    # WSGI application. The files are small and already compressed.
+    static = WsgiToAsgi(static_application(_not_found))
+    prefix = urlsplit(settings.STATIC_URL).path
+
+    async def router(scope, receive, send):
+        if scope["type"] == "http" and scope["path"].startswith(prefix):
+            return await static(scope, receive, send)
+        return await application(scope, receive, send)
+
+    return router
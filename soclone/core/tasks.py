@@ -0,0 +1,8 @@
+from config import celery_app
+from soclone.core.cache.compute import recompute
+
+
+@celery_app.task()
+def revalidate_cached(key, compute_path, timeout, **options):
+    """Refresh a stale ``get_or_compute()`` entry in the background."""
+    recompute(key, compute_path, timeout, **options)
@@ -0,0 +1,166 @@
+"""
+Query budgets for tests.
+
+``record_queries()`` collects the SQL run inside a block on every database
+connection; ``query_budget()`` fails the test when a block runs more queries than
+it is allowed, listing them. ``QueryBaseline`` compares the queries of a block
+with a snapshot file of earlier runs and fails on a regression with a diff of
+the SQL, so an N+1 shows up as the repeated statement it adds. Regenerate the
+snapshot after an intended change with::
+
+    $ UPDATE_QUERY_BASELINE=1 pytest soclone/core/tests/test_query_counts.py
+
+The fixtures using these are in ``soclone/conftest.py``.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import difflib
+import json
+import os
+import re
+from pathlib import Path
+
+from django.db import DEFAULT_DB_ALIAS
+from django.db import connections
+
+UPDATE_ENV = "UPDATE_QUERY_BASELINE"
+BASELINE_PATH = Path(__file__).parent / "tests" / "query_baseline.json"
+
+# Literals vary between runs (ids, timestamps, session keys); the snapshot
+# keeps the shape of each statement only.
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"\((?:\?, )+\?\)")
+# Savepoint names hold the thread id and a counter, so without this every
+# baseline update would rewrite the entries of unrelated views.
+_SAVEPOINT_RE = re.compile(r'"s\d+_x\d+"')
+
+
+def normalize_sql(sql):
+    """Replace the literals in ``sql`` with placeholders."""
+    sql = _SAVEPOINT_RE.sub('"s?"', sql)
+    sql = _NUMBER_RE.sub("?", _STRING_RE.sub("?", sql))
+    return _IN_LIST_RE.sub("(...)", sql)
+
+
+class QueryRecorder:
+    """The statements run on all connections while a block was active."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):  # noqa: PLR0913
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            connection = context["connection"]
+            with contextlib.suppress(Exception):
+                sql = connection.ops.last_executed_query(
+                    context["cursor"],
+                    sql,
+                    params,
+                )
+            if connection.alias != DEFAULT_DB_ALIAS:
+                sql = f"[{connection.alias}] {sql}"
+            self.queries.append(sql)
+
+    def __len__(self):
+        return len(self.queries)
+
+    def normalized(self):
+        return [normalize_sql(sql) for sql in self.queries]
+
+    def listing(self):
+        return "\n".join(
+            f"{number}. {sql}" for number, sql in enumerate(self.queries, 1)
+        )
+
+
+@contextlib.contextmanager
+def record_queries():
+    """Record the SQL run inside the block on every configured database."""
+    recorder = QueryRecorder()
+    with contextlib.ExitStack() as stack:
+        for alias in connections:
+            stack.enter_context(connections[alias].execute_wrapper(recorder))
+        yield recorder
+
+
+class QueryBudgetExceededError(AssertionError):
+    pass
+
+
+def assert_within_budget(recorder, budget, label="block"):
+    """Fail if ``recorder`` holds more than ``budget`` queries."""
+    if len(recorder) > budget:
+        msg = (
+            f"{label} ran {len(recorder)} queries, over its budget of {budget}:\n"
+            f"{recorder.listing()}"
+        )
+        raise QueryBudgetExceededError(msg)
+
+
+@contextlib.contextmanager
+def query_budget(budget, label="block"):
+    """Fail if the block runs more than ``budget`` queries."""
+    with record_queries() as recorder:
+        yield recorder
+    assert_within_budget(recorder, budget, label)
+
+
+class QueryBaseline:
+    """
+    Normalized SQL per key, as stored in ``path``.
+
+    ``check()`` fails when a key runs more queries than its snapshot. With
+    ``update`` it records the queries instead, and ``save()`` writes them.
+    """
+
+    def __init__(self, path=BASELINE_PATH, *, update=None):
+        self.path = Path(path)
+        self.update = bool(os.environ.get(UPDATE_ENV)) if update is None else update
+        try:
+            self.entries = json.loads(self.path.read_text())
+        except FileNotFoundError:
+            self.entries = {}
+        self.changed = False
+
+    def check(self, key, recorder):
+        queries = recorder.normalized()
+        if self.update:
+            if self.entries.get(key) != queries:
+                self.entries[key] = queries
+                self.changed = True
+            return
+        if key not in self.entries:
+            msg = (
+                f"{key} has no query baseline; "
+                f"record one with {UPDATE_ENV}=1:\n{recorder.listing()}"
+            )
+            raise QueryBudgetExceededError(msg)
+        expected = self.entries[key]
+        if len(queries) > len(expected):
+            diff = "\n".join(
+                difflib.unified_diff(
+                    expected,
+                    queries,
+                    "baseline",
+                    "current",
+                    lineterm="",
+                ),
+            )
+            msg = (
+                f"{key} ran {len(queries)} queries, {len(expected)} in the "
+                f"baseline:\n{diff}"
+            )
+            raise QueryBudgetExceededError(msg)
+
+    def save(self):
+        if not self.changed:
+            return
+        self.path.write_text(
+            json.dumps(self.entries, indent=2, sort_keys=True) + "\n",
+        )
+        self.changed = False
@@ -0,0 +1,213 @@
+from datetime import timedelta
+from types import SimpleNamespace
+
+import psycopg
+import pytest
+from django.utils import timezone
+from django_celery_beat.models import IntervalSchedule
+from django_celery_beat.models import PeriodicTask
+from django_celery_beat.models import PeriodicTasks
+
+from config.celery_app import app
+from soclone.core import beat
+from soclone.core.beat import CachedDatabaseScheduler
+from soclone.core.testing import record_queries
+
+# Notifications are delivered on commit.
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+def create_task(name, every=10, **kwargs):
+    interval, _ = IntervalSchedule.objects.get_or_create(
+        every=every,
+        period=IntervalSchedule.SECONDS,
+    )
+    return PeriodicTask.objects.create(
+        name=name,
+        task="soclone.users.tasks.get_users_count",
+        interval=interval,
+        # Due at once.
+        last_run_at=timezone.now() - timedelta(hours=1),
+        **kwargs,
+    )
+
+
+@pytest.fixture()
+def scheduler(settings, monkeypatch):
+    settings.CELERY_BEAT_SCHEDULE = {}
+    monkeypatch.setattr(app.conf, "beat_schedule", {})
+    create_task("a")
+    create_task("b", every=20)
+    scheduler = CachedDatabaseScheduler(app=app)
+    # Don't connect to the broker.
+    scheduler.producer = None
+    scheduler.sent = []
+    monkeypatch.setattr(
+        scheduler,
+        "apply_entry",
+        lambda entry, producer=None: scheduler.sent.append(entry),
+    )
+    yield scheduler
+    scheduler.close()
+
+
+def names(scheduler):
+    return {name for name in scheduler.schedule if not name.startswith("celery.")}
+
+
+def sent(scheduler):
+    return [entry.name for entry in scheduler.sent]
+
+
+def test_idle_ticks_run_no_queries(scheduler):
+    scheduler.tick()
+    scheduler.tick()
+
+    with record_queries() as recorder:
+        for _ in range(3):
+            scheduler.tick()
+
+    assert len(recorder) == 0
+
+
+def test_runs_due_entries(scheduler):
+    for _ in range(3):
+        scheduler.tick()
+
+    assert sorted(sent(scheduler)) == ["a", "b"]
+
+    scheduler.sync()
+    assert PeriodicTask.objects.get(name="a").total_run_count == 1
+
+
+def test_sync_writes_run_times_in_one_query(scheduler):
+    scheduler._dirty |= {"a", "b"}  # noqa: SLF001
+
+    with record_queries() as recorder:
+        scheduler.sync()
+
+    assert len(recorder) == 1
+
+
+def test_changed_entry_is_reloaded(scheduler):
+    task = PeriodicTask.objects.get(name="a")
+    task.args = "[1]"
+    task.save()
+
+    with record_queries() as recorder:
+        scheduler.tick()
+    assert len(recorder) == 1
+    for _ in range(3):
+        scheduler.tick()
+
+    # Sent once, with the new arguments: the replaced entry's event is dropped.
+    assert sorted((entry.name, entry.args) for entry in scheduler.sent) == [
+        ("a", [1]),
+        ("b", []),
+    ]
+
+
+def test_renamed_and_deleted_entries(scheduler):
+    PeriodicTask.objects.get(name="a").delete()
+    task = PeriodicTask.objects.get(name="b")
+    task.name = "c"
+    task.save()
+
+    scheduler.tick()
+
+    assert names(scheduler) == {"c"}
+
+
+def test_disabled_entry_is_removed(scheduler):
+    task = PeriodicTask.objects.get(name="a")
+    task.enabled = False
+    task.save()
+
+    scheduler.tick()
+
+    assert names(scheduler) == {"b"}
+
+
+def test_schedule_change_reloads_its_entries(scheduler):
+    interval = PeriodicTask.objects.get(name="b").interval
+    interval.every = 30
+    interval.save()
+
+    scheduler.tick()
+
+    assert scheduler.schedule["b"].schedule.run_every.total_seconds() == 30  # noqa: PLR2004
+
+
+def test_new_entry(scheduler):
+    create_task("d", kwargs='{"x": 1}')
+
+    for _ in range(4):
+        scheduler.tick()
+
+    assert scheduler.schedule["d"].kwargs == {"x": 1}
+    assert sorted(sent(scheduler)) == ["a", "b", "d"]
+
+
+def test_unnotified_change_is_caught_by_resync(scheduler):
+    PeriodicTask.objects.filter(name="a").update(enabled=False)
+    PeriodicTasks.update_changed()
+
+    scheduler.tick()
+    assert "a" in names(scheduler)
+
+    scheduler.resync_interval = 0
+    scheduler._next_resync = 0  # noqa: SLF001
+    scheduler.tick()
+    assert names(scheduler) == {"b"}
+
+
+def test_lost_listener_reloads_everything(scheduler):
+    scheduler._listener.close()  # noqa: SLF001
+    PeriodicTask.objects.filter(name="a").update(enabled=False)
+
+    scheduler.tick()
+    scheduler.tick()
+
+    assert names(scheduler) == {"b"}
+
+
+def test_unavailable_listener_backs_off(scheduler, monkeypatch):
+    attempts = []
+
+    def connect(*args, **kwargs):
+        attempts.append(args)
+        raise psycopg.OperationalError
+
+    # Only for the listener: Django connects with psycopg too.
+    monkeypatch.setattr(
+        beat,
+        "psycopg",
+        SimpleNamespace(connect=connect, Error=psycopg.Error),
+    )
+    scheduler._listener.close()  # noqa: SLF001
+    scheduler.tick()
+
+    # Neither reconnects nor reloads on every tick.
+    with record_queries() as recorder:
+        for _ in range(3):
+            scheduler.tick()
+    assert len(attempts) == 1
+    assert len(recorder) == 0
+
+    # The resync check still catches changes.
+    PeriodicTask.objects.filter(name="a").update(enabled=False)
+    PeriodicTasks.update_changed()
+    scheduler._next_resync = 0  # noqa: SLF001
+    scheduler.tick()
+    assert names(scheduler) == {"b"}
+    assert len(attempts) == 1
+
+
+def test_schedule_saves_notify_instead_of_updating_periodic_tasks():
+    interval = create_task("a").interval
+    before = PeriodicTasks.last_change()
+
+    interval.every = 5
+    interval.save()
+
+    assert PeriodicTasks.last_change() == before
@@ -0,0 +1,158 @@
+import time
+import uuid
+
+import fakeredis
+import pytest
+from asgiref.sync import async_to_sync
+from prometheus_client import REGISTRY
+
+from soclone.core.cache.backends import TwoTierCache
+
+
+def _wait_for(predicate, timeout=2):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+@pytest.fixture()
+def redis_server():
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture()
+def make_cache(redis_server):
+    """Return a factory of caches that behave like separate processes."""
+    channel = f"invalidation-{uuid.uuid4().hex}"
+
+    def make_cache(**options):
+        # Each LOCATION gets its own local tier, like a separate worker.
+        cache = TwoTierCache(
+            f"redis://{uuid.uuid4().hex}",
+            {
+                "OPTIONS": {
+                    "CONNECTION_POOL_KWARGS": {
+                        "connection_class": fakeredis.FakeConnection,
+                        "server": redis_server,
+                    },
+                    "INVALIDATION_CHANNEL": channel,
+                    "IGNORE_EXCEPTIONS": True,
+                    **options,
+                },
+            },
+        )
+        assert _wait_for(lambda: cache.local.connected)
+        return cache
+
+    return make_cache
+
+
+def test_local_hits(make_cache):
+    cache = make_cache()
+    cache.set("key", {"value": 1})
+    assert cache.get("key") == {"value": 1}
+
+    value = cache.get("key")
+    value["value"] = 2
+
+    assert cache.get("key") == {"value": 1}
+    stats = cache.stats()
+    assert stats["remote_hits"] == 1
+    assert stats["local_hits"] == 2  # noqa: PLR2004
+
+
+def test_tier_metrics(make_cache):
+    def sample(tier, event):
+        return REGISTRY.get_sample_value(
+            "soclone_cache_tier_events_total",
+            {"tier": tier, "event": event},
+        )
+
+    cache = make_cache()
+    cache.set("key", "value")
+    before = {event: sample(*event.split()) for event in ("local hit", "remote hit")}
+
+    cache.get("key")
+    cache.get("key")
+
+    assert sample("remote", "hit") == before["remote hit"] + 1
+    assert sample("local", "hit") == before["local hit"] + 1
+
+
+def test_aget(make_cache):
+    cache = make_cache()
+    cache.set("key", "value")
+
+    assert async_to_sync(cache.aget)("key") == "value"
+    assert async_to_sync(cache.aget)("key") == "value"
+    assert async_to_sync(cache.aget)("missing", "default") == "default"
+    stats = cache.stats()
+    assert stats["remote_hits"] == 1
+    assert stats["local_hits"] == 1
+    assert stats["remote_misses"] == 1
+
+
+def test_get_many(make_cache):
+    cache = make_cache()
+    cache.set_many({"a": 1, "b": 2})
+    cache.get("a")
+
+    assert cache.get_many(["a", "b", "c"]) == {"a": 1, "b": 2}
+    stats = cache.stats()
+    assert stats["local_hits"] == 1
+    assert stats["remote_hits"] == 2  # noqa: PLR2004
+    assert stats["remote_misses"] == 1
+
+
+def test_writes_invalidate_other_processes(make_cache):
+    reader, writer = make_cache(), make_cache()
+    writer.set("key", "old")
+    assert reader.get("key") == "old"
+
+    writer.set("key", "new")
+
+    assert _wait_for(lambda: reader.get("key") == "new")
+    assert reader.stats()["invalidations"] >= 1
+
+
+def test_clear_invalidates_other_processes(make_cache):
+    reader, writer = make_cache(), make_cache()
+    writer.set("key", "value")
+    reader.get("key")
+
+    writer.clear()
+
+    assert _wait_for(lambda: reader.get("key") is None)
+
+
+def test_eviction(make_cache):
+    cache = make_cache(LOCAL_MAX_ENTRIES=2)
+    for key in "abc":
+        cache.set(key, key)
+        cache.get(key)
+
+    assert cache.stats()["local_evictions"] == 1
+
+
+def test_local_timeout(make_cache):
+    cache = make_cache(LOCAL_TIMEOUT=0)
+    cache.set("key", "value")
+    cache.get("key")
+    cache.get("key")
+
+    assert cache.stats()["local_hits"] == 0
+
+
+def test_redis_down(make_cache, redis_server):
+    cache = make_cache()
+    cache.set("key", "value")
+    cache.get("key")
+
+    redis_server.connected = False
+
+    assert _wait_for(lambda: not cache.local.connected)
+    assert cache.get("key", "default") == "default"
+    cache.set("key", "other")
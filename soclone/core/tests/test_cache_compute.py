@@ -0,0 +1,84 @@
+import threading
+import time
+
+import pytest
+from django.core.cache import cache
+
+from soclone.core.cache import get_or_compute
+
+calls = []
+
+
+def expensive(value):
+    calls.append(value)
+    time.sleep(0.2)
+    return value
+
+
+@pytest.fixture(autouse=True)
+def _reset():
+    cache.clear()
+    calls.clear()
+    yield
+    cache.clear()
+
+
+def _expire(key):
+    entry = cache.get(key)
+    entry["expires"] = time.time() - 1
+    cache.set(key, entry)
+
+
+def test_cached():
+    assert get_or_compute("key", expensive, 60, args=[1]) == 1
+    assert get_or_compute("key", expensive, 60, args=[2]) == 1
+    assert calls == [1]
+
+
+def test_simultaneous_misses_compute_once():
+    results = []
+
+    def read():
+        results.append(get_or_compute("key", expensive, 60, args=["v"], lock=True))
+
+    threads = [threading.Thread(target=read) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert calls == ["v"]
+    assert results == ["v"] * 16
+
+
+def test_early_recomputation(monkeypatch):
+    monkeypatch.setattr("soclone.core.cache.compute.random.random", lambda: 0.5)
+    get_or_compute("key", expensive, 60, args=[1])
+    entry = cache.get("key")
+    # The computation took far longer than the time left before expiry.
+    entry["delta"] = 3600
+    cache.set("key", entry)
+
+    assert get_or_compute("key", expensive, 60, args=[2]) == 2  # noqa: PLR2004
+    assert get_or_compute("key", expensive, 60, args=[3], beta=0) == 2  # noqa: PLR2004
+
+
+def test_locked_refresh_serves_old_value_while_computing():
+    get_or_compute("key", expensive, 60, args=[1])
+    _expire("key")
+    cache.add("key:computing", 1)
+
+    assert get_or_compute("key", expensive, 60, args=[2], lock=True) == 1
+    assert calls == [1]
+
+
+def test_stale_while_revalidate(settings):
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    get_or_compute("key", expensive, 60, args=[1], stale=60)
+    _expire("key")
+
+    # The stale value is returned; the eager task has refreshed it meanwhile.
+    assert get_or_compute("key", expensive, 60, args=[2], stale=60) == 1
+    assert calls == [1, 2]
+    assert get_or_compute("key", expensive, 60, args=[3], stale=60) == 2  # noqa: PLR2004
+    assert cache.get("key:computing") is None
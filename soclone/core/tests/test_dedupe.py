@@ -0,0 +1,92 @@
+import pytest
+from django.core.cache import cache
+from prometheus_client import REGISTRY
+
+from config import celery_app
+from soclone.core.dedupe import DedupedTask
+
+runs = []
+
+
+@celery_app.task(base=DedupedTask, debounce=3)
+def record(value):
+    runs.append(value)
+    return value
+
+
+@pytest.fixture(autouse=True)
+def _reset():
+    cache.clear()
+    runs.clear()
+
+
+@pytest.fixture()
+def sent(monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        record,
+        "apply_async",
+        lambda args, kwargs, **options: calls.append((args, kwargs, options)),
+    )
+    return calls
+
+
+def enqueues(result):
+    return (
+        REGISTRY.get_sample_value(
+            "soclone_celery_task_enqueues_total",
+            {"task": record.name, "result": result},
+        )
+        or 0
+    )
+
+
+@pytest.mark.django_db()
+def test_enqueue_waits_for_commit(django_capture_on_commit_callbacks, sent):
+    with django_capture_on_commit_callbacks() as callbacks:
+        record.enqueue([1])
+        assert sent == []
+
+    assert len(callbacks) == 1
+    callbacks[0]()
+    assert sent == [([1], {}, {"countdown": 3})]
+
+
+@pytest.mark.django_db()
+def test_burst_is_collapsed(django_capture_on_commit_callbacks, sent):
+    collapsed = enqueues("collapsed")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        for _ in range(5):
+            record.enqueue([1])
+        record.enqueue([2])
+
+    assert [args for args, _, _ in sent] == [[1], [2]]
+    assert enqueues("collapsed") == collapsed + 4
+
+
+@pytest.mark.django_db()
+def test_run_releases_pending_key(django_capture_on_commit_callbacks, sent):
+    with django_capture_on_commit_callbacks(execute=True):
+        record.enqueue([1])
+    record.apply([1])
+    with django_capture_on_commit_callbacks(execute=True):
+        record.enqueue([1])
+
+    assert runs == [1]
+    assert len(sent) == 2  # noqa: PLR2004
+
+
+def test_concurrent_run_is_requeued(sent):
+    cache.add(f"{record.dedupe_key([1], {})}:running", 1)
+
+    record.apply([1])
+
+    assert runs == []
+    assert sent == [([1], {}, {"countdown": record.lock_retry_delay})]
+
+
+def test_direct_call_is_not_locked():
+    cache.add(f"{record.dedupe_key([1], {})}:running", 1)
+
+    assert record(1) == 1
@@ -0,0 +1,131 @@
+import subprocess
+import sys
+from http import HTTPStatus
+from types import SimpleNamespace
+
+import pytest
+from django.urls import reverse
+from prometheus_client import REGISTRY
+
+from config import celery_app
+from soclone.core import metrics
+from soclone.users.tests.factories import UserFactory
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+@celery_app.task(bind=True, max_retries=1, default_retry_delay=0)
+def flaky(self):
+    if not self.request.retries:
+        raise self.retry()  # noqa: RSE102
+    return "done"
+
+
+@pytest.mark.django_db()
+def test_request_metrics(client):
+    count = "soclone_request_duration_seconds_count"
+    before = sample(count, view="about", component="total")
+    queries = sample("soclone_request_db_queries_count", view="about")
+
+    client.get(reverse("about"))
+    client.get(reverse("about"))
+
+    assert sample(count, view="about", component="total") == before + 2
+    assert sample(count, view="about", component="db") == before + 2
+    assert sample("soclone_request_db_queries_count", view="about") == queries + 2
+
+
+@pytest.mark.django_db()
+def test_metrics_view_access(client, user, settings):
+    url = reverse("metrics")
+    assert client.get(url).status_code == HTTPStatus.FORBIDDEN
+
+    settings.METRICS_TOKEN = "secret"  # noqa: S105
+    response = client.get(url, HTTP_AUTHORIZATION="Bearer secret")
+    assert response.status_code == HTTPStatus.OK
+    assert (
+        "# TYPE soclone_request_duration_seconds histogram" in response.content.decode()
+    )
+
+    client.force_login(user)
+    assert client.get(url).status_code == HTTPStatus.FORBIDDEN
+
+
+@pytest.mark.django_db()
+def test_metrics_view_for_staff(client):
+    client.force_login(UserFactory(is_staff=True))
+
+    assert client.get(reverse("metrics")).status_code == HTTPStatus.OK
+
+
+def test_task_metrics():
+    name = flaky.name
+    runs = sample("soclone_celery_task_duration_seconds_count", task=name)
+    retries = sample("soclone_celery_task_retries_total", task=name)
+    successes = sample("soclone_celery_tasks_total", task=name, state="SUCCESS")
+
+    assert flaky.apply().get() == "done"
+
+    assert sample("soclone_celery_task_duration_seconds_count", task=name) == runs + 2
+    assert sample("soclone_celery_task_retries_total", task=name) == retries + 1
+    assert (
+        sample("soclone_celery_tasks_total", task=name, state="SUCCESS")
+        == successes + 1
+    )
+
+
+def test_queue_wait():
+    headers: dict[str, float] = {}
+    metrics.task_published(headers=headers)
+
+    # Workers copy the message headers onto task.request.
+    class Task:
+        name = "queued"
+        request = SimpleNamespace(
+            **{
+                metrics.PUBLISHED_AT_HEADER: headers[metrics.PUBLISHED_AT_HEADER] - 2,
+            },
+        )
+
+    metrics.task_started(task_id="id", task=Task)
+    metrics.task_finished(task_id="id", task=Task, state="SUCCESS")
+
+    wait = "soclone_celery_task_queue_wait_seconds"
+    assert sample(f"{wait}_count", task="queued") == 1
+    assert sample(f"{wait}_bucket", task="queued", le="1.0") == 0
+
+
+def _count_task_in(path):
+    script = (
+        "from soclone.core import metrics; "
+        "metrics.TASKS.labels('shared', 'SUCCESS').inc()"
+    )
+    path.mkdir(exist_ok=True)
+    env = {"PROMETHEUS_MULTIPROC_DIR": str(path)}
+    subprocess.run([sys.executable, "-c", script], env=env, check=True)  # noqa: S603
+
+
+def test_multiprocess_aggregation(tmp_path, monkeypatch):
+    for _ in range(2):
+        _count_task_in(tmp_path)
+
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+    content, _ = metrics.render()
+
+    assert b'soclone_celery_tasks_total{state="SUCCESS",task="shared"} 2.0' in content
+
+
+@pytest.mark.django_db()
+def test_metrics_view_adds_worker_dirs(client, tmp_path, monkeypatch, settings):
+    web, workers = tmp_path / "web", [tmp_path / "bulk", tmp_path / "missing"]
+    _count_task_in(web)
+    _count_task_in(workers[0])
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(web))
+    settings.METRICS_WORKER_DIRS = [str(path) for path in workers]
+    client.force_login(UserFactory(is_staff=True))
+
+    content = client.get(reverse("metrics")).content
+
+    assert b'soclone_celery_tasks_total{state="SUCCESS",task="shared"} 2.0' in content
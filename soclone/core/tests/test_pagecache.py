@@ -0,0 +1,83 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import caches
+from django.urls import reverse
+
+from soclone.core.pagecache import page_key
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture()
+def page_cache(settings):
+    settings.CACHES = {
+        **settings.CACHES,
+        "pages": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    }
+    settings.PAGE_CACHE_ALIAS = "pages"
+    cache = caches["pages"]
+    yield cache
+    cache.clear()
+
+
+def test_anonymous_page_is_cached(client, page_cache, django_assert_num_queries):
+    first = client.get(reverse("about"))
+    assert first.status_code == HTTPStatus.OK
+    assert page_cache.get(page_key(reverse("about"), "en")) is not None
+
+    with django_assert_num_queries(0):
+        second = client.get(reverse("about"))
+
+    assert second.content == first.content
+    assert second["ETag"] == first["ETag"]
+    assert "Last-Modified" in second
+    assert "private" in second["Cache-Control"]
+    assert not second.cookies
+
+
+def test_async_view_is_cached(client, page_cache, django_assert_num_queries):
+    first = client.get(reverse("home"))
+    assert first.status_code == HTTPStatus.OK
+    assert "members" in first.content.decode()
+
+    with django_assert_num_queries(0):
+        second = client.get(reverse("home"))
+
+    assert second.content == first.content
+    assert second["ETag"] == first["ETag"]
+
+
+def test_revalidation(client, page_cache):
+    etag = client.get(reverse("about"))["ETag"]
+
+    response = client.get(reverse("about"), HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert response.content == b""
+
+
+def test_authenticated_requests_bypass_cache(client, user, page_cache):
+    client.force_login(user)
+
+    response = client.get(reverse("about"))
+
+    assert response.status_code == HTTPStatus.OK
+    assert "ETag" not in response
+    assert page_cache.get(page_key(reverse("about"), "en")) is None
+
+
+def test_query_string_bypasses_cache(client, page_cache):
+    client.get(reverse("about"), {"utm_source": "feed"})
+
+    assert page_cache.get(page_key(reverse("about"), "en")) is None
+
+
+def test_user_save_invalidates_profile(user, page_cache):
+    key = page_key(user.get_absolute_url(), "en")
+    page_cache.set(key, {"content": b"stale"})
+
+    user.name = "Renamed"
+    user.save()
+
+    assert page_cache.get(key) is None
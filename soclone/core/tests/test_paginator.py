@@ -0,0 +1,45 @@
+import pytest
+from django.db import connection
+
+from soclone.core.paginator import EstimatedCountPaginator
+from soclone.core.paginator import estimated_count
+from soclone.users.models import User
+from soclone.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture()
+def analyzed_users():
+    users = UserFactory.create_batch(3)
+    with connection.cursor() as cursor:
+        cursor.execute(f"ANALYZE {User._meta.db_table}")  # noqa: SLF001
+    return users
+
+
+@pytest.mark.usefixtures("analyzed_users")
+class TestEstimatedCountPaginator:
+    def test_estimated_count(self):
+        assert estimated_count(User) == 3  # noqa: PLR2004
+
+    def test_uses_estimate_above_threshold(self, monkeypatch):
+        monkeypatch.setattr(EstimatedCountPaginator, "estimate_threshold", 1)
+        User.objects.filter(pk__in=User.objects.values("pk")[:1]).delete()
+
+        paginator = EstimatedCountPaginator(User.objects.order_by("pk"), 10)
+
+        # The estimate is stale until the next ANALYZE.
+        assert paginator.count == 3  # noqa: PLR2004
+
+    def test_exact_count_below_threshold(self):
+        User.objects.filter(pk__in=User.objects.values("pk")[:1]).delete()
+
+        paginator = EstimatedCountPaginator(User.objects.order_by("pk"), 10)
+
+        assert paginator.count == 2  # noqa: PLR2004
+
+    def test_exact_count_when_filtered(self, monkeypatch, analyzed_users):
+        monkeypatch.setattr(EstimatedCountPaginator, "estimate_threshold", 1)
+        queryset = User.objects.filter(email=analyzed_users[0].email)
+
+        assert EstimatedCountPaginator(queryset, 10).count == 1
@@ -0,0 +1,46 @@
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+
+from soclone.core.db.backends.postgresql_pool.base import DatabaseWrapper
+from soclone.core.db.backends.postgresql_pool.base import close_pools
+from soclone.core.db.backends.postgresql_pool.base import pool_stats
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture()
+def pooled():
+    settings_dict = {
+        **connection.settings_dict,
+        "CONN_MAX_AGE": 0,
+        "OPTIONS": {
+            **connection.settings_dict["OPTIONS"],
+            "pool": {"min_size": 1, "max_size": 1, "timeout": 1},
+        },
+    }
+    wrapper = DatabaseWrapper(settings_dict)
+    yield wrapper
+    wrapper.close()
+    close_pools()
+
+
+def test_connections_are_reused(pooled):
+    with pooled.cursor() as cursor:
+        cursor.execute("SELECT pg_backend_pid()")
+        (first_pid,) = cursor.fetchone()
+    pooled.close()
+    with pooled.cursor() as cursor:
+        cursor.execute("SELECT pg_backend_pid()")
+        (second_pid,) = cursor.fetchone()
+    pooled.close()
+
+    assert first_pid == second_pid
+    stats = pool_stats()["default"]
+    assert stats["requests_num"] == 2  # noqa: PLR2004
+    assert stats["pool_available"] >= 1
+
+
+def test_requires_non_persistent_connections():
+    with pytest.raises(ImproperlyConfigured):
+        DatabaseWrapper({**connection.settings_dict, "CONN_MAX_AGE": 60})
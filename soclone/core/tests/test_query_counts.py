@@ -0,0 +1,83 @@
+"""
+Queries run by every URL in ``config/urls.py``, against query_baseline.json.
+
+Each URL is requested cold (with empty caches) by an anonymous client and by
+a superuser, who can open every page. ``BUDGETS`` holds hard limits for the
+views that matter most.
+"""
+
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import caches
+from django.urls import NoReverseMatch
+from django.urls import URLResolver
+from django.urls import get_resolver
+from django.urls import reverse
+
+from soclone.core.testing import assert_within_budget
+from soclone.core.testing import record_queries
+from soclone.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+# Hard limits on the signed-in requests of these URL names.
+BUDGETS = {
+    "home": 3,
+    "questions:newest": 6,
+    "questions:detail": 5,
+    "users:detail": 2,
+    "users:redirect": 2,
+}
+# URL arguments that are filled in with the signed-in user's primary key.
+PK_ARGUMENTS = {"pk", "object_id", "id"}
+
+
+def _url_patterns(patterns, namespace=None):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from _url_patterns(
+                pattern.url_patterns,
+                pattern.namespace or namespace,
+            )
+        elif pattern.name:
+            name = f"{namespace}:{pattern.name}" if namespace else pattern.name
+            yield name, sorted(pattern.pattern.regex.groupindex)
+
+
+def _urls():
+    """The names of the URLs that can be reversed, with their arguments."""
+    urls: dict[str, list[str]] = {}
+    for name, arguments in _url_patterns(get_resolver().url_patterns):
+        if set(arguments) <= PK_ARGUMENTS:
+            urls.setdefault(name, arguments)
+    return sorted(urls.items())
+
+
+@pytest.fixture()
+def superuser():
+    return UserFactory(is_staff=True, is_superuser=True)
+
+
+def _request(client, path):
+    for cache in caches.all():
+        cache.clear()
+    with record_queries() as recorder:
+        response = client.get(path)
+    assert response.status_code < HTTPStatus.INTERNAL_SERVER_ERROR
+    return recorder
+
+
+@pytest.mark.parametrize(("name", "arguments"), _urls())
+def test_url_queries(client, superuser, query_baseline, name, arguments):
+    try:
+        path = reverse(name, kwargs={argument: superuser.pk for argument in arguments})
+    except NoReverseMatch:
+        pytest.skip(f"{name} takes arguments other than a primary key")
+
+    query_baseline.check(f"{name} (anonymous)", _request(client, path))
+    client.force_login(superuser)
+    recorder = _request(client, path)
+    query_baseline.check(f"{name} (superuser)", recorder)
+    if name in BUDGETS:
+        assert_within_budget(recorder, BUDGETS[name], label=name)
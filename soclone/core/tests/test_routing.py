@@ -0,0 +1,120 @@
+import time
+
+import pytest
+from asgiref.sync import async_to_sync
+from asgiref.sync import iscoroutinefunction
+from django.http import HttpResponse
+
+from soclone.core.db.routing import ReplicaRouter
+from soclone.core.db.routing import replica_reads
+from soclone.core.db.routing import use_primary
+from soclone.core.middleware import ReplicaRoutingMiddleware
+from soclone.users.models import User
+
+
+@pytest.fixture(autouse=True)
+def _replicas(settings):
+    settings.DATABASE_REPLICAS = ["replica_0"]
+    settings.DATABASE_REPLICA_MAX_LAG = None
+
+
+class TestReplicaRouter:
+    def test_reads_outside_request_use_primary(self):
+        assert ReplicaRouter().db_for_read(User) is None
+
+    def test_safe_reads_use_replica(self):
+        with replica_reads():
+            assert ReplicaRouter().db_for_read(User) == "replica_0"
+
+    def test_reads_after_write_use_primary(self):
+        router = ReplicaRouter()
+        with replica_reads() as state:
+            assert router.db_for_write(User) == "default"
+            assert state.wrote
+            assert router.db_for_read(User) is None
+
+    def test_use_primary(self):
+        with replica_reads(), use_primary():
+            assert ReplicaRouter().db_for_read(User) is None
+
+    @pytest.mark.django_db()
+    def test_reads_in_transaction_use_primary(self):
+        with replica_reads():
+            assert ReplicaRouter().db_for_read(User) is None
+
+    def test_replicas_are_not_migrated(self):
+        router = ReplicaRouter()
+        assert router.allow_migrate("default", "users")
+        assert not router.allow_migrate("replica_0", "users")
+
+
+class TestReplicaRoutingMiddleware:
+    def test_get_reads_from_replica(self, rf):
+        def get_response(request):
+            return HttpResponse(ReplicaRouter().db_for_read(User))
+
+        response = ReplicaRoutingMiddleware(get_response)(rf.get("/"))
+
+        assert response.content == b"replica_0"
+        assert "db_pin" not in response.cookies
+
+    def test_post_reads_from_primary(self, rf):
+        def get_response(request):
+            return HttpResponse(str(ReplicaRouter().db_for_read(User)))
+
+        response = ReplicaRoutingMiddleware(get_response)(rf.post("/"))
+
+        assert response.content == b"None"
+
+    def test_write_pins_client(self, rf, settings):
+        def get_response(request):
+            ReplicaRouter().db_for_write(User)
+            return HttpResponse()
+
+        response = ReplicaRoutingMiddleware(get_response)(rf.post("/"))
+
+        cookie = response.cookies["db_pin"]
+        assert cookie["max-age"] == settings.DATABASE_REPLICA_PIN_SECONDS
+        assert int(cookie.value) > time.time()
+
+    def test_pinned_client_reads_from_primary(self, rf):
+        def get_response(request):
+            return HttpResponse(str(ReplicaRouter().db_for_read(User)))
+
+        request = rf.get("/")
+        request.COOKIES["db_pin"] = str(int(time.time()) + 60)
+        response = ReplicaRoutingMiddleware(get_response)(request)
+
+        assert response.content == b"None"
+
+    @pytest.mark.django_db()
+    def test_counts_queries(self, rf):
+        def get_response(request):
+            User.objects.count()
+            return HttpResponse()
+
+        request = rf.get("/")
+        ReplicaRoutingMiddleware(get_response)(request)
+
+        assert request.db_queries.counts() == {"default": 1}
+
+    def test_async_get_reads_from_replica(self, rf):
+        async def get_response(request):
+            return HttpResponse(ReplicaRouter().db_for_read(User))
+
+        middleware = ReplicaRoutingMiddleware(get_response)
+        response = async_to_sync(middleware)(rf.get("/"))
+
+        assert iscoroutinefunction(middleware)
+        assert response.content == b"replica_0"
+
+    @pytest.mark.django_db(transaction=True)
+    def test_async_counts_queries(self, rf):
+        async def get_response(request):
+            await User.objects.acount()
+            return HttpResponse()
+
+        request = rf.post("/")
+        async_to_sync(ReplicaRoutingMiddleware(get_response))(request)
+
+        assert request.db_queries.counts() == {"default": 1}
@@ -0,0 +1,129 @@
+import uuid
+
+import fakeredis
+import pytest
+from django.contrib.sessions.models import Session
+from django_redis.exceptions import ConnectionInterrupted
+
+from soclone.core.sessions import SessionStore
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture()
+def redis_server(settings):
+    server = fakeredis.FakeServer()
+    settings.CACHES = {
+        **settings.CACHES,
+        "sessions": {
+            "BACKEND": "django_redis.cache.RedisCache",
+            # django_redis keeps one connection pool per URL.
+            "LOCATION": f"redis://{uuid.uuid4().hex}",
+            "OPTIONS": {
+                "CLIENT_CLASS": "django_redis.client.DefaultClient",
+                "CONNECTION_POOL_KWARGS": {
+                    "connection_class": fakeredis.FakeConnection,
+                    "server": server,
+                },
+                "IGNORE_EXCEPTIONS": True,
+            },
+        },
+    }
+    settings.SESSION_CACHE_ALIAS = "sessions"
+    return server
+
+
+@pytest.fixture()
+def writes(monkeypatch, redis_server):
+    calls = []
+    client = SessionStore()._cache  # noqa: SLF001
+    set_ = client.set
+
+    def counting_set(*args, **kwargs):
+        calls.append(args[0])
+        return set_(*args, **kwargs)
+
+    monkeypatch.setattr(client, "set", counting_set)
+    return calls
+
+
+@pytest.fixture()
+def session_key(redis_server):
+    session = SessionStore()
+    session["answer"] = 42
+    session.create()
+    return session.session_key
+
+
+def test_roundtrip(session_key, django_assert_num_queries):
+    with django_assert_num_queries(0):
+        assert SessionStore(session_key)["answer"] == 42  # noqa: PLR2004
+
+
+def test_unchanged_session_is_not_written(session_key, writes):
+    session = SessionStore(session_key)
+    session["answer"] = 42
+    assert session.modified
+
+    session.save()
+
+    assert writes == []
+
+
+def test_changed_session_is_written(session_key, writes):
+    session = SessionStore(session_key)
+    session["answer"] = 43
+    session.save()
+
+    assert len(writes) == 1
+    assert SessionStore(session_key)["answer"] == 43  # noqa: PLR2004
+
+
+def test_expiry_refresh_is_coalesced(settings, session_key, writes):
+    SessionStore(session_key).save()
+    assert writes == []
+
+    settings.SESSION_REFRESH_INTERVAL = 0
+    SessionStore(session_key).save()
+    assert len(writes) == 1
+
+
+def test_falls_back_to_database(redis_server):
+    redis_server.connected = False
+    session = SessionStore()
+    session["answer"] = 42
+    session.create()
+
+    assert Session.objects.filter(session_key=session.session_key).exists()
+    assert SessionStore(session.session_key)["answer"] == 42  # noqa: PLR2004
+
+    # Once the cache is back the session moves into it.
+    redis_server.connected = True
+    assert SessionStore(session.session_key)["answer"] == 42  # noqa: PLR2004
+    assert not Session.objects.filter(session_key=session.session_key).exists()
+    assert SessionStore().exists(session.session_key)
+
+
+def test_failed_promotion_keeps_database_copy(redis_server, monkeypatch):
+    redis_server.connected = False
+    session = SessionStore()
+    session["answer"] = 42
+    session.create()
+    redis_server.connected = True
+
+    def failing_set(*args, **kwargs):
+        raise ConnectionInterrupted(connection=None)
+
+    client = SessionStore()._cache  # noqa: SLF001
+    monkeypatch.setattr(client, "set", failing_set)
+
+    assert SessionStore(session.session_key)["answer"] == 42  # noqa: PLR2004
+    assert Session.objects.filter(session_key=session.session_key).exists()
+    assert SessionStore(session.session_key)["answer"] == 42  # noqa: PLR2004
+
+
+def test_delete(session_key):
+    SessionStore(session_key).delete()
+
+    assert not SessionStore().exists(session_key)
+    assert SessionStore(session_key).get("answer") is None
@@ -0,0 +1,133 @@
+import re
+from http import HTTPStatus
+from typing import Any
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.management import call_command
+
+from soclone.core.staticfiles import is_hashed
+from soclone.core.staticfiles import static_application
+from soclone.core.staticfiles import static_asgi_application
+
+
+def _django(environ, start_response):
+    start_response("404 Not Found", [])
+    return [b""]
+
+
+@pytest.fixture()
+def collected(settings, tmp_path):
+    settings.STATIC_ROOT = str(tmp_path / "static")
+    settings.STATIC_WSGI_HANDLER = True
+    # Only the project's own files; compressing the admin's takes a while.
+    settings.STATICFILES_FINDERS = [
+        "django.contrib.staticfiles.finders.FileSystemFinder",
+    ]
+    settings.STORAGES = {
+        **settings.STORAGES,
+        "staticfiles": {
+            "BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage",
+        },
+    }
+    call_command("collectstatic", interactive=False, verbosity=0)
+    return tmp_path / "static"
+
+
+def _get(application, path, accept_encoding=""):
+    response: dict[str, Any] = {}
+
+    def start_response(status, headers):
+        response["status"] = int(status.split()[0])
+        response["headers"] = dict(headers)
+
+    environ = {
+        "REQUEST_METHOD": "GET",
+        "PATH_INFO": path,
+        "QUERY_STRING": "",
+        "HTTP_ACCEPT_ENCODING": accept_encoding,
+        "SERVER_NAME": "testserver",
+        "SERVER_PORT": "80",
+        "wsgi.url_scheme": "http",
+    }
+    body = b"".join(application(environ, start_response))
+    return response["status"], response["headers"], body
+
+
+def test_is_hashed():
+    assert is_hashed("", "/static/css/project.3f2a9c0d1e4b.css")
+    assert not is_hashed("", "/static/css/project.css")
+
+
+def test_disabled(settings):
+    settings.STATIC_WSGI_HANDLER = False
+    assert static_application(_django) is _django
+
+
+def test_serves_precompressed_hashed_files(collected):
+    hashed = next(
+        path.name
+        for path in (collected / "css").iterdir()
+        if re.fullmatch(r"project\.[0-9a-f]{12}\.css", path.name)
+    )
+    application = static_application(_django)
+
+    status, headers, body = _get(
+        application,
+        f"/static/css/{hashed}",
+        accept_encoding="gzip, br",
+    )
+
+    assert status == HTTPStatus.OK
+    assert headers["Content-Encoding"] == "br"
+    assert headers["Vary"] == "Accept-Encoding"
+    assert "immutable" in headers["Cache-Control"]
+    assert body == (collected / "css" / f"{hashed}.br").read_bytes()
+
+    status, headers, _ = _get(application, "/static/css/project.css")
+    assert status == HTTPStatus.OK
+    assert "Content-Encoding" not in headers
+    assert "immutable" not in headers["Cache-Control"]
+
+
+def test_falls_through_to_django(collected):
+    status, _, _ = _get(static_application(_django), "/about/")
+
+    assert status == HTTPStatus.NOT_FOUND
+
+
+def test_asgi(collected):
+    async def django(scope, receive, send):
+        await send({"type": "http.response.start", "status": 418, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    application = static_asgi_application(django)
+
+    async def get(path):
+        messages = []
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {
+            "type": "http",
+            "http_version": "1.1",
+            "method": "GET",
+            "path": path,
+            "query_string": b"",
+            "headers": [(b"accept-encoding", b"gzip")],
+            "server": ("testserver", 80),
+        }
+        await application(scope, receive, send)
+        start = messages[0]
+        return start["status"], dict(start["headers"])
+
+    status, headers = async_to_sync(get)("/static/css/project.css")
+    assert status == HTTPStatus.OK
+    assert headers[b"content-encoding"] == b"gzip"
+
+    status, _ = async_to_sync(get)("/about/")
+    assert status == 418  # noqa: PLR2004
@@ -0,0 +1,70 @@
+import shlex
+from pathlib import Path
+from typing import cast
+
+import pytest
+from django.conf import settings
+
+from config.celery_app import app
+
+PROCFILE = Path(settings.BASE_DIR) / "Procfile"
+
+
+def _route(name):
+    return app.amqp.router.route({}, name)
+
+
+@pytest.mark.parametrize(
+    ("name", "queue", "priority"),
+    [
+        ("soclone.mail.tasks.drain_outbox", "interactive", 0),
+        ("soclone.core.tasks.revalidate_cached", "interactive", 3),
+        ("soclone.users.tasks.generate_avatar_renditions", "interactive", None),
+        ("soclone.users.tasks.get_users_count", "interactive", None),
+        ("soclone.stats.tasks.reconcile_counters", "scheduled", None),
+        ("soclone.jobs.tasks.run_chunk", "bulk", None),
+        ("soclone.jobs.tasks.finish_wave", "bulk", None),
+        ("soclone.questions.tasks.flush_views", "bulk", None),
+    ],
+)
+def test_task_route(name, queue, priority):
+    route = _route(name)
+    assert route["queue"].name == queue
+    assert route.get("priority") == priority
+
+
+def test_routes_to_declared_queues():
+    declared = {queue.name for queue in app.conf.task_queues}
+    assert declared == {"interactive", "bulk", "scheduled"}
+    for name in app.tasks:
+        if name.startswith("soclone."):
+            assert _route(name)["queue"].name in declared, name
+
+
+def test_beat_runs_on_scheduled_queue():
+    for name, entry in settings.CELERY_BEAT_SCHEDULE.items():
+        options = cast(dict[str, str], entry.get("options", {}))
+        queue = options.get("queue") or _route(entry["task"])["queue"].name
+        assert queue == "scheduled", name
+
+
+def test_only_awaited_tasks_store_results():
+    stored = {
+        name
+        for name, task in app.tasks.items()
+        if name.startswith("soclone.") and not task.ignore_result
+    }
+    # Bulk job chunks are collected by their wave's chord.
+    assert stored == {
+        "soclone.users.tasks.get_users_count",
+        "soclone.jobs.tasks.run_chunk",
+    }
+
+
+def test_every_queue_has_a_worker():
+    consumed = set()
+    for line in PROCFILE.read_text().splitlines():
+        arguments = shlex.split(line.partition(":")[2])
+        if "worker" in arguments and "--queues" in arguments:
+            consumed.update(arguments[arguments.index("--queues") + 1].split(","))
+    assert consumed == {queue.name for queue in app.conf.task_queues}
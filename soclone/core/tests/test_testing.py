@@ -0,0 +1,69 @@
+import pytest
+
+from soclone.core.testing import QueryBaseline
+from soclone.core.testing import QueryBudgetExceededError
+from soclone.core.testing import normalize_sql
+from soclone.core.testing import query_budget
+from soclone.core.testing import record_queries
+from soclone.users.models import User
+
+pytestmark = pytest.mark.django_db
+
+
+def test_normalize_sql():
+    sql = "SELECT 1 FROM t WHERE a = 'it''s' AND b IN (3, 14) AND c = 2.5"
+
+    assert normalize_sql(sql) == "SELECT ? FROM t WHERE a = ? AND b IN (...) AND c = ?"
+
+
+def test_normalize_savepoints():
+    # Django names savepoints after the thread id and a per-thread counter.
+    for sql in ('SAVEPOINT "s1403_x12"', 'ROLLBACK TO SAVEPOINT "s98_x1"'):
+        assert normalize_sql(sql).endswith('SAVEPOINT "s?"')
+
+
+def test_budget_lists_queries(user):
+    with (  # noqa: PT012
+        pytest.raises(QueryBudgetExceededError) as exc_info,
+        query_budget(1, label="two lookups"),
+    ):
+        User.objects.get(pk=user.pk)
+        User.objects.filter(pk=user.pk).exists()
+
+    message = str(exc_info.value)
+    assert message.startswith("two lookups ran 2 queries, over its budget of 1")
+    assert f'"users_user"."id" = {user.pk}' in message
+
+
+@pytest.mark.query_budget(1)
+def test_marker(user):
+    User.objects.get(pk=user.pk)
+
+
+def test_baseline_diff(tmp_path, user):
+    path = tmp_path / "baseline.json"
+    with record_queries() as one:
+        User.objects.get(pk=user.pk)
+    with record_queries() as two:
+        for _ in range(2):
+            User.objects.get(pk=user.pk)
+
+    recording = QueryBaseline(path, update=True)
+    recording.check("page", one)
+    recording.save()
+    baseline = QueryBaseline(path, update=False)
+    baseline.check("page", one)
+
+    with pytest.raises(QueryBudgetExceededError) as exc_info:
+        baseline.check("page", two)
+
+    assert "page ran 2 queries, 1 in the baseline" in str(exc_info.value)
+    assert '+SELECT "users_user"."id"' in str(exc_info.value)
+
+
+def test_missing_baseline(tmp_path, user):
+    with record_queries() as recorder:
+        User.objects.get(pk=user.pk)
+
+    with pytest.raises(QueryBudgetExceededError, match="UPDATE_QUERY_BASELINE"):
+        QueryBaseline(tmp_path / "baseline.json", update=False).check("new", recorder)
@@ -0,0 +1,83 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.urls import reverse
+
+from soclone.core import timing
+from soclone.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture()
+def staff_client(client):
+    client.force_login(UserFactory(is_staff=True))
+    return client
+
+
+def test_cache_hits_and_misses():
+    timing.instrument_caches()
+    cache.set("present", 1)
+
+    with timing.record_timings() as timings:
+        assert cache.get("present") == 1
+        assert cache.get("absent", "default") == "default"
+        assert cache.get_many(["present", "absent"]) == {"present": 1}
+
+    assert timings.cache_hits == 2  # noqa: PLR2004
+    assert timings.cache_misses == 2  # noqa: PLR2004
+    assert timings.cache > 0
+
+
+def test_async_cache_hits_and_misses():
+    timing.instrument_caches()
+    cache.set("present", 1)
+
+    async def lookups():
+        assert await cache.aget("present") == 1
+        assert await cache.aget("absent", "default") == "default"
+        assert await cache.aget_many(["present", "absent"]) == {"present": 1}
+        await cache.aset("written", 1)
+
+    with timing.record_timings() as timings:
+        async_to_sync(lookups)()
+
+    assert timings.cache_hits == 2  # noqa: PLR2004
+    assert timings.cache_misses == 2  # noqa: PLR2004
+    assert timings.cache > 0
+
+
+def test_server_timing_header_for_staff(staff_client):
+    response = staff_client.get(reverse("users:redirect"), follow=True)
+
+    header = response["Server-Timing"]
+    for metric in ("db;", "cache;", "template;", "total;"):
+        assert metric in header
+    assert "queries" in header
+
+
+def test_server_timing_header_on_async_view(async_client):
+    async_client.force_login(UserFactory(is_staff=True))
+
+    async def get():
+        return await async_client.get(reverse("home"))
+
+    response = async_to_sync(get)()
+
+    assert "queries" in response["Server-Timing"]
+
+
+def test_no_header_for_other_users(client, user):
+    client.force_login(user)
+
+    response = client.get(reverse("about"))
+
+    assert "Server-Timing" not in response
+
+
+def test_header_for_metrics_token(client, settings):
+    settings.METRICS_TOKEN = "secret"  # noqa: S105
+
+    response = client.get(reverse("about"), HTTP_AUTHORIZATION="Bearer secret")
+
+    assert "queries" in response["Server-Timing"]
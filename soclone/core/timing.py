@@ -0,0 +1,194 @@
+"""
+Per-request performance timings.
+
+``ServerTimingMiddleware`` collects, for every request, the database queries
+and their time, cache hits, misses and time, template rendering time and the
+total time. Staff users get them in a ``Server-Timing`` header, which browser
+developer tools show next to the request; so do clients sending the metrics
+token, like the load-test benchmarks. Every request is also recorded in the
+Prometheus metrics of ``soclone.core.metrics``.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import hmac
+import time
+from dataclasses import dataclass
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+
+MISSING = object()
+TIMED_CACHE_METHODS = (
+    "add",
+    "set",
+    "set_many",
+    "delete",
+    "delete_many",
+    "incr",
+    "decr",
+    "touch",
+    "has_key",
+)
+
+
+@dataclass
+class RequestTimings:
+    total: float = 0.0
+    db: float = 0.0
+    db_queries: int = 0
+    cache: float = 0.0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    template: float = 0.0
+
+    def server_timing(self):
+        """Return the value of a ``Server-Timing`` header."""
+        return ", ".join(
+            [
+                f'db;dur={self.db * 1000:.1f};desc="{self.db_queries} queries"',
+                f"cache;dur={self.cache * 1000:.1f};"
+                f'desc="{self.cache_hits} hits, {self.cache_misses} misses"',
+                f"template;dur={self.template * 1000:.1f}",
+                f"total;dur={self.total * 1000:.1f}",
+            ],
+        )
+
+
+_current: contextvars.ContextVar[RequestTimings | None] = contextvars.ContextVar(
+    "request_timings",
+    default=None,
+)
+
+
+@contextlib.contextmanager
+def record_timings():
+    """Collect the timings of the code run inside the block."""
+    timings = RequestTimings()
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+
+
+def current_timings():
+    """Return the timings being recorded for the current request, if any."""
+    return _current.get()
+
+
+def can_view_timings(request):
+    """Staff, or a client sending ``Authorization: Bearer <METRICS_TOKEN>``."""
+    user = getattr(request, "user", None)
+    if user is not None and user.is_staff:
+        return True
+    token = settings.METRICS_TOKEN
+    authorization = request.headers.get("Authorization", "")
+    return bool(token) and hmac.compare_digest(authorization, f"Bearer {token}")
+
+
+# Cache instrumentation. Cache backends are instantiated per thread, so each
+# instance gets its methods wrapped the first time a request sees it.
+
+
+def _timed(method, *, count_hits=None):
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+        timings = _current.get()
+        if timings is None:
+            return method(*args, **kwargs)
+        started = time.perf_counter()
+        # Backends implement some methods with others (get_many with get):
+        # only the outermost call counts.
+        token = _current.set(None)
+        try:
+            result = method(*args, **kwargs)
+        finally:
+            _current.reset(token)
+            timings.cache += time.perf_counter() - started
+        if count_hits:
+            count_hits(timings, args, result)
+        return result
+
+    return wrapper
+
+
+def _timed_get(method):
+    @wraps(method)
+    def get(key, default=None, *args, **kwargs):
+        value = timed(key, MISSING, *args, **kwargs)
+        return default if value is MISSING else value
+
+    def count(timings, args, value):
+        if value is MISSING:
+            timings.cache_misses += 1
+        else:
+            timings.cache_hits += 1
+
+    timed = _timed(method, count_hits=count)
+    return get
+
+
+def _atimed(method, *, count_hits=None):
+    """``_timed()`` for the async methods of a cache."""
+
+    @wraps(method)
+    async def wrapper(*args, **kwargs):
+        timings = _current.get()
+        if timings is None:
+            return await method(*args, **kwargs)
+        started = time.perf_counter()
+        # The default implementations run the sync methods in a thread, which
+        # inherits the context.
+        token = _current.set(None)
+        try:
+            result = await method(*args, **kwargs)
+        finally:
+            _current.reset(token)
+            timings.cache += time.perf_counter() - started
+        if count_hits:
+            count_hits(timings, args, result)
+        return result
+
+    return wrapper
+
+
+def _atimed_get(method):
+    @wraps(method)
+    async def aget(key, default=None, *args, **kwargs):
+        value = await timed(key, MISSING, *args, **kwargs)
+        return default if value is MISSING else value
+
+    def count(timings, args, value):
+        if value is MISSING:
+            timings.cache_misses += 1
+        else:
+            timings.cache_hits += 1
+
+    timed = _atimed(method, count_hits=count)
+    return aget
+
+
+def _count_get_many(timings, args, found):
+    timings.cache_hits += len(found)
+    timings.cache_misses += len(args[0]) - len(found)
+
+
+def instrument_caches():
+    """Wrap the methods of this thread's cache backends to record timings."""
+    for alias in settings.CACHES:
+        cache = caches[alias]
+        if getattr(cache, "_timings_instrumented", False):
+            continue
+        cache.get = _timed_get(cache.get)
+        cache.get_many = _timed(cache.get_many, count_hits=_count_get_many)
+        for name in TIMED_CACHE_METHODS:
+            setattr(cache, name, _timed(getattr(cache, name)))
+        cache.aget = _atimed_get(cache.aget)
+        cache.aget_many = _atimed(cache.aget_many, count_hits=_count_get_many)
+        for name in TIMED_CACHE_METHODS:
+            setattr(cache, f"a{name}", _atimed(getattr(cache, f"a{name}")))
+        cache._timings_instrumented = True  # noqa: SLF001
@@ -0,0 +1,49 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.mixins import AccessMixin
+from django.core.exceptions import PermissionDenied
+from django.db import transaction
+from django.http import HttpResponse
+from django.views.generic import TemplateView
+
+from soclone.core import metrics
+from soclone.core import timing
+from soclone.core.pagecache import cache_anonymous_page
+from soclone.stats.counters import aget_count
+
+
+class AsyncLoginRequiredMixin(AccessMixin):
+    """``LoginRequiredMixin`` for views with async handlers."""
+
+    async def dispatch(self, request, *args, **kwargs):
+        # request.user loads the session and the user lazily, which mustn't
+        # happen on the event loop.
+        if not await sync_to_async(lambda: request.user.is_authenticated)():
+            return self.handle_no_permission()
+        # View.dispatch(), further along the MRO, calls the async handler.
+        return await super().dispatch(request, *args, **kwargs)  # type: ignore[misc]
+
+
+class HomeView(TemplateView):
+    template_name = "pages/home.html"
+
+    async def get(self, request, *args, **kwargs):
+        context = self.get_context_data(**kwargs)
+        context["users_count"] = await aget_count("users.total")
+        return self.render_to_response(context)
+
+
+# Read-only: skip ATOMIC_REQUESTS, which async views can't use anyway.
+home_view = transaction.non_atomic_requests(cache_anonymous_page(HomeView.as_view()))
+
+
+@transaction.non_atomic_requests
+def metrics_view(request):
+    """
+    The Prometheus metrics of every web and Celery worker process, for staff
+    or a scraper sending ``Authorization: Bearer <METRICS_TOKEN>``.
+    """
+    if not timing.can_view_timings(request):
+        raise PermissionDenied
+    content, content_type = metrics.render(settings.METRICS_WORKER_DIRS)
+    return HttpResponse(content, content_type=content_type)
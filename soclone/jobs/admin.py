@@ -0,0 +1,60 @@
+from django.contrib import admin
+from django.contrib import messages
+
+from soclone.jobs import runner
+from soclone.jobs.models import BulkJob
+
+
+@admin.register(BulkJob)
+class BulkJobAdmin(admin.ModelAdmin):
+    list_display = [
+        "__str__",
+        "status",
+        "progress_display",
+        "processed",
+        "total",
+        "failed_chunks",
+        "created_at",
+        "finished_at",
+    ]
+    list_filter = ["status", "name"]
+    readonly_fields = [
+        "name",
+        "params",
+        "status",
+        "chunk_size",
+        "concurrency",
+        "cursor",
+        "wave_end",
+        "total",
+        "processed",
+        "failed_chunks",
+        "last_error",
+        "created_at",
+        "finished_at",
+    ]
+    ordering = ["-id"]
+    actions = ["pause", "resume", "cancel"]
+
+    def has_add_permission(self, request):
+        # Jobs are started with the start_bulk_job command.
+        return False
+
+    @admin.display(description="Progress")
+    def progress_display(self, obj):
+        return f"{obj.progress:.1f}%"
+
+    @admin.action(description="Pause selected jobs after their current wave")
+    def pause(self, request, queryset):
+        paused = runner.pause(queryset)
+        self.message_user(request, f"Paused {paused} jobs.", messages.SUCCESS)
+
+    @admin.action(description="Resume selected jobs")
+    def resume(self, request, queryset):
+        resumed = runner.resume(queryset)
+        self.message_user(request, f"Resumed {resumed} jobs.", messages.SUCCESS)
+
+    @admin.action(description="Cancel selected jobs")
+    def cancel(self, request, queryset):
+        cancelled = runner.cancel(queryset)
+        self.message_user(request, f"Cancelled {cancelled} jobs.", messages.SUCCESS)
@@ -0,0 +1,16 @@
+from django.apps import AppConfig
+from django.utils.module_loading import autodiscover_modules
+from django.utils.translation import gettext_lazy as _
+
+
+class JobsConfig(AppConfig):
+    name = "soclone.jobs"
+    label = "jobs"
+    verbose_name = _("Bulk jobs")
+
+    def ready(self):
+        # Register the wave tasks with Celery before anything dispatches one.
+        import soclone.jobs.tasks  # noqa: F401
+
+        # Each app declares its bulk jobs in a ``jobs`` module.
+        autodiscover_modules("jobs")
@@ -0,0 +1,55 @@
+import json
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from soclone.jobs import runner
+
+
+class Command(BaseCommand):
+    help = (
+        "Start a bulk job declared in an app's jobs module. Its progress shows "
+        "in the admin, where it can be paused, resumed and cancelled."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "name",
+            nargs="?",
+            help="Job to start. Lists the declared jobs when omitted.",
+        )
+        parser.add_argument(
+            "--params",
+            type=json.loads,
+            default={},
+            help="Parameters of the job, as a JSON object.",
+        )
+        parser.add_argument("--chunk-size", type=int, help="Rows per chunk.")
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            help="Chunks processed at the same time.",
+        )
+
+    def handle(self, *args, **options):
+        if not options["name"]:
+            for definition in runner.definitions():
+                self.stdout.write(definition.name)
+            return
+        try:
+            runner.get(options["name"])
+        except KeyError:
+            msg = f"No bulk job named {options['name']!r}."
+            raise CommandError(msg) from None
+        if not isinstance(options["params"], dict):
+            msg = "--params has to be a JSON object."
+            raise CommandError(msg)
+        job = runner.start(
+            options["name"],
+            chunk_size=options["chunk_size"],
+            concurrency=options["concurrency"],
+            **options["params"],
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f"Started {job}: {job.total} rows to process."),
+        )
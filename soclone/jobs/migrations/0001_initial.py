@@ -0,0 +1,90 @@
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="BulkJob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=100, verbose_name="name")),
+                (
+                    "params",
+                    models.JSONField(
+                        blank=True, default=dict, verbose_name="parameters"
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("running", "Running"),
+                            ("paused", "Paused"),
+                            ("completed", "Completed"),
+                            ("failed", "Failed"),
+                            ("cancelled", "Cancelled"),
+                        ],
+                        default="running",
+                        max_length=10,
+                        verbose_name="status",
+                    ),
+                ),
+                ("chunk_size", models.PositiveIntegerField(verbose_name="chunk size")),
+                (
+                    "concurrency",
+                    models.PositiveSmallIntegerField(verbose_name="concurrency"),
+                ),
+                (
+                    "cursor",
+                    models.BigIntegerField(
+                        blank=True, null=True, verbose_name="cursor"
+                    ),
+                ),
+                (
+                    "wave_end",
+                    models.BigIntegerField(
+                        blank=True, null=True, verbose_name="wave end"
+                    ),
+                ),
+                ("total", models.BigIntegerField(default=0, verbose_name="total")),
+                (
+                    "processed",
+                    models.BigIntegerField(default=0, verbose_name="processed"),
+                ),
+                (
+                    "failed_chunks",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="failed chunks"
+                    ),
+                ),
+                ("last_error", models.TextField(blank=True, verbose_name="last error")),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="created"),
+                ),
+                (
+                    "finished_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="finished"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "bulk job",
+                "verbose_name_plural": "bulk jobs",
+            },
+        ),
+    ]
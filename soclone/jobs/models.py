@@ -0,0 +1,52 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class BulkJob(models.Model):
+    """
+    A run of a bulk job declared with ``soclone.jobs.runner.register()``.
+
+    The job goes over its queryset in waves of up to ``concurrency`` chunks of
+    ``chunk_size`` rows. ``cursor`` is the last primary key of the finished
+    waves and ``wave_end`` the last one of the wave in flight, if any.
+    """
+
+    class Status(models.TextChoices):
+        RUNNING = "running", _("Running")
+        PAUSED = "paused", _("Paused")
+        COMPLETED = "completed", _("Completed")
+        FAILED = "failed", _("Failed")
+        CANCELLED = "cancelled", _("Cancelled")
+
+    name = models.CharField(_("name"), max_length=100)
+    params = models.JSONField(_("parameters"), default=dict, blank=True)
+    status = models.CharField(
+        _("status"),
+        max_length=10,
+        choices=Status.choices,
+        default=Status.RUNNING,
+    )
+    chunk_size = models.PositiveIntegerField(_("chunk size"))
+    concurrency = models.PositiveSmallIntegerField(_("concurrency"))
+    cursor = models.BigIntegerField(_("cursor"), null=True, blank=True)
+    wave_end = models.BigIntegerField(_("wave end"), null=True, blank=True)
+    total = models.BigIntegerField(_("total"), default=0)
+    processed = models.BigIntegerField(_("processed"), default=0)
+    failed_chunks = models.PositiveIntegerField(_("failed chunks"), default=0)
+    last_error = models.TextField(_("last error"), blank=True)
+    created_at = models.DateTimeField(_("created"), auto_now_add=True)
+    finished_at = models.DateTimeField(_("finished"), null=True, blank=True)
+
+    class Meta:
+        verbose_name = _("bulk job")
+        verbose_name_plural = _("bulk jobs")
+
+    def __str__(self):
+        return f"{self.name} #{self.pk} ({self.status})"
+
+    @property
+    def progress(self):
+        """Processed rows as a percentage of the rows counted at the start."""
+        if not self.total:
+            return 100.0 if self.status == self.Status.COMPLETED else 0.0
+        return min(100.0, 100 * self.processed / self.total)
@@ -0,0 +1,194 @@
+"""
+Bulk jobs: a function run over every row of a queryset, in Celery tasks.
+
+Apps declare jobs in a ``jobs`` module, which ``JobsConfig`` imports at
+startup::
+
+    register(JobDefinition("users.reindex", User.objects.all, reindex_users))
+
+``start("users.reindex")`` records a ``BulkJob`` and goes over the queryset in
+primary key order. Chunk boundaries are found with keyset pagination (one
+``LIMIT 1 OFFSET chunk_size - 1`` index lookup per chunk past the cursor), so
+no task loads more than a chunk, and no query slows down as the job advances.
+Each wave of up to ``concurrency`` chunks is a chord on the bulk queue whose
+callback moves the cursor and dispatches the next wave: that bounds the
+parallelism and keeps progress and the cursor in the job's row.
+
+Pausing lets the wave in flight finish and stops there; resuming dispatches
+from the cursor again, so a job whose wave was lost (a worker killed, a
+message dropped) can be resumed after pausing it. A chunk may therefore run
+twice (a redelivered message, a wave resumed while still in flight), so
+``process`` has to be idempotent.
+"""
+
+from functools import partial
+
+from celery import chord
+from django.db import transaction
+from django.utils import timezone
+
+from soclone.jobs.models import BulkJob
+
+_registry = {}
+
+
+class JobDefinition:
+    """
+    Run ``process(queryset, **params)`` over ``queryset(**params)`` in chunks.
+
+    ``queryset`` is a callable returning the rows to go over, which need an
+    integer primary key; each chunk filters it again, so rows that stopped
+    matching since the job started are skipped. ``process`` returns the
+    number of rows it handled, or ``None`` to count the chunk's rows.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        name,
+        queryset,
+        process,
+        *,
+        chunk_size=1000,
+        concurrency=4,
+    ):
+        self.name = name
+        self.queryset = queryset
+        self.process = process
+        self.chunk_size = chunk_size
+        self.concurrency = concurrency
+
+    def get_queryset(self, params, low=None):
+        queryset = self.queryset(**params).order_by("pk")
+        return queryset if low is None else queryset.filter(pk__gt=low)
+
+    def ranges(self, job):
+        """Return the (low, high] primary key ranges of the job's next wave."""
+        ranges = []
+        low = job.cursor
+        for _ in range(job.concurrency):
+            keys = self.get_queryset(job.params, low).values_list("pk", flat=True)
+            high = keys[job.chunk_size - 1 : job.chunk_size].first()
+            if high is None:
+                # The last, partial chunk.
+                high = keys.last()
+                if high is not None:
+                    ranges.append((low, high))
+                break
+            ranges.append((low, high))
+            low = high
+        return ranges
+
+    def run(self, params, low, high):
+        queryset = self.get_queryset(params, low).filter(pk__lte=high)
+        processed = self.process(queryset, **params)
+        return queryset.count() if processed is None else processed
+
+
+def register(definition):
+    _registry[definition.name] = definition
+    return definition
+
+
+def get(name):
+    return _registry[name]
+
+
+def definitions():
+    return list(_registry.values())
+
+
+def start(name, *, chunk_size=None, concurrency=None, **params):
+    """
+    Record a run of job ``name`` with ``params``; its first wave is
+    dispatched once the current transaction commits.
+    """
+    definition = get(name)
+    job = BulkJob.objects.create(
+        name=name,
+        params=params,
+        chunk_size=chunk_size or definition.chunk_size,
+        concurrency=concurrency or definition.concurrency,
+        total=definition.get_queryset(params).count(),
+    )
+    transaction.on_commit(partial(dispatch_wave, job.pk))
+    return job
+
+
+def dispatch_wave(job_id):
+    """
+    Send the next wave of a running job that has none in flight, or mark the
+    job finished when no rows are left.
+    """
+    from soclone.jobs.tasks import finish_wave
+    from soclone.jobs.tasks import run_chunk
+
+    with transaction.atomic():
+        job = BulkJob.objects.select_for_update().get(pk=job_id)
+        if job.status != BulkJob.Status.RUNNING or job.wave_end is not None:
+            return
+        ranges = get(job.name).ranges(job)
+        if not ranges:
+            job.status = (
+                BulkJob.Status.FAILED if job.failed_chunks else BulkJob.Status.COMPLETED
+            )
+            job.finished_at = timezone.now()
+            job.save(update_fields=["status", "finished_at"])
+            return
+        job.wave_end = ranges[-1][1]
+        job.save(update_fields=["wave_end"])
+        wave = chord(
+            [run_chunk.si(job.pk, low, high) for low, high in ranges],
+            finish_wave.s(job.pk, job.wave_end),
+        )
+        transaction.on_commit(wave.delay)
+
+
+def advance(job_id, wave_end=None):
+    """
+    Move the cursor past the wave in flight and dispatch the next one.
+
+    ``wave_end`` is the end of the wave that finished: a wave superseded by
+    ``resume()`` doesn't move the cursor.
+    """
+    with transaction.atomic():
+        job = BulkJob.objects.select_for_update().get(pk=job_id)
+        if job.wave_end is None or wave_end not in (None, job.wave_end):
+            return
+        job.cursor = job.wave_end
+        job.wave_end = None
+        job.save(update_fields=["cursor", "wave_end"])
+        dispatch_wave(job_id)
+
+
+def pause(queryset):
+    """Stop the running jobs in ``queryset`` after their current wave."""
+    return queryset.filter(status=BulkJob.Status.RUNNING).update(
+        status=BulkJob.Status.PAUSED,
+    )
+
+
+def resume(queryset):
+    """
+    Carry on with the paused jobs in ``queryset`` from their cursor, sending
+    the wave from before the pause again if it hasn't finished.
+    """
+    resumed = 0
+    for job_id in queryset.filter(status=BulkJob.Status.PAUSED).values_list(
+        "pk",
+        flat=True,
+    ):
+        resumed += BulkJob.objects.filter(
+            pk=job_id,
+            status=BulkJob.Status.PAUSED,
+        ).update(status=BulkJob.Status.RUNNING, wave_end=None)
+        # The wave from before the pause may have been lost, leaving wave_end
+        # set for good; if it's only slow, its callback is ignored.
+        transaction.on_commit(partial(dispatch_wave, job_id))
+    return resumed
+
+
+def cancel(queryset):
+    """Stop the unfinished jobs in ``queryset`` for good."""
+    return queryset.filter(
+        status__in=[BulkJob.Status.RUNNING, BulkJob.Status.PAUSED],
+    ).update(status=BulkJob.Status.CANCELLED, finished_at=timezone.now())
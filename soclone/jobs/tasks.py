@@ -0,0 +1,38 @@
+import logging
+
+from django.db.models import F
+
+from config import celery_app
+from soclone.jobs import runner
+from soclone.jobs.models import BulkJob
+
+logger = logging.getLogger(__name__)
+
+
+# The wave's chord collects the results, so they have to be stored.
+@celery_app.task(ignore_result=False)
+def run_chunk(job_id, low, high):
+    """
+    Process the rows of a bulk job with primary keys in (``low``, ``high``].
+
+    Errors are recorded on the job rather than raised, so the rest of the
+    wave, and the job, go on. Returns the number of rows processed.
+    """
+    job = BulkJob.objects.get(pk=job_id)
+    try:
+        processed = runner.get(job.name).run(job.params, low, high)
+    except Exception as exc:
+        logger.exception("Chunk (%s, %s] of %s failed", low, high, job)
+        BulkJob.objects.filter(pk=job_id).update(
+            failed_chunks=F("failed_chunks") + 1,
+            last_error=f"({low}, {high}]: {exc!r}",
+        )
+        return 0
+    BulkJob.objects.filter(pk=job_id).update(processed=F("processed") + processed)
+    return processed
+
+
+@celery_app.task()
+def finish_wave(results, job_id, wave_end=None):
+    """Move the job's cursor past a finished wave and dispatch the next one."""
+    runner.advance(job_id, wave_end)
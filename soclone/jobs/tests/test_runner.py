@@ -0,0 +1,162 @@
+import pytest
+from django.contrib.admin.sites import site
+from django.core.management import call_command
+from django.urls import reverse
+
+from soclone.jobs import runner
+from soclone.jobs.models import BulkJob
+from soclone.users.models import User
+from soclone.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+chunks = []
+
+
+def record_chunk(users, *, fail=None, pause=False):
+    pks = list(users.values_list("pk", flat=True))
+    if fail in pks:
+        msg = f"user {fail}"
+        raise ValueError(msg)
+    chunks.append(pks)
+    if pause:
+        runner.pause(BulkJob.objects.all())
+
+
+runner.register(
+    runner.JobDefinition(
+        "tests.record",
+        lambda **params: User.objects.filter(is_active=True),
+        record_chunk,
+        chunk_size=2,
+        concurrency=2,
+    ),
+)
+
+
+@pytest.fixture(autouse=True)
+def _eager(settings):
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    chunks.clear()
+
+
+@pytest.fixture()
+def users():
+    UserFactory(is_active=False)
+    return sorted(user.pk for user in UserFactory.create_batch(5))
+
+
+def start(django_capture_on_commit_callbacks, **params):
+    with django_capture_on_commit_callbacks(execute=True):
+        job = runner.start("tests.record", **params)
+    job.refresh_from_db()
+    return job
+
+
+def test_job_runs_in_keyset_chunks(users, django_capture_on_commit_callbacks):
+    job = start(django_capture_on_commit_callbacks)
+
+    assert chunks == [users[0:2], users[2:4], users[4:5]]
+    assert job.status == BulkJob.Status.COMPLETED
+    assert (job.total, job.processed, job.progress) == (5, 5, 100.0)
+    assert job.cursor == users[-1]
+    assert job.wave_end is None
+    assert job.finished_at is not None
+
+
+def test_wave_ranges(users):
+    job = BulkJob(name="tests.record", chunk_size=2, concurrency=2)
+
+    assert runner.get("tests.record").ranges(job) == [
+        (None, users[1]),
+        (users[1], users[3]),
+    ]
+    job.cursor = users[3]
+    assert runner.get("tests.record").ranges(job) == [(users[3], users[4])]
+    job.cursor = users[4]
+    assert runner.get("tests.record").ranges(job) == []
+
+
+def test_failed_chunk(users, django_capture_on_commit_callbacks):
+    job = start(django_capture_on_commit_callbacks, fail=users[2])
+
+    assert chunks == [users[0:2], users[4:5]]
+    assert job.status == BulkJob.Status.FAILED
+    assert job.failed_chunks == 1
+    assert job.processed == 3  # noqa: PLR2004
+    assert f"user {users[2]}" in job.last_error
+
+
+def test_pause_and_resume(users, django_capture_on_commit_callbacks):
+    job = start(django_capture_on_commit_callbacks, pause=True)
+
+    # The wave in flight finishes; the next one isn't sent.
+    assert chunks == [users[0:2], users[2:4]]
+    assert job.status == BulkJob.Status.PAUSED
+    assert job.cursor == users[3]
+
+    # Don't pause again.
+    job.params = {}
+    job.save()
+    with django_capture_on_commit_callbacks(execute=True):
+        assert runner.resume(BulkJob.objects.all()) == 1
+
+    job.refresh_from_db()
+    assert chunks[2:] == [users[4:5]]
+    assert job.status == BulkJob.Status.COMPLETED
+
+
+def test_resume_after_lost_wave(users, django_capture_on_commit_callbacks):
+    job = runner.start("tests.record")
+    # The first wave is sent, but never runs.
+    runner.dispatch_wave(job.pk)
+    runner.pause(BulkJob.objects.all())
+
+    with django_capture_on_commit_callbacks(execute=True):
+        assert runner.resume(BulkJob.objects.all()) == 1
+
+    job.refresh_from_db()
+    assert chunks == [users[0:2], users[2:4], users[4:5]]
+    assert job.status == BulkJob.Status.COMPLETED
+
+
+def test_superseded_wave_is_ignored(users):
+    job = runner.start("tests.record")
+    runner.dispatch_wave(job.pk)
+    job.refresh_from_db()
+
+    runner.advance(job.pk, job.wave_end + 1)
+
+    job.refresh_from_db()
+    assert job.cursor is None
+    assert job.wave_end is not None
+
+
+def test_cancel(users):
+    job = runner.start("tests.record")
+
+    assert runner.cancel(BulkJob.objects.all()) == 1
+
+    runner.dispatch_wave(job.pk)
+    job.refresh_from_db()
+    assert job.status == BulkJob.Status.CANCELLED
+    assert chunks == []
+
+
+def test_start_command(users, django_capture_on_commit_callbacks, capsys):
+    with django_capture_on_commit_callbacks(execute=True):
+        call_command("start_bulk_job", "tests.record", "--chunk-size", "5")
+
+    assert chunks == [users]
+    assert "5 rows to process" in capsys.readouterr().out
+
+
+def test_admin_actions(admin_client):
+    job = BulkJob.objects.create(name="tests.record", chunk_size=2, concurrency=2)
+    url = reverse("admin:jobs_bulkjob_changelist")
+
+    assert site.is_registered(BulkJob)
+    admin_client.post(url, {"action": "pause", "_selected_action": [job.pk]})
+    job.refresh_from_db()
+    assert job.status == BulkJob.Status.PAUSED
+    assert admin_client.get(url).status_code == 200  # noqa: PLR2004
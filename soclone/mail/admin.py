@@ -0,0 +1,20 @@
+from django.contrib import admin
+from django.utils import timezone
+
+from soclone.mail.models import OutboxMessage
+
+
+@admin.register(OutboxMessage)
+class OutboxMessageAdmin(admin.ModelAdmin):
+    list_display = ["subject", "to", "status", "attempts", "next_attempt_at"]
+    list_filter = ["status"]
+    readonly_fields = ["created_at", "sent_at", "last_error"]
+    ordering = ["-id"]
+    actions = ["retry_now"]
+
+    @admin.action(description="Retry selected messages now")
+    def retry_now(self, request, queryset):
+        queryset.exclude(status=OutboxMessage.Status.SENT).update(
+            status=OutboxMessage.Status.PENDING,
+            next_attempt_at=timezone.now(),
+        )
@@ -0,0 +1,126 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+
+class OutboxMessageQuerySet(models.QuerySet):
+    def due(self):
+        return self.filter(
+            status=OutboxMessage.Status.PENDING,
+            next_attempt_at__lte=timezone.now(),
+        ).order_by("next_attempt_at")
+
+
+class OutboxMessage(models.Model):
+    """
+    An email waiting to be delivered by ``soclone.mail.tasks.drain_outbox``.
+
+    Rows are written in the transaction of the request that sends the mail,
+    so nothing goes out for a request that rolls back, and the provider's
+    latency is paid by a worker instead of the request.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending", _("Pending")
+        SENT = "sent", _("Sent")
+        FAILED = "failed", _("Failed")
+
+    subject = models.TextField(_("subject"))
+    body = models.TextField(_("body"))
+    content_subtype = models.CharField(max_length=20, default="plain")
+    from_email = models.CharField(_("from"), max_length=255)
+    to = models.JSONField(_("to"), default=list)
+    cc = models.JSONField(default=list)
+    bcc = models.JSONField(default=list)
+    reply_to = models.JSONField(default=list)
+    headers = models.JSONField(default=dict)
+    # [content, mimetype] pairs, e.g. the HTML part of a multipart mail.
+    alternatives = models.JSONField(default=list)
+
+    status = models.CharField(
+        _("status"),
+        max_length=10,
+        choices=Status.choices,
+        default=Status.PENDING,
+    )
+    attempts = models.PositiveSmallIntegerField(_("attempts"), default=0)
+    last_error = models.TextField(_("last error"), blank=True)
+    created_at = models.DateTimeField(_("created"), auto_now_add=True)
+    next_attempt_at = models.DateTimeField(_("next attempt"), default=timezone.now)
+    sent_at = models.DateTimeField(_("sent"), null=True, blank=True)
+
+    objects = OutboxMessageQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = _("outbox message")
+        verbose_name_plural = _("outbox messages")
+        indexes = [
+            models.Index(
+                fields=["next_attempt_at"],
+                name="mail_outbox_due_idx",
+                condition=Q(status="pending"),
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} ({self.status})"
+
+    @classmethod
+    def from_email_message(cls, message):
+        return cls(
+            subject=message.subject,
+            body=message.body,
+            content_subtype=message.content_subtype,
+            from_email=message.from_email,
+            to=list(message.to),
+            cc=list(message.cc),
+            bcc=list(message.bcc),
+            reply_to=list(message.reply_to),
+            headers=dict(message.extra_headers),
+            alternatives=[
+                list(alternative)
+                for alternative in getattr(message, "alternatives", [])
+            ],
+        )
+
+    def to_email_message(self, connection=None):
+        # Without alternatives, it renders the same message as EmailMessage.
+        message = EmailMultiAlternatives(
+            subject=self.subject,
+            body=self.body,
+            from_email=self.from_email,
+            to=self.to,
+            cc=self.cc,
+            bcc=self.bcc,
+            reply_to=self.reply_to,
+            headers=self.headers,
+            connection=connection,
+        )
+        message.content_subtype = self.content_subtype
+        for content, mimetype in self.alternatives:
+            message.attach_alternative(content, mimetype)
+        return message
+
+    def mark_sent(self):
+        self.status = self.Status.SENT
+        self.attempts += 1
+        self.sent_at = timezone.now()
+        self.last_error = ""
+
+    def mark_failed(self, error):
+        """Record a failed attempt and schedule the next one with backoff."""
+        self.attempts += 1
+        self.last_error = repr(error)
+        if self.attempts >= settings.MAIL_OUTBOX_MAX_ATTEMPTS:
+            self.status = self.Status.FAILED
+            return
+        delay = min(
+            settings.MAIL_OUTBOX_RETRY_DELAY * 2 ** (self.attempts - 1),
+            settings.MAIL_OUTBOX_RETRY_DELAY_MAX,
+        )
+        self.next_attempt_at = timezone.now() + timedelta(seconds=delay)
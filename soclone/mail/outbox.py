@@ -0,0 +1,16 @@
+from soclone.mail.models import OutboxMessage
+from soclone.mail.tasks import drain_outbox
+
+
+def enqueue(message, using=None):
+    """
+    Store ``message`` in the outbox instead of sending it.
+
+    The row joins the current transaction; a drain is queued once it commits,
+    unless one is pending already. Messages whose drain task is lost are
+    picked up by the periodic drain.
+    """
+    outbox_message = OutboxMessage.from_email_message(message)
+    outbox_message.save(using=using)
+    drain_outbox.enqueue(using=using)
+    return outbox_message
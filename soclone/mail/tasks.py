@@ -0,0 +1,76 @@
+import logging
+from datetime import timedelta
+from smtplib import SMTPException
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from config import celery_app
+from soclone.core.dedupe import DedupedTask
+from soclone.mail.models import OutboxMessage
+
+logger = logging.getLogger(__name__)
+
+UPDATE_FIELDS = ["status", "attempts", "last_error", "next_attempt_at", "sent_at"]
+
+
+@celery_app.task(
+    # A drain sends every due message: a burst of sign-ups needs only one.
+    base=DedupedTask,
+    debounce=1,
+    # Only opening the connection can raise: per-message errors are recorded
+    # on the message and retried by a later drain.
+    autoretry_for=(OSError, SMTPException),
+    retry_backoff=True,
+    retry_backoff_max=10 * 60,
+)
+def drain_outbox(batch_size=None):
+    """
+    Send due outbox messages in batches over one email backend connection.
+
+    Each batch is claimed in a short transaction with ``SELECT ... FOR UPDATE
+    SKIP LOCKED``, which moves the messages' next attempt
+    ``MAIL_OUTBOX_LEASE`` seconds ahead, so concurrent drains never send the
+    same message. The messages are then sent with no transaction open, and
+    each outcome is saved on its own: a slow mail server holds no locks, and
+    the messages of a drain that dies mid-batch are sent again once their
+    lease runs out. Queue it with ``drain_outbox.enqueue()``. Returns the
+    number of messages sent.
+    """
+    batch_size = batch_size or settings.MAIL_OUTBOX_BATCH_SIZE
+    sent = 0
+    with get_connection() as connection:
+        while batch := _claim(batch_size):
+            for message in batch:
+                try:
+                    message.to_email_message(connection).send()
+                except Exception as exc:  # noqa: BLE001
+                    logger.warning(
+                        "Sending outbox message %s failed: %r",
+                        message.pk,
+                        exc,
+                    )
+                    message.mark_failed(exc)
+                else:
+                    message.mark_sent()
+                    sent += 1
+                message.save(update_fields=UPDATE_FIELDS)
+    return sent
+
+
+def _claim(batch_size):
+    lease_until = timezone.now() + timedelta(seconds=settings.MAIL_OUTBOX_LEASE)
+    with transaction.atomic():
+        batch = list(
+            OutboxMessage.objects.due().select_for_update(skip_locked=True)[
+                :batch_size
+            ],
+        )
+        OutboxMessage.objects.filter(pk__in=[message.pk for message in batch]).update(
+            next_attempt_at=lease_until,
+        )
+    for message in batch:
+        message.next_attempt_at = lease_until
+    return batch
@@ -0,0 +1,131 @@
+from smtplib import SMTPException
+
+import pytest
+from django.core import mail
+from django.core.mail import EmailMultiAlternatives
+from django.core.mail.backends.locmem import EmailBackend
+from django.urls import reverse
+from django.utils import timezone
+
+from soclone.mail import tasks
+from soclone.mail.models import OutboxMessage
+from soclone.mail.outbox import enqueue
+from soclone.mail.tasks import drain_outbox
+
+pytestmark = pytest.mark.django_db
+
+BOUNCING_ADDRESS = "bounce@example.com"
+
+
+class BouncingBackend(EmailBackend):
+    def send_messages(self, messages):
+        if any(BOUNCING_ADDRESS in message.to for message in messages):
+            raise SMTPException(BOUNCING_ADDRESS)
+        return super().send_messages(messages)
+
+
+def _message(to="to@example.com"):
+    message = EmailMultiAlternatives(
+        "Subject",
+        "Body",
+        "from@example.com",
+        [to],
+        headers={"X-Test": "1"},
+    )
+    message.attach_alternative("<p>Body</p>", "text/html")
+    return message
+
+
+def test_enqueue(django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks() as callbacks:
+        outbox_message = enqueue(_message())
+
+    assert mail.outbox == []
+    assert len(callbacks) == 1
+    message = OutboxMessage.objects.get(pk=outbox_message.pk).to_email_message()
+    assert message.to == ["to@example.com"]
+    assert message.extra_headers == {"X-Test": "1"}
+    assert message.alternatives == [("<p>Body</p>", "text/html")]
+
+
+def test_drain_reuses_connection(monkeypatch):
+    for _ in range(3):
+        enqueue(_message())
+    connections = []
+
+    def get_connection():
+        connections.append(EmailBackend())
+        return connections[-1]
+
+    monkeypatch.setattr(tasks, "get_connection", get_connection)
+
+    assert drain_outbox(batch_size=2) == 3  # noqa: PLR2004
+
+    assert len(connections) == 1
+    assert len(mail.outbox) == 3  # noqa: PLR2004
+    assert not OutboxMessage.objects.exclude(status=OutboxMessage.Status.SENT)
+
+
+def test_failure_backs_off(settings):
+    settings.EMAIL_BACKEND = "soclone.mail.tests.test_outbox.BouncingBackend"
+    settings.MAIL_OUTBOX_MAX_ATTEMPTS = 2
+    enqueue(_message())
+    bouncing = enqueue(_message(to=BOUNCING_ADDRESS))
+
+    assert drain_outbox() == 1
+
+    bouncing.refresh_from_db()
+    assert bouncing.status == OutboxMessage.Status.PENDING
+    assert bouncing.attempts == 1
+    assert bouncing.next_attempt_at > timezone.now()
+    assert "SMTPException" in bouncing.last_error
+
+    OutboxMessage.objects.filter(pk=bouncing.pk).update(next_attempt_at=timezone.now())
+    assert drain_outbox() == 0
+    bouncing.refresh_from_db()
+    assert bouncing.status == OutboxMessage.Status.FAILED
+
+
+def test_claimed_messages_are_leased(monkeypatch):
+    enqueue(_message())
+    due_while_sending = []
+
+    class RecordingBackend(EmailBackend):
+        def send_messages(self, messages):
+            due_while_sending.append(OutboxMessage.objects.due().count())
+            return super().send_messages(messages)
+
+    monkeypatch.setattr(tasks, "get_connection", RecordingBackend)
+
+    assert drain_outbox() == 1
+    # Another drain wouldn't have picked the message up while it was sent.
+    assert due_while_sending == [0]
+
+
+def test_abandoned_claim_is_sent_after_lease():
+    message = enqueue(_message())
+    tasks._claim(batch_size=1)  # noqa: SLF001
+
+    # The drain that claimed it died before sending it.
+    assert drain_outbox() == 0
+    OutboxMessage.objects.filter(pk=message.pk).update(next_attempt_at=timezone.now())
+    assert drain_outbox() == 1
+
+
+def test_signup_mail_is_queued(client):
+    response = client.post(
+        reverse("account_signup"),
+        {
+            "email": "new@example.com",
+            "password1": "a very secret password",
+            "password2": "a very secret password",
+        },
+    )
+
+    assert response.status_code == 302  # noqa: PLR2004
+    assert mail.outbox == []
+    assert OutboxMessage.objects.filter(to=["new@example.com"]).exists()
+
+    drain_outbox()
+
+    assert [message.to for message in mail.outbox] == [["new@example.com"]]
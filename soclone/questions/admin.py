@@ -0,0 +1,42 @@
+from django.contrib import admin
+
+from soclone.core.paginator import EstimatedCountPaginator
+from soclone.questions.models import Answer
+from soclone.questions.models import Question
+from soclone.questions.models import Tag
+
+
+@admin.register(Tag)
+class TagAdmin(admin.ModelAdmin):
+    search_fields = ["name"]
+
+
+@admin.register(Question)
+class QuestionAdmin(admin.ModelAdmin):
+    list_display = [
+        "title",
+        "author",
+        "score",
+        "answer_count",
+        "view_count",
+        "created_at",
+        "last_activity_at",
+    ]
+    list_select_related = ["author"]
+    raw_id_fields = ["author"]
+    autocomplete_fields = ["tags"]
+    readonly_fields = ["score", "answer_count", "view_count", "last_activity_at"]
+    ordering = ["-id"]
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+@admin.register(Answer)
+class AnswerAdmin(admin.ModelAdmin):
+    list_display = ["__str__", "author", "score", "created_at"]
+    list_select_related = ["question", "author"]
+    raw_id_fields = ["question", "author"]
+    readonly_fields = ["score"]
+    ordering = ["-id"]
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+from django.utils.translation import gettext_lazy as _
+
+
+class QuestionsConfig(AppConfig):
+    name = "soclone.questions"
+    label = "questions"
+    verbose_name = _("Questions")
+
+    def ready(self):
+        import soclone.questions.signals  # noqa: F401
@@ -0,0 +1,256 @@
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from django.db import models
+from django.db.models import Q
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+if TYPE_CHECKING:
+    from django.db.models.fields.related_descriptors import RelatedManager
+
+
+class Tag(models.Model):
+    name = models.SlugField(_("name"), max_length=35, unique=True)
+
+    class Meta:
+        verbose_name = _("tag")
+        verbose_name_plural = _("tags")
+        ordering = ["name"]
+
+    def __str__(self):
+        return self.name
+
+
+# The orderings of the question listings, each served by an index of Question.
+LISTING_ORDERS = {
+    "newest": ["-created_at", "-id"],
+    "active": ["-last_activity_at", "-id"],
+    "votes": ["-score", "-id"],
+    "unanswered": ["-created_at", "-id"],
+}
+
+
+class QuestionQuerySet(models.QuerySet):
+    def listing(self, order):
+        """The questions of listing ``order``, as shown on the list pages."""
+        queryset = self.filter(answer_count=0) if order == "unanswered" else self
+        return (
+            queryset.order_by(*LISTING_ORDERS[order])
+            .select_related("author")
+            .prefetch_related("tags")
+            .defer("body")
+        )
+
+
+class Post(models.Model):
+    """
+    The fields questions and answers share.
+
+    ``score`` is the sum of the post's votes, kept up to date by
+    ``soclone.questions.signals`` with ``F()`` expressions, so concurrent
+    votes never overwrite each other. Reading it costs no aggregate.
+    """
+
+    author = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        verbose_name=_("author"),
+        # Posts outlive their author's account.
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    body = models.TextField(_("body"))
+    score = models.IntegerField(_("score"), default=0, editable=False)
+    created_at = models.DateTimeField(_("created"), default=timezone.now)
+
+    # Written with F() expressions only: save() leaves them out of the update,
+    # so an instance loaded before a vote doesn't overwrite its score.
+    counter_fields: tuple[str, ...] = ("score",)
+
+    # The related_name of the post field of QuestionVote and AnswerVote.
+    votes: "RelatedManager[Vote]"
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            skipped = {*self.counter_fields, *self.get_deferred_fields()}
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.fields
+                if field.concrete
+                and not field.primary_key
+                and field.attname not in skipped
+            ]
+        super().save(*args, **kwargs)
+
+    def vote(self, user, value):
+        """
+        Record ``user``'s vote of ``value`` (1 or -1) on the post; 0 withdraws
+        it. ``score`` is updated in the database, not on this instance.
+        """
+        if value:
+            self.votes.update_or_create(user=user, defaults={"value": value})
+        else:
+            # One at a time, so the signals see each deleted vote.
+            for vote in self.votes.filter(user=user):
+                vote.delete()
+
+
+class Question(Post):
+    """
+    A question, with denormalized counters for the list pages.
+
+    ``answer_count`` follows the question's answers, ``last_activity_at``
+    edits of the question and its answers, and ``view_count`` the views
+    buffered by ``soclone.questions.tasks``; a listing in any order is an
+    index scan that needs no join or aggregate.
+    """
+
+    title = models.CharField(_("title"), max_length=150)
+    tags = models.ManyToManyField(
+        Tag,
+        verbose_name=_("tags"),
+        related_name="questions",
+        blank=True,
+    )
+    answer_count = models.PositiveIntegerField(
+        _("answers"),
+        default=0,
+        editable=False,
+    )
+    view_count = models.PositiveIntegerField(_("views"), default=0, editable=False)
+    last_activity_at = models.DateTimeField(_("last activity"), default=timezone.now)
+
+    counter_fields = ("score", "answer_count", "view_count", "last_activity_at")
+
+    objects = QuestionQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = _("question")
+        verbose_name_plural = _("questions")
+        # One per order of LISTING_ORDERS.
+        indexes = [
+            models.Index(
+                fields=["-created_at", "-id"],
+                name="questions_newest_idx",
+            ),
+            models.Index(
+                fields=["-last_activity_at", "-id"],
+                name="questions_active_idx",
+            ),
+            models.Index(
+                fields=["-score", "-id"],
+                name="questions_votes_idx",
+            ),
+            models.Index(
+                fields=["-created_at", "-id"],
+                name="questions_unanswered_idx",
+                condition=Q(answer_count=0),
+            ),
+        ]
+
+    def __str__(self):
+        return self.title
+
+    def get_absolute_url(self):
+        return reverse("questions:detail", kwargs={"pk": self.pk})
+
+
+class Answer(Post):
+    question = models.ForeignKey(
+        Question,
+        verbose_name=_("question"),
+        on_delete=models.CASCADE,
+        related_name="answers",
+        # Covered by questions_answer_order_idx.
+        db_index=False,
+    )
+
+    class Meta:
+        verbose_name = _("answer")
+        verbose_name_plural = _("answers")
+        ordering = ["-score", "created_at"]
+        indexes = [
+            # The answers of a question, in the order they're shown.
+            models.Index(
+                fields=["question", "-score", "created_at"],
+                name="questions_answer_order_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.question} ({self.pk})"
+
+    def get_absolute_url(self):
+        return f"{self.question.get_absolute_url()}#answer-{self.pk}"
+
+
+class Vote(models.Model):
+    class Value(models.IntegerChoices):
+        UP = 1, _("Up")
+        DOWN = -1, _("Down")
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        verbose_name=_("user"),
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    value = models.SmallIntegerField(_("value"), choices=Value.choices)
+    created_at = models.DateTimeField(_("created"), auto_now_add=True)
+
+    # The post ForeignKey is declared by each concrete model.
+    post_id: int
+
+    class Meta:
+        abstract = True
+
+    def __str__(self):
+        return f"{self.user_id} {self.value:+d} on {self.post_id}"
+
+
+class QuestionVote(Vote):
+    post = models.ForeignKey(
+        Question,
+        verbose_name=_("question"),
+        on_delete=models.CASCADE,
+        related_name="votes",
+        # Covered by the unique constraint.
+        db_index=False,
+    )
+
+    class Meta:
+        verbose_name = _("question vote")
+        verbose_name_plural = _("question votes")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["post", "user"],
+                name="questions_questionvote_unique",
+            ),
+        ]
+
+
+class AnswerVote(Vote):
+    post = models.ForeignKey(
+        Answer,
+        verbose_name=_("answer"),
+        on_delete=models.CASCADE,
+        related_name="votes",
+        # Covered by the unique constraint.
+        db_index=False,
+    )
+
+    class Meta:
+        verbose_name = _("answer vote")
+        verbose_name_plural = _("answer votes")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["post", "user"],
+                name="questions_answervote_unique",
+            ),
+        ]
@@ -0,0 +1,139 @@
+"""
+The denormalized counters of questions and answers.
+
+Every change is a single ``UPDATE ... SET score = score + 1`` in the writing
+transaction: the row isn't read and written back, so concurrent votes and
+answers never lose each other's updates. Writes that skip signals
+(``QuerySet.update()``, ``bulk_create()``) have to adjust the counters
+themselves.
+"""
+
+from django.db.models import Expression
+from django.db.models import F
+from django.db.models import QuerySet
+from django.db.models import Value
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_init
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from soclone.questions.models import Answer
+from soclone.questions.models import AnswerVote
+from soclone.questions.models import Question
+from soclone.questions.models import QuestionVote
+
+# The value a vote had when it was loaded or last saved.
+VALUE_ATTR = "_questions_vote_value"
+# The fields of a question whose edits are activity.
+EDIT_FIELDS = {"title", "body"}
+# The values of EDIT_FIELDS when the question was loaded or last saved.
+EDIT_VALUES_ATTR = "_questions_edit_values"
+
+
+def _deleted_with(origin, model):
+    """Whether a cascade started by deleting ``origin`` deletes ``model`` rows."""
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)  # type: ignore[misc]
+    return issubclass(origin_model, model)
+
+
+def _edit_values(question):
+    # Deferred fields are left out: reading them would cost a query.
+    return {
+        name: question.__dict__[name]
+        for name in EDIT_FIELDS
+        if name in question.__dict__
+    }
+
+
+def _add_score(vote, delta, using):
+    if delta:
+        type(vote).post.field.related_model.objects.using(using).filter(
+            pk=vote.post_id,
+        ).update(score=F("score") + delta)
+
+
+@receiver(post_init, sender=QuestionVote, dispatch_uid="questions_question_vote_init")
+@receiver(post_init, sender=AnswerVote, dispatch_uid="questions_answer_vote_init")
+def remember_value(sender, instance, **kwargs):
+    if instance.pk is None:
+        value = 0
+    elif "value" in instance.get_deferred_fields():
+        # Unknown, and reading it would cost a query.
+        value = None
+    else:
+        value = instance.value
+    setattr(instance, VALUE_ATTR, value)
+
+
+@receiver(post_init, sender=Question, dispatch_uid="questions_question_init")
+def remember_edit_values(sender, instance, **kwargs):
+    setattr(instance, EDIT_VALUES_ATTR, _edit_values(instance))
+
+
+@receiver(post_save, sender=QuestionVote, dispatch_uid="questions_question_vote_save")
+@receiver(post_save, sender=AnswerVote, dispatch_uid="questions_answer_vote_save")
+def update_score_on_save(sender, instance, created, raw, using, **kwargs):
+    old = 0 if created else getattr(instance, VALUE_ATTR, None)
+    if raw or old is None:
+        return
+    setattr(instance, VALUE_ATTR, instance.value)
+    _add_score(instance, instance.value - old, using)
+
+
+@receiver(post_delete, sender=QuestionVote, dispatch_uid="questions_question_vote_del")
+@receiver(post_delete, sender=AnswerVote, dispatch_uid="questions_answer_vote_del")
+def update_score_on_delete(sender, instance, using, origin, **kwargs):
+    old = getattr(instance, VALUE_ATTR, None)
+    # The post's row is going away too.
+    if old is None or _deleted_with(origin, (Question, Answer)):
+        return
+    _add_score(instance, -old, using)
+
+
+@receiver(post_save, sender=Answer, dispatch_uid="questions_answer_save")
+def update_question_on_answer(sender, instance, created, raw, using, **kwargs):
+    if raw:
+        return
+    # GREATEST, so an answer imported with an old date doesn't move the
+    # question back.
+    activity = instance.created_at if created else timezone.now()
+    changes: dict[str, Expression] = {
+        "last_activity_at": Greatest("last_activity_at", Value(activity)),
+    }
+    if created:
+        changes["answer_count"] = F("answer_count") + 1
+    Question.objects.using(using).filter(pk=instance.question_id).update(**changes)
+
+
+@receiver(post_save, sender=Question, dispatch_uid="questions_question_save")
+def update_activity_on_edit(sender, instance, created, raw, using, **kwargs):
+    update_fields = kwargs["update_fields"]
+    saved = EDIT_FIELDS if update_fields is None else EDIT_FIELDS & update_fields
+    old = getattr(instance, EDIT_VALUES_ATTR, {})
+    new = {
+        name: value for name, value in _edit_values(instance).items() if name in saved
+    }
+    setattr(instance, EDIT_VALUES_ATTR, {**old, **new})
+    # Post.save() writes every field by default, so only values that changed
+    # are edits; saves limited to other fields, like the author, aren't
+    # activity. A field deferred when loaded and set since counts as edited.
+    if (
+        created
+        or raw
+        or all(name in old and old[name] == value for name, value in new.items())
+    ):
+        return
+    Question.objects.using(using).filter(pk=instance.pk).update(
+        last_activity_at=Greatest("last_activity_at", Value(timezone.now())),
+    )
+
+
+@receiver(post_delete, sender=Answer, dispatch_uid="questions_answer_del")
+def update_question_on_answer_delete(sender, instance, using, origin, **kwargs):
+    if _deleted_with(origin, Question):
+        return
+    Question.objects.using(using).filter(pk=instance.question_id).update(
+        answer_count=F("answer_count") - 1,
+    )
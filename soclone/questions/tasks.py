@@ -0,0 +1,52 @@
+from django.core.cache import cache
+from django.db.models import F
+
+from config import celery_app
+from soclone.core.dedupe import DedupedTask
+from soclone.questions.models import Question
+
+# Seconds views of a question are collected before they're written.
+VIEWS_FLUSH_DELAY = 60
+# Seconds a question's view buffer is kept, counted from its first view.
+VIEWS_KEY_TIMEOUT = 24 * 60 * 60
+
+
+def views_key(question_id):
+    return f"questions:views:{question_id}"
+
+
+def record_view(question_id):
+    """
+    Count a view of a question in the cache, to be added to its
+    ``view_count`` by ``flush_views`` within ``VIEWS_FLUSH_DELAY`` seconds.
+
+    Pages that are only read don't write to the database, which would also
+    pin the reader to the primary.
+    """
+    key = views_key(question_id)
+    cache.add(key, 0, timeout=VIEWS_KEY_TIMEOUT)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Flushed and evicted in between; a view isn't worth a retry.
+        return
+    flush_views.enqueue([question_id])
+
+
+@celery_app.task(base=DedupedTask, debounce=VIEWS_FLUSH_DELAY)
+def flush_views(question_id):
+    """Add the views buffered by ``record_view()`` to the question."""
+    key = views_key(question_id)
+    try:
+        # Read from Redis itself, atomically; a get() could be served by the
+        # local tier of the cache.
+        views = cache.incr(key, 0)
+    except ValueError:
+        return 0
+    if views:
+        # Views counted meanwhile stay in the cache for the next flush.
+        cache.decr(key, views)
+        Question.objects.filter(pk=question_id).update(
+            view_count=F("view_count") + views,
+        )
+    return views
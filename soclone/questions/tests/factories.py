@@ -0,0 +1,42 @@
+from factory import Faker
+from factory import Sequence
+from factory import SubFactory
+from factory import post_generation
+from factory.django import DjangoModelFactory
+
+from soclone.questions.models import Answer
+from soclone.questions.models import Question
+from soclone.questions.models import Tag
+from soclone.users.tests.factories import UserFactory
+
+
+class TagFactory(DjangoModelFactory):
+    name = Sequence(lambda n: f"tag-{n}")
+
+    class Meta:
+        model = Tag
+        django_get_or_create = ["name"]
+
+
+class QuestionFactory(DjangoModelFactory):
+    author = SubFactory(UserFactory)
+    title = Faker("sentence")
+    body = Faker("paragraph")
+
+    class Meta:
+        model = Question
+        skip_postgeneration_save = True
+
+    @post_generation
+    def tags(self, create, extracted, **kwargs):
+        if create and extracted:
+            self.tags.add(*extracted)
+
+
+class AnswerFactory(DjangoModelFactory):
+    question = SubFactory(QuestionFactory)
+    author = SubFactory(UserFactory)
+    body = Faker("paragraph")
+
+    class Meta:
+        model = Answer
@@ -0,0 +1,164 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from soclone.questions.models import Question
+from soclone.questions.tests.factories import AnswerFactory
+from soclone.questions.tests.factories import QuestionFactory
+from soclone.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def _refreshed(post):
+    post.refresh_from_db()
+    return post
+
+
+def test_answers_update_answer_count_and_activity():
+    question = QuestionFactory(last_activity_at=timezone.now() - timedelta(days=1))
+
+    answer = AnswerFactory(question=question)
+    AnswerFactory(question=question)
+
+    question.refresh_from_db()
+    assert question.answer_count == 2  # noqa: PLR2004
+    assert question.last_activity_at >= answer.created_at
+
+    answer.delete()
+    assert _refreshed(question).answer_count == 1
+
+
+def test_old_answer_does_not_move_activity_back():
+    question = QuestionFactory()
+    last_activity_at = question.last_activity_at
+
+    AnswerFactory(question=question, created_at=timezone.now() - timedelta(days=30))
+
+    assert _refreshed(question).last_activity_at == last_activity_at
+
+
+def test_edited_answer_is_activity():
+    question = QuestionFactory(last_activity_at=timezone.now() - timedelta(days=1))
+    answer = AnswerFactory(question=question)
+    before = _refreshed(question).last_activity_at
+
+    answer.body = "Edited"
+    answer.save()
+
+    question.refresh_from_db()
+    assert question.last_activity_at > before
+    assert question.answer_count == 1
+
+
+def test_edited_question_is_activity():
+    question = QuestionFactory(last_activity_at=timezone.now() - timedelta(days=1))
+    before = question.last_activity_at
+
+    question.title = "Edited"
+    question.save()
+    assert _refreshed(question).last_activity_at > before
+
+    before = _refreshed(question).last_activity_at
+    question.save(update_fields=["author"])
+    assert _refreshed(question).last_activity_at == before
+
+    # The title wasn't saved with the author, so it's still an edit after.
+    question.title = "Edited again"
+    question.save(update_fields=["author"])
+    question.save()
+    assert _refreshed(question).last_activity_at > before
+
+
+def test_unchanged_question_is_not_activity():
+    now = timezone.now()
+    older = QuestionFactory(last_activity_at=now - timedelta(days=2))
+    newer = QuestionFactory(last_activity_at=now - timedelta(days=1))
+
+    _refreshed(older).save()
+    # Loaded by the listing, with the body deferred.
+    Question.objects.listing("active").get(pk=older.pk).save()
+
+    assert list(Question.objects.listing("active")) == [newer, older]
+
+
+def test_votes_update_score():
+    question = QuestionFactory()
+    answer = AnswerFactory(question=question)
+    alice, bob = UserFactory(), UserFactory()
+
+    question.vote(alice, 1)
+    question.vote(bob, 1)
+    answer.vote(alice, -1)
+    assert _refreshed(question).score == 2  # noqa: PLR2004
+    assert _refreshed(answer).score == -1
+
+    question.vote(bob, -1)
+    assert _refreshed(question).score == 0
+
+    question.vote(alice, 0)
+    question.vote(alice, 0)
+    assert _refreshed(question).score == -1
+
+
+def test_votes_on_stale_instances_are_not_lost():
+    question = QuestionFactory()
+    stale = Question.objects.get(pk=question.pk)
+
+    question.vote(UserFactory(), 1)
+    stale.vote(UserFactory(), 1)
+    # Saving a stale copy doesn't write the counters back either.
+    stale.title = "Edited"
+    stale.save()
+
+    assert _refreshed(question).score == 2  # noqa: PLR2004
+
+
+def test_deleting_a_voter_takes_back_their_votes():
+    question = QuestionFactory()
+    voter = UserFactory()
+    question.vote(voter, 1)
+    question.vote(UserFactory(), 1)
+
+    voter.delete()
+
+    assert _refreshed(question).score == 1
+
+
+def test_deleting_a_question_skips_counter_updates(django_assert_max_num_queries):
+    question = QuestionFactory()
+    for _ in range(3):
+        answer = AnswerFactory(question=question)
+        answer.vote(UserFactory(), 1)
+    question.vote(UserFactory(), 1)
+
+    # The collector's selects and deletes, without an UPDATE per answer or
+    # vote of the question.
+    with django_assert_max_num_queries(10) as captured:
+        question.delete()
+
+    assert not [q for q in captured if q["sql"].startswith("UPDATE")]
+    assert not Question.objects.exists()
+
+
+@pytest.mark.parametrize(
+    ("order", "expected"),
+    [
+        ("newest", ["new", "voted", "answered"]),
+        ("active", ["answered", "new", "voted"]),
+        ("votes", ["voted", "new", "answered"]),
+        ("unanswered", ["new", "voted"]),
+    ],
+)
+def test_listing(order, expected):
+    now = timezone.now()
+    answered = QuestionFactory(title="answered", created_at=now - timedelta(days=3))
+    voted = QuestionFactory(title="voted", created_at=now - timedelta(days=2))
+    QuestionFactory(title="new", created_at=now - timedelta(days=1))
+    AnswerFactory(question=answered)
+    voted.vote(UserFactory(), 1)
+
+    titles = [question.title for question in Question.objects.listing(order)]
+
+    assert titles == expected
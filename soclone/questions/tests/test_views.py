@@ -0,0 +1,139 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+
+from soclone.questions.tasks import flush_views
+from soclone.questions.tasks import record_view
+from soclone.questions.tasks import views_key
+from soclone.questions.tests.factories import AnswerFactory
+from soclone.questions.tests.factories import QuestionFactory
+from soclone.questions.tests.factories import TagFactory
+
+pytestmark = pytest.mark.django_db
+
+# Questions for a full page of the largest size, and more.
+MANY = 60
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    cache.clear()
+
+
+def _questions(count):
+    tags = [TagFactory(), TagFactory(), TagFactory()]
+    questions = QuestionFactory.create_batch(count, tags=tags)
+    # Listed everywhere but among the unanswered ones.
+    AnswerFactory(question=QuestionFactory(tags=tags))
+    return questions
+
+
+def _list_queries(client, query_budget, name, count, pagesize):
+    _questions(count)
+    with query_budget(100) as recorder:
+        response = client.get(reverse(name), {"pagesize": pagesize})
+    assert response.status_code == HTTPStatus.OK
+    return len(recorder)
+
+
+@pytest.mark.parametrize(
+    ("name", "budget"),
+    [
+        # The estimate of the table's size, the count of a small table, the
+        # questions and their tags.
+        ("questions:newest", 4),
+        ("questions:active", 4),
+        ("questions:votes", 4),
+        # Filtered, so counted.
+        ("questions:unanswered", 3),
+    ],
+)
+@pytest.mark.parametrize(("count", "pagesize"), [(1, 15), (MANY, 15), (MANY, 50)])
+def test_list_queries_do_not_grow_with_the_page(  # noqa: PLR0913
+    client,
+    query_budget,
+    name,
+    budget,
+    count,
+    pagesize,
+):
+    assert _list_queries(client, query_budget, name, count, pagesize) == budget
+
+
+def test_list_page_size(client):
+    _questions(MANY)
+
+    response = client.get(reverse("questions:newest"), {"pagesize": 50})
+    assert len(response.context["object_list"]) == 50  # noqa: PLR2004
+
+    response = client.get(reverse("questions:newest"), {"pagesize": 1000})
+    assert len(response.context["object_list"]) == 30  # noqa: PLR2004
+
+
+def test_list_content(client):
+    question = QuestionFactory(title="How do I exit vim?", tags=[TagFactory()])
+
+    response = client.get(reverse("questions:newest"))
+
+    assert question.title in response.content.decode()
+    assert response.context["order"] == "newest"
+
+
+@pytest.mark.parametrize("answers", [0, 1, 20])
+def test_detail_queries_do_not_grow_with_answers(client, query_budget, answers):
+    question = QuestionFactory(tags=[TagFactory(), TagFactory()])
+    AnswerFactory.create_batch(answers, question=question)
+
+    # The question and its author, its tags, and its answers with theirs.
+    with query_budget(3):
+        response = client.get(question.get_absolute_url())
+
+    assert response.status_code == HTTPStatus.OK
+    assert len(response.context["question"].answers.all()) == answers
+
+
+def test_detail_not_found(client):
+    response = client.get(reverse("questions:detail", kwargs={"pk": 0}))
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_detail_views_are_flushed_in_one_update(
+    client,
+    monkeypatch,
+    django_capture_on_commit_callbacks,
+):
+    sent = []
+    monkeypatch.setattr(
+        flush_views,
+        "apply_async",
+        lambda args, kwargs, **options: sent.append(args),
+    )
+    question = QuestionFactory()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        for _ in range(3):
+            client.get(question.get_absolute_url())
+
+    # The page doesn't write; the views wait in the cache for a single flush.
+    assert sent == [[question.pk]]
+    question.refresh_from_db()
+    assert question.view_count == 0
+    assert flush_views(question.pk) == 3  # noqa: PLR2004
+    question.refresh_from_db()
+    assert question.view_count == 3  # noqa: PLR2004
+
+
+def test_views_recorded_during_a_flush_are_kept():
+    question = QuestionFactory()
+    record_view(question.pk)
+    cache.incr(views_key(question.pk), 2)
+
+    assert flush_views(question.pk) == 3  # noqa: PLR2004
+    record_view(question.pk)
+    assert flush_views(question.pk) == 1
+
+    question.refresh_from_db()
+    assert question.view_count == 4  # noqa: PLR2004
@@ -0,0 +1,18 @@
+from django.urls import path
+
+from soclone.questions.views import question_detail_view
+from soclone.questions.views import question_list_view
+
+app_name = "questions"
+urlpatterns = [
+    path("", view=question_list_view, kwargs={"order": "newest"}, name="newest"),
+    path("active/", view=question_list_view, kwargs={"order": "active"}, name="active"),
+    path("votes/", view=question_list_view, kwargs={"order": "votes"}, name="votes"),
+    path(
+        "unanswered/",
+        view=question_list_view,
+        kwargs={"order": "unanswered"},
+        name="unanswered",
+    ),
+    path("<int:pk>/", view=question_detail_view, name="detail"),
+]
@@ -0,0 +1,81 @@
+from django.db import transaction
+from django.db.models import Prefetch
+from django.urls import reverse
+from django.views.generic import DetailView
+from django.views.generic import ListView
+
+from soclone.core.pagecache import cache_anonymous_page
+from soclone.core.paginator import EstimatedCountPaginator
+from soclone.questions.models import LISTING_ORDERS
+from soclone.questions.models import Answer
+from soclone.questions.models import Question
+from soclone.questions.tasks import record_view
+
+
+class QuestionListView(ListView):
+    """
+    The questions in one of ``LISTING_ORDERS``, a page at a time.
+
+    A page costs the same queries whatever its size: the count (or the
+    table's estimated size, see ``EstimatedCountPaginator``), the questions
+    with their authors, and their tags.
+    """
+
+    paginator_class = EstimatedCountPaginator
+    paginate_by = 30
+    page_sizes = (15, 30, 50)
+
+    @property
+    def order(self):
+        # Each order has its own URL, so the pages are cached separately.
+        return self.kwargs.get("order", "newest")
+
+    def get_queryset(self):
+        return Question.objects.listing(self.order)
+
+    def get_paginate_by(self, queryset):
+        try:
+            size = int(self.request.GET.get("pagesize", ""))
+        except ValueError:
+            return self.paginate_by
+        return size if size in self.page_sizes else self.paginate_by
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["order"] = self.order
+        context["orders"] = [
+            (order, reverse(f"questions:{order}")) for order in LISTING_ORDERS
+        ]
+        context["page_sizes"] = self.page_sizes
+        return context
+
+
+# Read-only: skip ATOMIC_REQUESTS so reads can be served by a replica.
+question_list_view = transaction.non_atomic_requests(
+    cache_anonymous_page(QuestionListView.as_view()),
+)
+
+
+class QuestionDetailView(DetailView):
+    """
+    A question with its answers, in three queries however many there are.
+
+    Views are counted in the cache by ``record_view()``, so the page still
+    only reads from the database.
+    """
+
+    def get_queryset(self):
+        return Question.objects.select_related("author").prefetch_related(
+            "tags",
+            Prefetch("answers", queryset=Answer.objects.select_related("author")),
+        )
+
+    def get(self, request, *args, **kwargs):
+        response = super().get(request, *args, **kwargs)
+        record_view(self.object.pk)
+        return response
+
+
+question_detail_view = transaction.non_atomic_requests(
+    QuestionDetailView.as_view(),
+)
@@ -0,0 +1,10 @@
+from django.contrib import admin
+
+from soclone.stats.models import Counter
+
+
+@admin.register(Counter)
+class CounterAdmin(admin.ModelAdmin):
+    list_display = ["name", "value", "updated_at"]
+    search_fields = ["name"]
+    readonly_fields = ["name", "value", "updated_at"]
@@ -0,0 +1,16 @@
+from django.apps import AppConfig
+from django.utils.module_loading import autodiscover_modules
+from django.utils.translation import gettext_lazy as _
+
+
+class StatsConfig(AppConfig):
+    name = "soclone.stats"
+    label = "stats"
+    verbose_name = _("Statistics")
+
+    def ready(self):
+        from soclone.stats import signals
+
+        # Each app declares its counters in a ``stats`` module.
+        autodiscover_modules("stats")
+        signals.connect()
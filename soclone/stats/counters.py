@@ -0,0 +1,223 @@
+"""
+Counters maintained incrementally from model signals.
+
+Apps declare counters in a ``stats`` module, which ``StatsConfig`` imports at
+startup::
+
+    register(CounterDefinition("users.active", User, filter={"is_active": True}))
+    register(DailyCounterDefinition("users.signups", User, "date_joined"))
+
+Every save or delete of a counted model adjusts the counters whose
+membership changed, in the same transaction. Writes that skip signals
+(``QuerySet.update()``, ``bulk_create()``, ``COPY``) are corrected by
+``soclone.stats.tasks.reconcile_counters``, which recounts everything with one
+aggregate query per counter.
+"""
+
+from datetime import date
+
+from django.db import connections
+from django.db import router
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from soclone.stats.models import Counter
+
+_registry = {}
+
+
+class CounterDefinition:
+    """Count the rows of ``model`` matching the equality ``filter``, if any."""
+
+    def __init__(self, name, model, filter=None):  # noqa: A002
+        self.name = name
+        self.model = model
+        self.filter = filter or {}
+
+    @property
+    def fields(self):
+        return set(self.filter)
+
+    def matches(self, instance):
+        return all(
+            getattr(instance, field) == value for field, value in self.filter.items()
+        )
+
+    def keys(self, instance):
+        """Return the counter names ``instance`` contributes to."""
+        return {self.name} if self.matches(instance) else set()
+
+    def owns(self, name):
+        return name == self.name
+
+    def queryset(self, using=None):
+        manager = self.model._default_manager.db_manager(using)  # noqa: SLF001
+        return manager.filter(**self.filter)
+
+    def count(self, using=None):
+        """Recount from the table; returns ``{counter name: value}``."""
+        return {self.name: self.queryset(using).count()}
+
+
+class DailyCounterDefinition(CounterDefinition):
+    """
+    Count rows per local date of ``date_field``, as ``"<name>:<YYYY-MM-DD>"``.
+    """
+
+    def __init__(self, name, model, date_field, filter=None):  # noqa: A002
+        super().__init__(name, model, filter)
+        self.date_field = date_field
+
+    @property
+    def fields(self):
+        return {*super().fields, self.date_field}
+
+    def key(self, day):
+        return f"{self.name}:{day.isoformat()}"
+
+    def keys(self, instance):
+        value = getattr(instance, self.date_field)
+        if value is None or not self.matches(instance):
+            return set()
+        if timezone.is_aware(value):
+            value = timezone.localtime(value)
+        return {self.key(value.date())}
+
+    def owns(self, name):
+        return name.startswith(f"{self.name}:")
+
+    def count(self, using=None):
+        rows = (
+            self.queryset(using)
+            .annotate(day=TruncDate(self.date_field))
+            .values("day")
+            .annotate(total=Count("pk"))
+        )
+        return {self.key(row["day"]): row["total"] for row in rows}
+
+
+def register(definition):
+    _registry[definition.name] = definition
+    return definition
+
+
+def definitions(model=None):
+    return [
+        definition
+        for definition in _registry.values()
+        if model is None or definition.model is model
+    ]
+
+
+def get_count(name, default=0):
+    """Return the value of counter ``name``."""
+    value = Counter.objects.filter(name=name).values_list("value", flat=True).first()
+    return default if value is None else value
+
+
+async def aget_count(name, default=0):
+    """Async version of ``get_count()``."""
+    value = (
+        await Counter.objects.filter(name=name).values_list("value", flat=True).afirst()
+    )
+    return default if value is None else value
+
+
+def get_counts(*names):
+    """Return ``{name: value}`` for ``names``, with 0 for missing counters."""
+    values = dict(Counter.objects.filter(name__in=names).values_list("name", "value"))
+    return {name: values.get(name, 0) for name in names}
+
+
+def get_daily_counts(name, start, end):
+    """Return ``{date: value}`` of a daily counter, for ``start``-``end`` inclusive."""
+    definition = _registry[name]
+    counters = Counter.objects.filter(
+        name__gte=definition.key(start),
+        name__lte=definition.key(end),
+    ).values_list("name", "value")
+    return {
+        date.fromisoformat(key.rpartition(":")[2]): value for key, value in counters
+    }
+
+
+def increment(deltas, using=None):
+    """Add ``{counter name: delta}`` to the counters in a single statement."""
+    deltas = sorted((name, delta) for name, delta in deltas.items() if delta)
+    if not deltas:
+        return
+    using = using or router.db_for_write(Counter)
+    connection = connections[using]
+    table = connection.ops.quote_name(Counter._meta.db_table)  # noqa: SLF001
+    values = ", ".join(["(%s, %s, now())"] * len(deltas))
+    with connection.cursor() as cursor:
+        # Sorted names take row locks in the same order in every transaction.
+        cursor.execute(
+            f"INSERT INTO {table} (name, value, updated_at) VALUES {values} "  # noqa: S608
+            f"ON CONFLICT (name) DO UPDATE SET "
+            f"value = {table}.value + EXCLUDED.value, updated_at = now()",
+            [param for delta in deltas for param in delta],
+        )
+
+
+def snapshot(instance):
+    """
+    Return the counter names a saved ``instance`` contributes to.
+
+    ``None`` means unknown: a counted field was deferred, and reading it
+    would cost a query.
+    """
+    if instance.pk is None:
+        return set()
+    deferred = instance.get_deferred_fields()
+    keys = set()
+    for definition in definitions(type(instance)):
+        if definition.fields & deferred:
+            return None
+        keys |= definition.keys(instance)
+    return keys
+
+
+def current_keys(instance):
+    keys = set()
+    for definition in definitions(type(instance)):
+        keys |= definition.keys(instance)
+    return keys
+
+
+def reconcile(using=None):
+    """
+    Recount every registered counter and fix the stored values.
+
+    The stored counters stay locked while the tables are counted: a write
+    that commits meanwhile waits to adjust them until the corrections are in,
+    rather than being counted once by the recount and once more by its own
+    increment. Counters created meanwhile only get the correction added.
+
+    Returns ``{counter name: correction}`` for the counters that drifted.
+    """
+    using = using or router.db_for_write(Counter)
+    with transaction.atomic(using=using):
+        # In name order, like increment(), so the two can't deadlock.
+        stored = dict(
+            Counter.objects.using(using)
+            .select_for_update()
+            .order_by("name")
+            .values_list("name", "value"),
+        )
+        actual = {}
+        for definition in _registry.values():
+            actual.update(definition.count(using))
+            # Buckets that emptied out, e.g. a day whose signups were deleted.
+            for name in stored:
+                if definition.owns(name):
+                    actual.setdefault(name, 0)
+        drift = {
+            name: value - stored.get(name, 0)
+            for name, value in actual.items()
+            if value != stored.get(name, 0)
+        }
+        increment(drift, using=using)
+    return drift
@@ -0,0 +1,21 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class Counter(models.Model):
+    """
+    A materialized count, kept up to date by ``soclone.stats.counters``.
+
+    Reading one is a primary-key lookup however large the counted table is.
+    """
+
+    name = models.CharField(_("name"), max_length=200, primary_key=True)
+    value = models.BigIntegerField(_("value"), default=0)
+    updated_at = models.DateTimeField(_("updated"), auto_now=True)
+
+    class Meta:
+        verbose_name = _("counter")
+        verbose_name_plural = _("counters")
+
+    def __str__(self):
+        return f"{self.name}={self.value}"
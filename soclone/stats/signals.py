@@ -0,0 +1,44 @@
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_init
+from django.db.models.signals import post_save
+
+from soclone.stats.counters import current_keys
+from soclone.stats.counters import definitions
+from soclone.stats.counters import increment
+from soclone.stats.counters import snapshot
+
+# Counter names the instance contributed to when it was loaded or last saved.
+KEYS_ATTR = "_stats_keys"
+
+
+def remember_keys(sender, instance, **kwargs):
+    setattr(instance, KEYS_ATTR, snapshot(instance))
+
+
+def update_counters_on_save(sender, instance, created, raw, using, **kwargs):
+    if raw:
+        return
+    old = set() if created else getattr(instance, KEYS_ATTR, None)
+    if old is None:
+        # Loaded with counted fields deferred; reconciliation catches up.
+        return
+    new = current_keys(instance)
+    setattr(instance, KEYS_ATTR, new)
+    deltas = dict.fromkeys(new - old, 1) | dict.fromkeys(old - new, -1)
+    increment(deltas, using=using)
+
+
+def update_counters_on_delete(sender, instance, using, **kwargs):
+    old = getattr(instance, KEYS_ATTR, None)
+    if old is None:
+        return
+    increment(dict.fromkeys(old, -1), using=using)
+
+
+def connect():
+    """Connect the receivers for every model with registered counters."""
+    for model in {definition.model for definition in definitions()}:
+        uid = f"stats_{model._meta.label_lower}"  # noqa: SLF001
+        post_init.connect(remember_keys, sender=model, dispatch_uid=uid)
+        post_save.connect(update_counters_on_save, sender=model, dispatch_uid=uid)
+        post_delete.connect(update_counters_on_delete, sender=model, dispatch_uid=uid)
@@ -0,0 +1,17 @@
+import logging
+
+from config import celery_app
+from soclone.core.dedupe import DedupedTask
+from soclone.stats.counters import reconcile
+
+logger = logging.getLogger(__name__)
+
+
+# Deduplicated so a slow run is never overlapped by the next one.
+@celery_app.task(base=DedupedTask)
+def reconcile_counters():
+    """Recount every counter, fixing drift from writes that skip signals."""
+    drift = reconcile()
+    if drift:
+        logger.info("Reconciled counters: %s", drift)
+    return drift
@@ -0,0 +1,130 @@
+import datetime
+import threading
+
+import pytest
+from allauth.account.models import EmailAddress
+from django.db import connection
+from django.utils import timezone
+
+from soclone.stats import counters
+from soclone.stats.counters import get_count
+from soclone.stats.counters import get_counts
+from soclone.stats.counters import get_daily_counts
+from soclone.stats.counters import reconcile
+from soclone.stats.models import Counter
+from soclone.stats.tasks import reconcile_counters
+from soclone.users.models import User
+from soclone.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def test_created_users_are_counted():
+    UserFactory.create_batch(2)
+    UserFactory(is_active=False)
+
+    assert get_counts("users.total", "users.active") == {
+        "users.total": 3,
+        "users.active": 2,
+    }
+
+
+def test_membership_changes(user):
+    user.is_active = False
+    user.save()
+    assert get_count("users.active") == 0
+
+    reloaded = User.objects.get(pk=user.pk)
+    reloaded.is_active = True
+    reloaded.save()
+    assert get_count("users.active") == 1
+
+    reloaded.delete()
+    assert get_counts("users.total", "users.active") == {
+        "users.total": 0,
+        "users.active": 0,
+    }
+
+
+def test_unrelated_saves_do_not_write(user, django_assert_num_queries):
+    user.name = "Renamed"
+
+    with django_assert_num_queries(1):
+        user.save()
+
+
+def test_deferred_fields_are_not_loaded(user, django_assert_num_queries):
+    deferred = User.objects.only("name").get(pk=user.pk)
+    deferred.name = "Renamed"
+
+    with django_assert_num_queries(1):
+        deferred.save(update_fields=["name"])
+
+
+def test_daily_counter():
+    today = timezone.localdate()
+    yesterday = today - datetime.timedelta(days=1)
+    UserFactory(date_joined=timezone.now() - datetime.timedelta(days=1))
+    UserFactory.create_batch(2)
+
+    assert get_daily_counts("users.signups", yesterday, today) == {
+        yesterday: 1,
+        today: 2,
+    }
+
+
+def test_verified_emails(user):
+    address = EmailAddress.objects.create(user=user, email=user.email)
+    assert get_count("users.verified_emails") == 0
+
+    address.verified = True
+    address.save()
+    assert get_count("users.verified_emails") == 1
+
+
+def test_reconcile_fixes_drift():
+    UserFactory.create_batch(2)
+    User.objects.update(is_active=False)
+    Counter.objects.create(name="users.signups:2000-01-01", value=5)
+
+    assert reconcile() == {
+        "users.active": -2,
+        "users.signups:2000-01-01": -5,
+    }
+    assert get_counts("users.total", "users.active") == {
+        "users.total": 2,
+        "users.active": 0,
+    }
+    assert reconcile_counters() == {}
+
+
+@pytest.mark.django_db(transaction=True)
+def test_reconcile_with_concurrent_write(monkeypatch):
+    UserFactory()
+    definition = counters.definitions(User)[0]
+    count = definition.count
+    threads = []
+
+    def signup():
+        UserFactory()
+        connection.close()
+
+    def count_during_signup(using=None):
+        thread = threading.Thread(target=signup)
+        threads.append(thread)
+        thread.start()
+        # Commits straight away without the lock on the stored counters.
+        thread.join(timeout=0.5)
+        return count(using)
+
+    monkeypatch.setattr(definition, "count", count_during_signup)
+    reconcile()
+    monkeypatch.undo()
+
+    for thread in threads:
+        thread.join()
+    assert get_counts("users.total", "users.active") == {
+        "users.total": 2,
+        "users.active": 2,
+    }
+    assert reconcile() == {}
@@ -3,8 +3,12 @@ from __future__ import annotations
 import typing
 
 from allauth.account.adapter import DefaultAccountAdapter
+from allauth.core import context as allauth_context
 from allauth.socialaccount.adapter import DefaultSocialAccountAdapter
 from django.conf import settings
+from django.contrib.sites.shortcuts import get_current_site
+
+from soclone.mail.outbox import enqueue
 
 if typing.TYPE_CHECKING:
     from allauth.socialaccount.models import SocialLogin
@@ -17,6 +21,20 @@ class AccountAdapter(DefaultAccountAdapter):
     def is_open_for_signup(self, request: HttpRequest) -> bool:
         return getattr(settings, "ACCOUNT_ALLOW_REGISTRATION", True)
 
+    def send_mail(self, template_prefix, email, context):
+        """
+        Queue verification and password-reset mails in the outbox.
+
+        The mail is rendered here, with the request at hand, and delivered by
+        a Celery worker after the request's transaction commits.
+        """
+        ctx = {
+            "email": email,
+            "current_site": get_current_site(allauth_context.request),
+        }
+        ctx.update(context)
+        enqueue(self.render_mail(template_prefix, email, ctx))
+
 
 class SocialAccountAdapter(DefaultSocialAccountAdapter):
     def is_open_for_signup(
@@ -3,8 +3,10 @@ from django.contrib import admin
 from django.contrib.auth import admin as auth_admin
 from django.contrib.auth import decorators
 from django.contrib.auth import get_user_model
+from django.core.paginator import Paginator
 from django.utils.translation import gettext_lazy as _
 
+from soclone.core.paginator import EstimatedCountPaginator
 from soclone.users.forms import UserAdminChangeForm
 from soclone.users.forms import UserAdminCreationForm
 
@@ -38,8 +40,11 @@ class UserAdmin(auth_admin.UserAdmin):
         (_("Important dates"), {"fields": ("last_login", "date_joined")}),
     )
     list_display = ["email", "name", "is_superuser"]
-    search_fields = ["name"]
+    # Served by the trigram indexes on UPPER(email) and UPPER(name).
+    search_fields = ["email", "name"]
     ordering = ["id"]
+    paginator: type[Paginator] = EstimatedCountPaginator
+    show_full_result_count = False
     add_fieldsets = (
         (
             None,
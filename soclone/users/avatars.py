@@ -0,0 +1,100 @@
+"""
+User avatars.
+
+Uploads are stored as they are. ``generate_renditions()`` then writes square
+copies of them in each of ``AVATAR_SIZES``, as WebP and JPEG, through the
+default storage; it runs in the ``generate_avatar_renditions`` Celery task so
+uploads return without waiting for Pillow. Users without renditions yet are
+shown an identicon derived from their id.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import posixpath
+import uuid
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image
+from PIL import ImageOps
+
+FORMATS = {
+    "webp": ("WEBP", {"quality": 80, "method": 4}),
+    "jpeg": ("JPEG", {"quality": 85, "optimize": True, "progressive": True}),
+}
+IDENTICON_GRID = 5
+
+
+def avatar_upload_to(instance, filename):
+    # A fresh name per upload, so renditions and cached URLs never go stale.
+    extension = posixpath.splitext(filename)[1].lower()
+    return f"avatars/{instance.pk}/{uuid.uuid4().hex}{extension}"
+
+
+def rendition_name(name, size, fmt):
+    return f"{posixpath.splitext(name)[0]}/{size}.{fmt}"
+
+
+def avatar_files(name, renditions):
+    """Return the storage names of an avatar and its renditions."""
+    if not name:
+        return []
+    return [name, *(n for formats in renditions.values() for n in formats.values())]
+
+
+def _flatten(image):
+    # JPEG has no alpha channel: composite transparent images onto white.
+    if image.mode in ("RGBA", "LA", "PA") or "transparency" in image.info:
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, "white")
+        background.paste(image, mask=image.getchannel("A"))
+        return background
+    return image.convert("RGB")
+
+
+def generate_renditions(name, sizes, storage=default_storage):
+    """
+    Write the renditions of the avatar stored as ``name``.
+
+    Returns ``{"<size>": {"webp": <name>, "jpeg": <name>}}``.
+    """
+    renditions: dict[str, dict[str, str]] = {}
+    with storage.open(name, "rb") as file, Image.open(file) as original:
+        # Let the JPEG decoder downscale while reading, before anything is
+        # held in memory at full resolution.
+        original.draft("RGB", (max(sizes), max(sizes)))
+        image = _flatten(ImageOps.exif_transpose(original))
+    for size in sorted(sizes, reverse=True):
+        image = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+        for fmt, (format_, options) in FORMATS.items():
+            buffer = io.BytesIO()
+            image.save(buffer, format_, **options)
+            renditions.setdefault(str(size), {})[fmt] = storage.save(
+                rendition_name(name, size, fmt),
+                ContentFile(buffer.getvalue()),
+            )
+    return renditions
+
+
+def identicon(seed):
+    """Return a symmetric 5x5 identicon for ``seed`` as SVG."""
+    digest = hashlib.md5(str(seed).encode()).digest()  # noqa: S324
+    hue = digest[0] * 360 // 256
+    bits = int.from_bytes(digest[1:4], "big")
+    half = (IDENTICON_GRID + 1) // 2
+    cells: list[str] = []
+    for row in range(IDENTICON_GRID):
+        for column in range(half):
+            if bits >> (row * half + column) & 1:
+                cells.extend(
+                    f'<rect x="{x}" y="{row}" width="1" height="1"/>'
+                    for x in sorted({column, IDENTICON_GRID - 1 - column})
+                )
+    return (
+        '<svg xmlns="http://www.w3.org/2000/svg" viewBox="-0.5 -0.5 6 6" '
+        'shape-rendering="crispEdges">'
+        '<rect x="-0.5" y="-0.5" width="6" height="6" fill="#f0f0f0"/>'
+        f'<g fill="hsl({hue}, 55%, 50%)">{"".join(cells)}</g></svg>'
+    )
@@ -0,0 +1,65 @@
+import time
+from typing import TYPE_CHECKING
+
+from allauth.account.auth_backends import AuthenticationBackend
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+GENERATION_KEY = "users:user:{pk}:generation"
+USER_KEY = "users:user:{pk}:{generation}"
+
+# The mixin goes in front of a backend like ModelBackend.
+if TYPE_CHECKING:
+    _Backend = ModelBackend
+else:
+    _Backend = object
+
+
+def _generation(pk):
+    generation = cache.get(GENERATION_KEY.format(pk=pk))
+    if generation is None:
+        # Start from the clock rather than 0, so entries written under an
+        # evicted generation can never be served again.
+        cache.add(GENERATION_KEY.format(pk=pk), time.time_ns(), timeout=None)
+        generation = cache.get(GENERATION_KEY.format(pk=pk))
+    return generation
+
+
+def invalidate_user(pk):
+    """Make every cached copy of the user with primary key ``pk`` unreachable."""
+    key = GENERATION_KEY.format(pk=pk)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), timeout=None)
+
+
+class CachedUserBackendMixin(_Backend):
+    """
+    Serve ``get_user()`` from a versioned cache entry.
+
+    ``AuthenticationMiddleware`` calls ``get_user()`` with the id stored in the
+    session on every request. Cached users are stored under a per-user
+    generation that ``invalidate_user()`` bumps, so a copy read from the
+    database just before a change can't outlive it.
+    """
+
+    def get_user(self, user_id):
+        generation = _generation(user_id)
+        key = USER_KEY.format(pk=user_id, generation=generation)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                cache.set(key, user, settings.USER_CACHE_TIMEOUT)
+            return user
+        return user if self.user_can_authenticate(user) else None
+
+
+class CachedModelBackend(CachedUserBackendMixin, ModelBackend):
+    pass
+
+
+class CachedAuthenticationBackend(CachedUserBackendMixin, AuthenticationBackend):
+    pass
@@ -0,0 +1,168 @@
+"""
+Bulk loading helpers for the User model.
+
+Used by the ``import_users`` management command to move large batches of
+accounts into the database without going through ``UserManager._create_user``
+(one hash and one ``INSERT`` per user).
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import typing
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import DEFAULT_DB_ALIAS
+from django.db import connections
+from django.db import transaction
+from django.db.backends.postgresql.psycopg_any import is_psycopg3
+from django.db.models import Field
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Iterable
+    from collections.abc import Sequence
+    from concurrent.futures import Executor
+
+User = get_user_model()
+
+# Columns written for every imported row, in COPY order.
+USER_FIELDS = (
+    "email",
+    "name",
+    "password",
+    "is_active",
+    "is_staff",
+    "is_superuser",
+    "date_joined",
+)
+# Columns without a database default that imports leave at the model default.
+DEFAULT_FIELDS = (
+    "avatar",
+    "avatar_renditions",
+)
+
+
+@dataclasses.dataclass
+class LoadResult:
+    inserted: int = 0
+    duplicates: list[str] = dataclasses.field(default_factory=list)
+
+
+def hash_password(raw_password: str | None) -> str:
+    """Hash a single password; empty values get an unusable password."""
+    return make_password(raw_password or None)
+
+
+def hash_passwords(
+    raw_passwords: Sequence[str | None],
+    executor: Executor | None = None,
+    chunksize: int = 1,
+) -> list[str]:
+    """
+    Hash ``raw_passwords`` with the default hasher, preserving order.
+
+    Hashing is CPU bound (Argon2 by default), so when an ``executor`` backed by a
+    process pool is given the work is spread across its workers.
+    """
+    if executor is None:
+        return [hash_password(password) for password in raw_passwords]
+    return list(executor.map(hash_password, raw_passwords, chunksize=chunksize))
+
+
+def load_users(
+    rows: Sequence[dict[str, typing.Any]],
+    using: str = DEFAULT_DB_ALIAS,
+) -> LoadResult:
+    """
+    Insert ``rows`` (dicts keyed by ``USER_FIELDS``) in a single transaction.
+
+    Rows whose email already exists, either in the table or earlier in
+    ``rows``, are skipped and returned as duplicates. On PostgreSQL with
+    psycopg 3 the rows are streamed with ``COPY`` into a staging table;
+    other backends fall back to ``bulk_create``.
+    """
+    if not rows:
+        return LoadResult()
+    connection = connections[using]
+    with transaction.atomic(using=using):
+        if connection.vendor == "postgresql" and is_psycopg3:
+            inserted = _copy_users(rows, using)
+        else:
+            inserted = _bulk_create_users(rows, using)
+    return LoadResult(
+        inserted=len(inserted),
+        duplicates=_duplicates([row["email"] for row in rows], inserted),
+    )
+
+
+def _duplicates(emails: Iterable[str], inserted: set[str]) -> list[str]:
+    remaining = set(inserted)
+    duplicates = []
+    for email in emails:
+        if email in remaining:
+            remaining.discard(email)
+        else:
+            duplicates.append(email)
+    return duplicates
+
+
+def _field(name: str) -> Field:
+    field = User._meta.get_field(name)  # noqa: SLF001
+    # Only concrete columns of the users table are copied.
+    assert isinstance(field, Field)
+    return field
+
+
+def _copy_users(rows: Sequence[dict[str, typing.Any]], using: str) -> set[str]:
+    connection = connections[using]
+    quote_name = connection.ops.quote_name
+    opts = User._meta  # noqa: SLF001
+    table = quote_name(opts.db_table)
+    stage = quote_name(f"{opts.db_table}_import")
+    columns = ", ".join(quote_name(_field(name).column) for name in USER_FIELDS)
+    email = quote_name(_field("email").column)
+    defaults = [_field(name) for name in DEFAULT_FIELDS]
+    default_columns = ", ".join(quote_name(field.column) for field in defaults)
+    default_values = [
+        field.get_db_prep_save(field.get_default(), connection) for field in defaults
+    ]
+    with connection.cursor() as cursor:
+        # CREATE TABLE AS copies column types but not NOT NULL/identity
+        # constraints, which is what the staging table needs.
+        cursor.execute(
+            f"CREATE TEMPORARY TABLE {stage} AS "  # noqa: S608
+            f"SELECT {columns} FROM {table} WITH NO DATA",
+        )
+        with cursor.copy(f"COPY {stage} ({columns}) FROM STDIN") as copy:
+            for row in rows:
+                copy.write_row([row[name] for name in USER_FIELDS])
+        cursor.execute(
+            f"INSERT INTO {table} ({columns}, {default_columns}) "  # noqa: S608
+            f"SELECT DISTINCT ON ({email}) {columns}, "
+            f"{', '.join(['%s'] * len(defaults))} FROM {stage} "
+            f"ORDER BY {email} "
+            f"ON CONFLICT ({email}) DO NOTHING "
+            f"RETURNING {email}",
+            default_values,
+        )
+        inserted = {row[0] for row in cursor.fetchall()}
+        cursor.execute(f"DROP TABLE {stage}")
+    return inserted
+
+
+def _bulk_create_users(rows: Sequence[dict[str, typing.Any]], using: str) -> set[str]:
+    emails = {row["email"] for row in rows}
+    seen = set(
+        User.objects.using(using)
+        .filter(email__in=emails)
+        .values_list("email", flat=True),
+    )
+    users = []
+    for row in rows:
+        if row["email"] in seen:
+            continue
+        seen.add(row["email"])
+        users.append(User(**{name: row[name] for name in USER_FIELDS}))
+    User.objects.using(using).bulk_create(users, ignore_conflicts=True)
+    return {user.email for user in users}
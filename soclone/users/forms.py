@@ -1,8 +1,12 @@
 from allauth.account.forms import SignupForm
 from allauth.socialaccount.forms import SignupForm as SocialSignupForm
+from django.conf import settings
 from django.contrib.auth import forms as admin_forms
 from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
 from django.forms import EmailField
+from django.forms import ModelForm
+from django.template.defaultfilters import filesizeformat
 from django.utils.translation import gettext_lazy as _
 
 User = get_user_model()
@@ -43,3 +47,19 @@ class UserSocialSignupForm(SocialSignupForm):
     Default fields will be added automatically.
     See UserSignupForm otherwise.
     """
+
+
+class UserUpdateForm(ModelForm):
+    class Meta:
+        model = User
+        fields = ("name", "avatar")
+
+    def clean_avatar(self):
+        avatar = self.cleaned_data["avatar"]
+        if avatar and avatar.size > settings.AVATAR_MAX_UPLOAD_SIZE:
+            raise ValidationError(
+                _("Avatars can be at most %(size)s."),
+                params={"size": filesizeformat(settings.AVATAR_MAX_UPLOAD_SIZE)},
+                code="file_too_large",
+            )
+        return avatar
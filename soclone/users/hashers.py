@@ -0,0 +1,115 @@
+"""
+Password hashers that keep Argon2 work off the request thread.
+
+Argon2 is deliberately expensive, so a burst of logins or signups can occupy
+every web worker. ``PooledArgon2PasswordHasher`` hands ``encode``/``verify``
+to a small per-process pool and bounds how many calls may wait on it; once
+the bound is reached ``PasswordHashingPoolSaturated`` is raised and turned
+into a fast 503 by ``PasswordHashingBackpressureMiddleware``.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+
+class PasswordHashingPoolSaturated(Exception):  # noqa: N818
+    """Too many password hashing calls are already waiting on the pool."""
+
+
+_lock = threading.Lock()
+_executor: ProcessPoolExecutor | None = None
+_slots: threading.BoundedSemaphore | None = None
+
+
+def _get_pool() -> tuple[ProcessPoolExecutor, threading.BoundedSemaphore]:
+    global _executor, _slots  # noqa: PLW0603
+    with _lock:
+        if _executor is None or _slots is None:
+            # "spawn" keeps the hashing processes independent of whatever
+            # threads and sockets the web worker holds when it forks them.
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.PASSWORD_HASHING_POOL_SIZE,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            _slots = threading.BoundedSemaphore(
+                settings.PASSWORD_HASHING_POOL_MAX_PENDING,
+            )
+        return _executor, _slots
+
+
+def reset_pool(*, wait: bool = False) -> None:
+    """Drop the current pool; the next hashing call creates a new one."""
+    global _executor, _slots
+    with _lock:
+        executor, _executor, _slots = _executor, None, None
+    if executor is not None:
+        executor.shutdown(wait=wait, cancel_futures=True)
+
+
+def _forget_pool() -> None:
+    # A forked child inherits references to the parent's pool processes,
+    # which it can neither use nor shut down.
+    global _executor, _slots, _lock
+    _executor, _slots, _lock = None, None, threading.Lock()
+
+
+os.register_at_fork(after_in_child=_forget_pool)
+
+
+@receiver(setting_changed)
+def _reset_pool_on_setting_change(*, setting, **kwargs):
+    if setting.startswith("PASSWORD_HASHING_POOL"):
+        reset_pool()
+
+
+def _submit(fn, *args):
+    executor, slots = _get_pool()
+    if not slots.acquire(timeout=settings.PASSWORD_HASHING_POOL_TIMEOUT):
+        raise PasswordHashingPoolSaturated
+    try:
+        return executor.submit(fn, *args).result()
+    finally:
+        slots.release()
+
+
+def _argon2_hasher(time_cost, memory_cost, parallelism):
+    hasher = Argon2PasswordHasher()
+    hasher.time_cost = time_cost
+    hasher.memory_cost = memory_cost
+    hasher.parallelism = parallelism
+    return hasher
+
+
+def _encode(password, salt, *params):
+    return _argon2_hasher(*params).encode(password, salt)
+
+
+def _verify(password, encoded, *params):
+    return _argon2_hasher(*params).verify(password, encoded)
+
+
+class PooledArgon2PasswordHasher(Argon2PasswordHasher):
+    """
+    Argon2 hasher that runs ``encode`` and ``verify`` in a process pool.
+
+    Produces and accepts regular ``argon2`` hashes, so it can replace
+    ``Argon2PasswordHasher`` in ``PASSWORD_HASHERS`` without rehashing.
+    """
+
+    def _params(self):
+        return self.time_cost, self.memory_cost, self.parallelism
+
+    def encode(self, password, salt):
+        return _submit(_encode, password, salt, *self._params())
+
+    def verify(self, password, encoded):
+        return _submit(_verify, password, encoded, *self._params())
@@ -0,0 +1,31 @@
+from soclone.jobs.runner import JobDefinition
+from soclone.jobs.runner import register
+from soclone.users.avatars import avatar_files
+from soclone.users.models import User
+from soclone.users.tasks import generate_avatar_renditions
+
+
+def _users_with_avatars():
+    return User.objects.exclude(avatar="")
+
+
+def regenerate_avatar_renditions(users):
+    """Render the avatars of ``users`` again, e.g. after AVATAR_SIZES changed."""
+    rows = users.values_list("pk", "avatar", "avatar_renditions")
+    for pk, name, renditions in rows:
+        # The previous renditions are deleted once the new ones are recorded.
+        generate_avatar_renditions(pk, name, stale=avatar_files(name, renditions)[1:])
+    return len(rows)
+
+
+register(
+    JobDefinition(
+        "users.avatar_renditions",
+        _users_with_avatars,
+        regenerate_avatar_renditions,
+        # Pillow takes a while per avatar: keep chunks well within the
+        # task soft time limit.
+        chunk_size=50,
+        concurrency=2,
+    ),
+)
@@ -0,0 +1,232 @@
+import csv
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import django
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.db import DEFAULT_DB_ALIAS
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from soclone.users.bulk import hash_passwords
+from soclone.users.bulk import load_users
+
+User = get_user_model()
+
+TRUE_VALUES = {"1", "true", "t", "yes", "y"}
+
+
+class Command(BaseCommand):
+    help = (
+        "Import users from a CSV or JSON Lines file. Passwords are hashed in a "
+        "process pool and rows are loaded in chunks; an interrupted import "
+        "resumes from the last committed chunk."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV or JSON Lines file to import.")
+        parser.add_argument(
+            "--format",
+            choices=["csv", "jsonl"],
+            help="Input format. Guessed from the file extension by default.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=5000,
+            help="Number of rows committed per transaction.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            # cpu_count() is None when the count can't be determined.
+            default=os.cpu_count() or 1,
+            help="Password hashing processes. Use 1 to hash in-process.",
+        )
+        parser.add_argument(
+            "--prehashed",
+            action="store_true",
+            help="The password column already holds Django password hashes.",
+        )
+        parser.add_argument(
+            "--state-file",
+            help="Checkpoint file used to resume. Defaults to <path>.import-state.",
+        )
+        parser.add_argument(
+            "--restart",
+            action="store_true",
+            help="Ignore an existing checkpoint and import from the first row.",
+        )
+        parser.add_argument(
+            "--duplicates",
+            help="Append the emails of rejected duplicate rows to this file.",
+        )
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help='Database to import into. Defaults to "default".',
+        )
+
+    def handle(self, *args, **options):
+        self.verbosity = options["verbosity"]
+        path = Path(options["path"])
+        if not path.is_file():
+            msg = f"{path} does not exist."
+            raise CommandError(msg)
+        if options["chunk_size"] < 1:
+            msg = "--chunk-size has to be at least 1."
+            raise CommandError(msg)
+        if options["workers"] < 1:
+            msg = "--workers has to be at least 1."
+            raise CommandError(msg)
+        input_format = options["format"] or (
+            "jsonl" if path.suffix in {".jsonl", ".ndjson"} else "csv"
+        )
+        chunk_size = options["chunk_size"]
+        state_path = Path(options["state_file"] or f"{path}.import-state")
+        state = self._load_state(state_path, path, restart=options["restart"])
+        if state["rows"]:
+            self.stdout.write(f"Resuming after row {state['rows']}.")
+
+        workers = options["workers"]
+        executor = (
+            ProcessPoolExecutor(max_workers=workers, initializer=django.setup)
+            if workers > 1 and not options["prehashed"]
+            else None
+        )
+        duplicates_file = (
+            Path(options["duplicates"]).open("a")  # noqa: SIM115
+            if options["duplicates"]
+            else None
+        )
+        started = time.monotonic()
+        imported = 0
+        try:
+            with path.open(newline="") as source:
+                rows = itertools.islice(
+                    self._read(source, input_format),
+                    state["rows"],
+                    None,
+                )
+                while chunk := list(itertools.islice(rows, chunk_size)):
+                    self._prepare(
+                        chunk,
+                        executor,
+                        chunksize=max(1, chunk_size // (4 * workers)),
+                        prehashed=options["prehashed"],
+                    )
+                    result = load_users(
+                        [row for row in chunk if row["email"]],
+                        using=options["database"],
+                    )
+                    state["rows"] += len(chunk)
+                    state["inserted"] += result.inserted
+                    state["duplicates"] += len(result.duplicates)
+                    state["invalid"] += sum(1 for row in chunk if not row["email"])
+                    self._save_state(state_path, state)
+                    if duplicates_file and result.duplicates:
+                        duplicates_file.writelines(
+                            f"{email}\n" for email in result.duplicates
+                        )
+                    imported += len(chunk)
+                    self._report(state, imported, started)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+            if duplicates_file is not None:
+                duplicates_file.close()
+
+        state_path.unlink(missing_ok=True)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {state['inserted']} users from {state['rows']} rows "
+                f"({state['duplicates']} duplicates, {state['invalid']} without "
+                f"email) at {self._rate(imported, started):.0f} rows/s.",
+            ),
+        )
+
+    def _read(self, source, input_format):
+        records = (
+            (json.loads(line) for line in source if line.strip())
+            if input_format == "jsonl"
+            else csv.DictReader(source)
+        )
+        now = timezone.now()
+        for record in records:
+            date_joined = record.get("date_joined")
+            if isinstance(date_joined, str):
+                date_joined = parse_datetime(date_joined)
+            yield {
+                "email": User.objects.normalize_email(
+                    (record.get("email") or "").strip(),
+                ),
+                "name": record.get("name") or "",
+                "password": record.get("password") or None,
+                "is_active": _to_bool(record.get("is_active"), default=True),
+                "is_staff": _to_bool(record.get("is_staff"), default=False),
+                "is_superuser": _to_bool(record.get("is_superuser"), default=False),
+                "date_joined": date_joined or now,
+            }
+
+    def _prepare(self, chunk, executor, *, chunksize, prehashed):
+        if prehashed:
+            for row in chunk:
+                row["password"] = row["password"] or hash_passwords([None])[0]
+            return
+        hashed = hash_passwords(
+            [row["password"] for row in chunk],
+            executor,
+            chunksize=chunksize,
+        )
+        for row, password in zip(chunk, hashed, strict=True):
+            row["password"] = password
+
+    def _load_state(self, state_path, path, *, restart):
+        empty = {
+            "path": str(path.resolve()),
+            "rows": 0,
+            "inserted": 0,
+            "duplicates": 0,
+            "invalid": 0,
+        }
+        if restart or not state_path.exists():
+            return empty
+        state = json.loads(state_path.read_text())
+        if state.get("path") != empty["path"]:
+            msg = (
+                f"{state_path} belongs to an import of {state.get('path')}; "
+                "use --restart or --state-file."
+            )
+            raise CommandError(msg)
+        return {**empty, **state}
+
+    def _save_state(self, state_path, state):
+        # Write then rename so a crash never leaves a truncated checkpoint.
+        tmp_path = state_path.with_name(f"{state_path.name}.tmp")
+        tmp_path.write_text(json.dumps(state))
+        tmp_path.replace(state_path)
+
+    def _report(self, state, imported, started):
+        if self.verbosity >= 1:
+            self.stdout.write(
+                f"{state['rows']} rows processed, {state['inserted']} inserted, "
+                f"{state['duplicates']} duplicates "
+                f"({self._rate(imported, started):.0f} rows/s)",
+            )
+
+    def _rate(self, imported, started):
+        return imported / max(time.monotonic() - started, 1e-9)
+
+
+def _to_bool(value, *, default):
+    if value is None or value == "":
+        return default
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in TRUE_VALUES
@@ -0,0 +1,185 @@
+import dataclasses
+import datetime
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import as_completed
+
+import django
+from allauth.account.models import EmailAddress
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.db import DEFAULT_DB_ALIAS
+from django.db import transaction
+
+from soclone.stats.counters import reconcile
+from soclone.users.bulk import load_users
+from soclone.users.seeding import JOINED_BEFORE
+from soclone.users.seeding import user_rows
+
+User = get_user_model()
+
+
+@dataclasses.dataclass(frozen=True)
+class SeedOptions:
+    seed: str
+    # Hash of the password every seeded user shares.
+    password: str
+    domain: str
+    joined_before: datetime.datetime
+    using: str = DEFAULT_DB_ALIAS
+
+
+def seed_batch(start, stop, options):
+    """
+    Insert the users numbered ``start`` to ``stop`` with verified addresses.
+
+    A batch holds the same users whichever worker runs it and in which order.
+    Returns the number of users inserted; existing emails are skipped.
+    """
+    rows = user_rows(
+        start,
+        stop,
+        seed=options.seed,
+        password=options.password,
+        domain=options.domain,
+        joined_before=options.joined_before,
+    )
+    using = options.using
+    with transaction.atomic(using=using):
+        inserted = load_users(rows, using=using).inserted
+        users = User.objects.using(using).filter(
+            email__in=[row["email"] for row in rows],
+            emailaddress__isnull=True,
+        )
+        EmailAddress.objects.using(using).bulk_create(
+            [
+                EmailAddress(user_id=pk, email=email, verified=True, primary=True)
+                for pk, email in users.values_list("pk", "email")
+            ],
+            ignore_conflicts=True,
+        )
+    return inserted
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed the database with realistic users for performance testing. Users "
+        "are generated deterministically from --seed in batches, share one "
+        "password hash and are loaded with COPY by parallel workers; running "
+        "it again only adds the missing users."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--users",
+            type=int,
+            default=100_000,
+            help="Number of users to generate.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10_000,
+            help="Number of users committed per transaction.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            # cpu_count() is None when the count can't be determined.
+            default=os.cpu_count() or 1,
+            help="Loading processes. Use 1 to load in-process.",
+        )
+        parser.add_argument(
+            "--seed",
+            default="soclone",
+            help="Seed of the generated data; the same seed gives the same users.",
+        )
+        parser.add_argument(
+            "--password",
+            default="password",
+            help="Password of every seeded user.",
+        )
+        parser.add_argument(
+            "--domain",
+            default="example.com",
+            help="Email domain of the seeded users.",
+        )
+        parser.add_argument(
+            "--joined-before",
+            type=datetime.date.fromisoformat,
+            default=JOINED_BEFORE.date(),
+            help=(
+                "Date (YYYY-MM-DD) the seeded users joined in the five years "
+                f"up to. Defaults to {JOINED_BEFORE.date()}."
+            ),
+        )
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help='Database to seed. Defaults to "default".',
+        )
+
+    def handle(self, *args, **options):
+        if options["users"] < 0 or options["batch_size"] < 1 or options["workers"] < 1:
+            msg = (
+                "--users can't be negative and --batch-size and --workers have "
+                "to be positive."
+            )
+            raise CommandError(msg)
+        self.verbosity = options["verbosity"]
+        using = options["database"]
+        batch_size = options["batch_size"]
+        batches = [
+            (start, min(start + batch_size, options["users"]))
+            for start in range(0, options["users"], batch_size)
+        ]
+        seed_options = SeedOptions(
+            seed=options["seed"],
+            # Hash once: Argon2 for every user is what makes factories slow.
+            password=make_password(options["password"]),
+            domain=options["domain"],
+            joined_before=datetime.datetime.combine(
+                options["joined_before"],
+                datetime.time(),
+                tzinfo=datetime.UTC,
+            ),
+            using=using,
+        )
+        started = time.monotonic()
+        inserted = 0
+        workers = min(options["workers"], len(batches))
+        if workers > 1:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=django.setup,
+            ) as executor:
+                futures = [
+                    executor.submit(seed_batch, start, stop, seed_options)
+                    for start, stop in batches
+                ]
+                for done, future in enumerate(as_completed(futures), 1):
+                    inserted += future.result()
+                    self._report(done, len(batches), inserted, started)
+        else:
+            for done, (start, stop) in enumerate(batches, 1):
+                inserted += seed_batch(start, stop, seed_options)
+                self._report(done, len(batches), inserted, started)
+
+        # COPY skips the signals that keep the counters up to date.
+        reconcile(using=using)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Seeded {inserted} users ({options['users'] - inserted} existed "
+                f"already) in {time.monotonic() - started:.1f}s.",
+            ),
+        )
+
+    def _report(self, done, total, inserted, started):
+        if self.verbosity >= 1:
+            self.stdout.write(
+                f"{done}/{total} batches, {inserted} users inserted "
+                f"({inserted / max(time.monotonic() - started, 1e-9):.0f} users/s)",
+            )
@@ -0,0 +1,38 @@
+from asgiref.sync import iscoroutinefunction
+from asgiref.sync import markcoroutinefunction
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.translation import gettext as _
+
+from soclone.users.hashers import PasswordHashingPoolSaturated
+
+
+class PasswordHashingBackpressureMiddleware:
+    """Answer with a 503 instead of queueing when the hashing pool is full."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        return await self.get_response(request)
+
+    def process_exception(self, request, exception):
+        if not isinstance(exception, PasswordHashingPoolSaturated):
+            return None
+        response = HttpResponse(
+            _("The service is busy, please try again shortly."),
+            content_type="text/plain",
+            status=503,
+        )
+        response["Retry-After"] = str(settings.PASSWORD_HASHING_POOL_RETRY_AFTER)
+        return response
@@ -0,0 +1,27 @@
+from django.db import migrations
+from django.db import models
+
+import soclone.users.avatars
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0002_trigram_search_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="avatar",
+            field=models.ImageField(
+                blank=True,
+                upload_to=soclone.users.avatars.avatar_upload_to,
+                verbose_name="Avatar",
+            ),
+        ),
+        migrations.AddField(
+            model_name="user",
+            name="avatar_renditions",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -2,11 +2,17 @@
 from typing import ClassVar
 
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.indexes import OpClass
 from django.db.models import CharField
 from django.db.models import EmailField
+from django.db.models import ImageField
+from django.db.models import JSONField
+from django.db.models.functions import Upper
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 
+from soclone.users.avatars import avatar_upload_to
 from soclone.users.managers import UserManager
 
 
@@ -23,12 +29,30 @@ class User(AbstractUser):
     last_name = None  # type: ignore[assignment]
     email = EmailField(_("email address"), unique=True)
     username = None  # type: ignore[assignment]
+    avatar = ImageField(_("Avatar"), upload_to=avatar_upload_to, blank=True)
+    # {"<size>": {"webp": <name>, "jpeg": <name>}}, filled in by the
+    # generate_avatar_renditions task once the avatar has been processed.
+    avatar_renditions = JSONField(default=dict, blank=True, editable=False)
 
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = []
 
     objects: ClassVar[UserManager] = UserManager()
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Trigram indexes on UPPER(...) match the SQL Django generates for
+            # icontains, so admin search doesn't scan the whole table.
+            GinIndex(
+                OpClass(Upper("name"), name="gin_trgm_ops"),
+                name="users_user_name_trgm",
+            ),
+            GinIndex(
+                OpClass(Upper("email"), name="gin_trgm_ops"),
+                name="users_user_email_trgm",
+            ),
+        ]
+
     def get_absolute_url(self) -> str:
         """Get URL for user's detail view.
 
@@ -0,0 +1,73 @@
+"""
+Generated users for performance datasets, loaded by the ``seed`` command.
+
+Only the standard library is used, so seeding works on production images,
+which don't install the test factories.
+"""
+
+from __future__ import annotations
+
+import datetime
+import random
+import typing
+
+# Seeded users joined in the five years up to this date, unless the command is
+# given another one; a fixed date keeps the dataset the same from day to day.
+JOINED_BEFORE = datetime.datetime(2024, 1, 1, tzinfo=datetime.UTC)
+JOINED_SPAN = datetime.timedelta(days=5 * 365)
+# Share of the seeded users that can sign in.
+ACTIVE_RATIO = 0.97
+
+FIRST_NAMES = (
+    "Aaliyah", "Adam", "Aiko", "Alejandro", "Amara", "Ana", "Andrei", "Anna",
+    "Arjun", "Ben", "Camille", "Carlos", "Chen", "Chloe", "Daniel", "David",
+    "Elena", "Emma", "Fatima", "Felix", "Grace", "Hana", "Hugo", "Ibrahim",
+    "Isabel", "Ivan", "James", "Jin", "Julia", "Kofi", "Lars", "Laura", "Leila",
+    "Liam", "Lucas", "Maria", "Mateo", "Mei", "Mohammed", "Nadia", "Noah",
+    "Olga", "Omar", "Priya", "Rafael", "Sara", "Sofia", "Tariq", "Yuki", "Zoe",
+)  # fmt: skip
+LAST_NAMES = (
+    "Ahmed", "Andersen", "Bauer", "Chen", "Costa", "Dubois", "Fernandez",
+    "Garcia", "Gonzalez", "Hansen", "Ivanov", "Jensen", "Kim", "Kowalski",
+    "Kumar", "Lee", "Lopez", "Martin", "Meyer", "Moreau", "Muller", "Nakamura",
+    "Nguyen", "Novak", "Okafor", "Patel", "Petrov", "Rossi", "Santos", "Sato",
+    "Schmidt", "Silva", "Singh", "Smith", "Tanaka", "Wang", "Williams", "Wong",
+)  # fmt: skip
+
+
+def user_rows(  # noqa: PLR0913
+    start: int,
+    stop: int,
+    *,
+    seed: str,
+    password: str,
+    domain: str = "example.com",
+    joined_before: datetime.datetime = JOINED_BEFORE,
+) -> list[dict[str, typing.Any]]:
+    """
+    Rows for ``soclone.users.bulk.load_users`` of the users numbered ``start``
+    to ``stop``.
+
+    The random generator is seeded from ``seed`` and ``start``, so the same
+    arguments always give the same rows. Nothing is hashed: ``password`` is
+    usually one precomputed hash for every row, and emails are unique by
+    number.
+    """
+    rng = random.Random(f"{seed}-{start}")
+    span = int(JOINED_SPAN.total_seconds())
+    rows = []
+    for number in range(start, stop):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        rows.append(
+            {
+                "email": f"{first}.{last}.{number}@{domain}".lower(),
+                "name": f"{first} {last}",
+                "password": password,
+                "is_active": rng.random() < ACTIVE_RATIO,
+                "is_staff": False,
+                "is_superuser": False,
+                "date_joined": joined_before
+                - datetime.timedelta(seconds=rng.randrange(span)),
+            },
+        )
+    return rows
@@ -0,0 +1,26 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from soclone.core.pagecache import invalidate_page
+from soclone.users.backends import invalidate_user
+from soclone.users.models import User
+
+
+@receiver(post_save, sender=User, dispatch_uid="users_invalidate_cached_user_save")
+@receiver(post_delete, sender=User, dispatch_uid="users_invalidate_cached_user_del")
+def invalidate_cached_user(sender, instance, **kwargs):
+    # Password changes and deactivation are saves too. Invalidate again once
+    # the transaction commits: a request that read the old row in the meantime
+    # may have cached it under the new generation.
+    invalidate_user(instance.pk)
+    transaction.on_commit(partial(invalidate_user, instance.pk))
+
+
+@receiver(post_save, sender=User, dispatch_uid="users_invalidate_profile_page")
+def invalidate_profile_page(sender, instance, **kwargs):
+    invalidate_page(instance.get_absolute_url())
+    transaction.on_commit(partial(invalidate_page, instance.get_absolute_url()))
@@ -0,0 +1,17 @@
+from allauth.account.models import EmailAddress
+
+from soclone.stats.counters import CounterDefinition
+from soclone.stats.counters import DailyCounterDefinition
+from soclone.stats.counters import register
+from soclone.users.models import User
+
+register(CounterDefinition("users.total", User))
+register(CounterDefinition("users.active", User, filter={"is_active": True}))
+register(DailyCounterDefinition("users.signups", User, "date_joined"))
+register(
+    CounterDefinition(
+        "users.verified_emails",
+        EmailAddress,
+        filter={"verified": True},
+    ),
+)
@@ -1,11 +1,48 @@
-from django.contrib.auth import get_user_model
+import contextlib
 
-from config import celery_app
+from django.conf import settings
+from django.core.files.storage import default_storage
 
-User = get_user_model()
+from config import celery_app
+from soclone.core.pagecache import invalidate_page
+from soclone.stats.counters import get_count
+from soclone.users.avatars import avatar_files
+from soclone.users.avatars import generate_renditions
+from soclone.users.backends import invalidate_user
+from soclone.users.models import User
 
 
-@celery_app.task()
+@celery_app.task(ignore_result=False)
 def get_users_count():
     """A pointless Celery task to demonstrate usage."""
-    return User.objects.count()
+    return get_count("users.total")
+
+
+@celery_app.task(autoretry_for=(OSError,), retry_backoff=True, max_retries=5)
+def generate_avatar_renditions(user_id, name, stale=()):
+    """
+    Generate the renditions of avatar ``name`` and record them on the user.
+
+    ``stale`` lists the files of the avatar it replaced, deleted once the new
+    one is in place. If the user uploaded yet another avatar meanwhile, the
+    renditions are discarded instead.
+    """
+    stale = list(stale)
+    renditions = None
+    if name:
+        # A missing file was already replaced, and deleted, by a later upload.
+        with contextlib.suppress(FileNotFoundError):
+            renditions = generate_renditions(name, settings.AVATAR_SIZES)
+    if renditions is not None:
+        # A queryset update: the user may have changed anything else since.
+        updated = User.objects.filter(pk=user_id, avatar=name).update(
+            avatar_renditions=renditions,
+        )
+        if updated:
+            # update() doesn't send post_save, so drop the cached copies here.
+            invalidate_user(user_id)
+            invalidate_page(User(pk=user_id).get_absolute_url())
+        else:
+            stale.extend(avatar_files(name, renditions))
+    for stale_name in stale:
+        default_storage.delete(stale_name)
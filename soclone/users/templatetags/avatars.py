@@ -0,0 +1,23 @@
+from django import template
+from django.core.files.storage import default_storage
+from django.urls import reverse
+
+register = template.Library()
+
+
+@register.inclusion_tag("users/avatar.html")
+def avatar(user, size=64):
+    """
+    Render ``user``'s avatar at ``size`` pixels: the smallest rendition at
+    least that large, or an identicon until renditions exist.
+    """
+    context = {"user": user, "size": size}
+    available = sorted(int(rendition) for rendition in user.avatar_renditions)
+    if available:
+        best = next((s for s in available if s >= size), available[-1])
+        formats = user.avatar_renditions[str(best)]
+        context["webp"] = default_storage.url(formats["webp"])
+        context["jpeg"] = default_storage.url(formats["jpeg"])
+    else:
+        context["placeholder"] = reverse("users:identicon", kwargs={"pk": user.pk})
+    return context
@@ -22,6 +22,12 @@ class TestUserAdmin:
         response = admin_client.get(url, data={"q": "test"})
         assert response.status_code == HTTPStatus.OK
 
+    def test_search_email(self, admin_client, user):
+        url = reverse("admin:users_user_changelist")
+        response = admin_client.get(url, data={"q": user.email[1:-1].upper()})
+        assert response.status_code == HTTPStatus.OK
+        assert list(response.context["cl"].result_list) == [user]
+
     def test_add(self, admin_client):
         url = reverse("admin:users_user_add")
         response = admin_client.get(url)
@@ -0,0 +1,125 @@
+import io
+from http import HTTPStatus
+
+import pytest
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.template import Context
+from django.template import Template
+from django.urls import reverse
+from PIL import Image
+
+from soclone.users.avatars import generate_renditions
+from soclone.users.avatars import identicon
+from soclone.users.jobs import regenerate_avatar_renditions
+from soclone.users.models import User
+
+pytestmark = pytest.mark.django_db
+
+
+def _image(fmt="PNG", size=(400, 300), mode="RGBA"):
+    buffer = io.BytesIO()
+    Image.new(mode, size, (200, 30, 30, 128)[: len(mode)]).save(buffer, fmt)
+    return buffer.getvalue()
+
+
+@pytest.fixture()
+def upload(client, user, settings, django_capture_on_commit_callbacks):
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    client.force_login(user)
+
+    def upload(content, name="me.png"):
+        with django_capture_on_commit_callbacks(execute=True):
+            return client.post(
+                reverse("users:update"),
+                {"name": user.name, "avatar": SimpleUploadedFile(name, content)},
+            )
+
+    return upload
+
+
+def test_generate_renditions():
+    name = default_storage.save("avatars/1/original.png", io.BytesIO(_image()))
+
+    renditions = generate_renditions(name, [64, 256])
+
+    assert set(renditions) == {"64", "256"}
+    for size, formats in renditions.items():
+        for fmt, rendition in formats.items():
+            with default_storage.open(rendition) as file, Image.open(file) as image:
+                assert image.size == (int(size), int(size))
+                assert image.format == {"webp": "WEBP", "jpeg": "JPEG"}[fmt]
+
+
+def test_identicon_is_stable():
+    assert identicon(1) == identicon(1)
+    assert identicon(1) != identicon(2)
+    assert identicon(1).startswith("<svg")
+
+
+def test_upload(upload, user):
+    response = upload(_image())
+
+    assert response.status_code == HTTPStatus.FOUND
+    user = User.objects.get(pk=user.pk)
+    assert user.avatar.name.startswith(f"avatars/{user.pk}/")
+    assert set(user.avatar_renditions) == {"64", "256"}
+    assert default_storage.exists(user.avatar_renditions["64"]["webp"])
+
+
+def test_replacing_deletes_old_files(upload, user):
+    upload(_image())
+    old = User.objects.get(pk=user.pk)
+
+    upload(_image("JPEG", mode="RGB"), name="me.jpg")
+
+    assert not default_storage.exists(old.avatar.name)
+    assert not default_storage.exists(old.avatar_renditions["256"]["jpeg"])
+    assert default_storage.exists(User.objects.get(pk=user.pk).avatar.name)
+
+
+def test_regenerate_renditions_job(upload, user, settings):
+    upload(_image())
+    old = User.objects.get(pk=user.pk)
+    settings.AVATAR_SIZES = [48]
+
+    regenerate_avatar_renditions(User.objects.filter(pk=user.pk))
+
+    user = User.objects.get(pk=user.pk)
+    assert set(user.avatar_renditions) == {"48"}
+    assert default_storage.exists(user.avatar.name)
+    assert not default_storage.exists(old.avatar_renditions["64"]["webp"])
+
+
+def test_oversized_upload_is_rejected(upload, user, settings):
+    settings.AVATAR_MAX_UPLOAD_SIZE = 10
+
+    response = upload(_image())
+
+    assert response.status_code == HTTPStatus.OK
+    assert "avatar" in response.context["form"].errors
+    assert not User.objects.get(pk=user.pk).avatar
+
+
+def test_avatar_tag(user):
+    template = Template("{% load avatars %}{% avatar user 48 %}")
+
+    assert reverse("users:identicon", kwargs={"pk": user.pk}) in template.render(
+        Context({"user": user}),
+    )
+
+    user.avatar_renditions = {
+        "64": {"webp": "a/64.webp", "jpeg": "a/64.jpeg"},
+        "256": {"webp": "a/256.webp", "jpeg": "a/256.jpeg"},
+    }
+    html = template.render(Context({"user": user}))
+    assert "a/64.webp" in html
+    assert "a/256" not in html
+
+
+def test_identicon_view(client, user):
+    response = client.get(reverse("users:identicon", kwargs={"pk": user.pk}))
+
+    assert response.status_code == HTTPStatus.OK
+    assert response["Content-Type"] == "image/svg+xml"
+    assert "max-age" in response["Cache-Control"]
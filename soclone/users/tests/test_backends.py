@@ -0,0 +1,107 @@
+import pytest
+from django.contrib.auth import BACKEND_SESSION_KEY
+from django.contrib.auth import HASH_SESSION_KEY
+from django.contrib.auth import SESSION_KEY
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.sessions.backends.cache import SessionStore
+from django.core.cache import cache
+from django.http import HttpResponse
+
+from soclone.users.backends import USER_KEY
+from soclone.users.backends import CachedModelBackend
+from soclone.users.backends import _generation
+from soclone.users.models import User
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture()
+def backend():
+    return CachedModelBackend()
+
+
+class TestCachedModelBackend:
+    def test_cached(self, backend, user, django_assert_num_queries):
+        with django_assert_num_queries(1):
+            backend.get_user(user.pk)
+        with django_assert_num_queries(0):
+            cached = backend.get_user(user.pk)
+
+        assert cached == user
+
+    def test_save_invalidates(self, backend, user, django_assert_num_queries):
+        backend.get_user(user.pk)
+        user.name = "Renamed"
+        user.save()
+
+        with django_assert_num_queries(1):
+            assert backend.get_user(user.pk).name == "Renamed"
+
+    def test_deactivation(self, backend, user):
+        backend.get_user(user.pk)
+        user.is_active = False
+        user.save()
+
+        assert backend.get_user(user.pk) is None
+
+    def test_delete_invalidates(self, backend, user):
+        pk = user.pk
+        backend.get_user(pk)
+        user.delete()
+
+        assert backend.get_user(pk) is None
+
+    def test_stale_generation(self, backend, user):
+        # A request that read the row before a save and caches it afterwards
+        # writes under the old generation, which is never read again.
+        generation = _generation(user.pk)
+        stale = User.objects.get(pk=user.pk)
+        user.name = "Renamed"
+        user.save()
+        cache.set(USER_KEY.format(pk=user.pk, generation=generation), stale)
+
+        assert backend.get_user(user.pk).name == "Renamed"
+
+
+class TestAuthenticationMiddleware:
+    @pytest.fixture()
+    def session_key(self, user):
+        session = SessionStore()
+        session[SESSION_KEY] = str(user.pk)
+        session[BACKEND_SESSION_KEY] = "soclone.users.backends.CachedModelBackend"
+        session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+        session.save()
+        return session.session_key
+
+    def _user(self, rf, session_key):
+        request = rf.get("/")
+        request.session = SessionStore(session_key)
+        AuthenticationMiddleware(lambda request: HttpResponse())(request)
+        return request.user
+
+    def test_steady_state_queries(
+        self,
+        rf,
+        user,
+        session_key,
+        django_assert_num_queries,
+    ):
+        with django_assert_num_queries(1):
+            assert self._user(rf, session_key) == user
+        with django_assert_num_queries(0):
+            assert self._user(rf, session_key) == user
+
+    def test_password_change(self, rf, user, session_key):
+        assert self._user(rf, session_key).is_authenticated
+
+        user.set_password("a new password")
+        user.save()
+
+        assert not self._user(rf, session_key).is_authenticated
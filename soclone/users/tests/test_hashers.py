@@ -0,0 +1,72 @@
+from http import HTTPStatus
+
+import pytest
+from django.contrib.auth.hashers import check_password
+from django.contrib.auth.hashers import make_password
+from django.http import HttpResponse
+from django.urls import reverse
+
+from soclone.users.hashers import PasswordHashingPoolSaturated
+from soclone.users.hashers import _get_pool
+from soclone.users.hashers import reset_pool
+from soclone.users.middleware import PasswordHashingBackpressureMiddleware
+from soclone.users.tests.factories import UserFactory
+
+
+@pytest.fixture()
+def _pooled_hasher(settings):
+    settings.PASSWORD_HASHERS = ["soclone.users.hashers.PooledArgon2PasswordHasher"]
+    settings.PASSWORD_HASHING_POOL_SIZE = 1
+    yield
+    reset_pool(wait=True)
+
+
+@pytest.mark.usefixtures("_pooled_hasher")
+class TestPooledArgon2PasswordHasher:
+    def test_roundtrip(self):
+        encoded = make_password("lètmein")
+
+        assert encoded.startswith("argon2$")
+        assert check_password("lètmein", encoded)
+        assert not check_password("letmein", encoded)
+
+    def test_saturated(self, settings):
+        settings.PASSWORD_HASHING_POOL_MAX_PENDING = 0
+        settings.PASSWORD_HASHING_POOL_TIMEOUT = 0
+
+        with pytest.raises(PasswordHashingPoolSaturated):
+            make_password("lètmein")
+
+    @pytest.mark.django_db()
+    def test_sign_in_while_saturated(self, client, settings):
+        settings.PASSWORD_HASHING_POOL_MAX_PENDING = 1
+        settings.PASSWORD_HASHING_POOL_TIMEOUT = 0
+        user = UserFactory(password="lètmein")  # noqa: S106
+        # Another request is waiting on the pool.
+        _, slots = _get_pool()
+        slots.acquire()
+
+        response = client.post(
+            reverse("account_login"),
+            {"login": user.email, "password": "lètmein"},
+        )
+
+        slots.release()
+        assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+        assert response["Retry-After"] == str(
+            settings.PASSWORD_HASHING_POOL_RETRY_AFTER,
+        )
+
+
+def test_backpressure_middleware(rf, settings):
+    def get_response(request):
+        return HttpResponse()
+
+    middleware = PasswordHashingBackpressureMiddleware(get_response)
+    request = rf.post("/accounts/login/")
+
+    response = middleware.process_exception(request, PasswordHashingPoolSaturated())
+
+    assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert response["Retry-After"] == str(settings.PASSWORD_HASHING_POOL_RETRY_AFTER)
+    assert middleware.process_exception(request, ValueError()) is None
@@ -0,0 +1,94 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from soclone.users.models import User
+from soclone.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def import_users(path, *args):
+    out = StringIO()
+    call_command("import_users", str(path), "--workers=1", *args, stdout=out)
+    return out.getvalue()
+
+
+def test_import_csv(tmp_path):
+    source = tmp_path / "users.csv"
+    source.write_text(
+        "email,name,password\n"
+        "alice@EXAMPLE.com,Alice,s3cret-Pass\n"
+        "bob@example.com,Bob,\n",
+    )
+
+    output = import_users(source)
+
+    assert "Imported 2 users from 2 rows" in output
+    alice = User.objects.get(email="alice@example.com")
+    assert alice.name == "Alice"
+    assert alice.check_password("s3cret-Pass")
+    assert not User.objects.get(email="bob@example.com").has_usable_password()
+    assert not (tmp_path / "users.csv.import-state").exists()
+
+
+def test_import_jsonl_skips_duplicates(tmp_path):
+    UserFactory(email="taken@example.com")
+    source = tmp_path / "users.jsonl"
+    source.write_text(
+        "\n".join(
+            json.dumps(record)
+            for record in [
+                {"email": "taken@example.com", "name": "Taken"},
+                {"email": "new@example.com", "name": "New", "is_staff": True},
+                {"email": "new@example.com", "name": "Again"},
+                {"name": "No email"},
+            ]
+        ),
+    )
+    duplicates = tmp_path / "duplicates.txt"
+
+    output = import_users(source, "--chunk-size=2", f"--duplicates={duplicates}")
+
+    assert "Imported 1 users from 4 rows (2 duplicates, 1 without email)" in output
+    assert User.objects.get(email="new@example.com").is_staff
+    assert User.objects.get(email="taken@example.com").name != "Taken"
+    assert duplicates.read_text().splitlines() == [
+        "taken@example.com",
+        "new@example.com",
+    ]
+
+
+def test_import_resumes_from_checkpoint(tmp_path):
+    source = tmp_path / "users.csv"
+    source.write_text(
+        "email,name\nfirst@example.com,First\nsecond@example.com,Second\n",
+    )
+    state = tmp_path / "users.csv.import-state"
+    state.write_text(
+        json.dumps({"path": str(source.resolve()), "rows": 1, "inserted": 1}),
+    )
+
+    output = import_users(source)
+
+    assert "Resuming after row 1." in output
+    assert "Imported 2 users from 2 rows" in output
+    assert list(User.objects.values_list("email", flat=True)) == [
+        "second@example.com",
+    ]
+
+
+@pytest.mark.parametrize(
+    ("option", "value"),
+    [("--workers", "0"), ("--chunk-size", "0"), ("--chunk-size", "-1")],
+)
+def test_import_rejects_invalid_sizes(tmp_path, option, value):
+    source = tmp_path / "users.csv"
+    source.write_text("email\nfirst@example.com\n")
+
+    with pytest.raises(CommandError, match=option):
+        import_users(source, f"{option}={value}")
+    assert not User.objects.exists()
@@ -0,0 +1,61 @@
+import datetime
+from io import StringIO
+
+import pytest
+from allauth.account.models import EmailAddress
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from soclone.stats.models import Counter
+from soclone.users.models import User
+from soclone.users.seeding import JOINED_BEFORE
+from soclone.users.seeding import JOINED_SPAN
+
+pytestmark = pytest.mark.django_db
+
+
+def seed(*args):
+    out = StringIO()
+    call_command("seed", "--workers=1", "--batch-size=10", *args, stdout=out)
+    return out.getvalue()
+
+
+def test_seed():
+    output = seed("--users=25", "--password=s3cret-Pass")
+
+    assert "Seeded 25 users (0 existed already)" in output
+    assert User.objects.count() == 25  # noqa: PLR2004
+    user = User.objects.order_by("?")[0]
+    assert user.name
+    assert user.email.endswith("@example.com")
+    assert user.check_password("s3cret-Pass")
+    assert EmailAddress.objects.filter(verified=True, primary=True).count() == 25  # noqa: PLR2004
+    assert Counter.objects.get(name="users.total").value == 25  # noqa: PLR2004
+
+
+def test_seed_is_deterministic_and_resumable():
+    seed("--users=15", "--seed=a")
+    first = set(User.objects.values_list("email", "name", "date_joined"))
+    User.objects.filter(email__in=[email for email, *_ in sorted(first)[:5]]).delete()
+
+    output = seed("--users=15", "--seed=a")
+
+    assert "Seeded 5 users (10 existed already)" in output
+    assert set(User.objects.values_list("email", "name", "date_joined")) == first
+
+
+def test_seed_needs_a_worker():
+    with pytest.raises(CommandError, match="--workers"):
+        seed("--users=1", "--workers=0")
+
+
+def test_seed_joins_users_before_a_fixed_date():
+    seed("--users=10")
+    joined = User.objects.values_list("date_joined", flat=True)
+    assert all(JOINED_BEFORE - JOINED_SPAN <= when < JOINED_BEFORE for when in joined)
+
+    User.objects.all().delete()
+    seed("--users=10", "--joined-before=2030-06-01")
+    joined_before = datetime.datetime(2030, 6, 1, tzinfo=datetime.UTC)
+    joined = User.objects.values_list("date_joined", flat=True)
+    assert all(joined_before - JOINED_SPAN <= when < joined_before for when in joined)
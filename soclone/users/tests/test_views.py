@@ -1,6 +1,7 @@
 from http import HTTPStatus
 
 import pytest
+from asgiref.sync import async_to_sync
 from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.models import AnonymousUser
@@ -81,21 +82,46 @@ class TestUserRedirectView:
         view.request = request
         assert view.get_redirect_url() == f"/users/{user.pk}/"
 
+    def test_redirect(self, user: User, client):
+        client.force_login(user)
+
+        response = client.get(reverse("users:redirect"))
+
+        assert response.status_code == HTTPStatus.FOUND
+        assert response.url == f"/users/{user.pk}/"
+
 
 class TestUserDetailView:
     def test_authenticated(self, user: User, rf: RequestFactory):
         request = rf.get("/fake-url/")
         request.user = UserFactory()
-        response = user_detail_view(request, pk=user.pk)
+        response = async_to_sync(user_detail_view)(request, pk=user.pk)
 
         assert response.status_code == HTTPStatus.OK
 
     def test_not_authenticated(self, user: User, rf: RequestFactory):
         request = rf.get("/fake-url/")
         request.user = AnonymousUser()
-        response = user_detail_view(request, pk=user.pk)
+        response = async_to_sync(user_detail_view)(request, pk=user.pk)
         login_url = reverse(settings.LOGIN_URL)
 
         assert isinstance(response, HttpResponseRedirect)
         assert response.status_code == HTTPStatus.FOUND
         assert response.url == f"{login_url}?next=/fake-url/"
+
+    def test_own_profile(self, user: User, client, query_budget):
+        client.force_login(user)
+
+        # The session and the signed-in user; the profile is the same user.
+        with query_budget(2):
+            response = client.get(reverse("users:detail", kwargs={"pk": user.pk}))
+
+        assert response.status_code == HTTPStatus.OK
+        assert response.context["object"] == user
+
+    def test_not_found(self, user: User, client):
+        client.force_login(user)
+
+        response = client.get(reverse("users:detail", kwargs={"pk": user.pk + 1}))
+
+        assert response.status_code == HTTPStatus.NOT_FOUND
@@ -1,5 +1,6 @@
 from django.urls import path
 
+from soclone.users.views import identicon_view
 from soclone.users.views import user_detail_view
 from soclone.users.views import user_redirect_view
 from soclone.users.views import user_update_view
@@ -9,4 +10,5 @@ urlpatterns = [
     path("~redirect/", view=user_redirect_view, name="redirect"),
     path("~update/", view=user_update_view, name="update"),
     path("<int:pk>/", view=user_detail_view, name="detail"),
+    path("<int:pk>/identicon.svg", view=identicon_view, name="identicon"),
 ]
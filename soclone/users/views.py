@@ -1,29 +1,93 @@
+from functools import partial
+
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.messages.views import SuccessMessageMixin
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from django.db import transaction
+from django.http import Http404
+from django.http import HttpResponse
 from django.urls import reverse
+from django.utils.decorators import method_decorator
 from django.utils.translation import gettext_lazy as _
+from django.views.decorators.cache import cache_page
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.csrf import csrf_protect
 from django.views.generic import DetailView
 from django.views.generic import RedirectView
 from django.views.generic import UpdateView
 
+from soclone.core.pagecache import cache_anonymous_page
+from soclone.core.views import AsyncLoginRequiredMixin
+from soclone.users.avatars import avatar_files
+from soclone.users.avatars import identicon
+from soclone.users.forms import UserUpdateForm
+from soclone.users.tasks import generate_avatar_renditions
+
 User = get_user_model()
 
 
-class UserDetailView(LoginRequiredMixin, DetailView):
+class UserDetailView(AsyncLoginRequiredMixin, DetailView):
     model = User
     slug_field = "id"
     slug_url_kwarg = "id"
 
+    async def get(self, request, *args, **kwargs):
+        self.object = await self.aget_object()
+        context = self.get_context_data(object=self.object)
+        return self.render_to_response(context)
+
+    async def aget_object(self):
+        pk = self.kwargs[self.pk_url_kwarg]
+        # AsyncLoginRequiredMixin has loaded the user already, most often
+        # from the cache: don't query for it again on their own profile.
+        if self.request.user.pk == pk:
+            return self.request.user
+        try:
+            return await self.get_queryset().aget(pk=pk)
+        except User.DoesNotExist as exc:
+            raise Http404(_("No user found matching the query")) from exc
 
-user_detail_view = UserDetailView.as_view()
 
+# Read-only: skip ATOMIC_REQUESTS so reads can be served by a replica.
+user_detail_view = transaction.non_atomic_requests(
+    cache_anonymous_page(UserDetailView.as_view()),
+)
 
+
+# The upload handlers have to be replaced before CsrfViewMiddleware reads
+# request.POST, so CSRF is checked in dispatch() instead.
+@method_decorator(csrf_exempt, name="dispatch")
 class UserUpdateView(LoginRequiredMixin, SuccessMessageMixin, UpdateView):
     model = User
-    fields = ["name"]
+    form_class = UserUpdateForm
     success_message = _("Information successfully updated")
 
+    def dispatch(self, request, *args, **kwargs):
+        # Stream uploads to a temporary file rather than holding small ones in
+        # memory; the storage copies them from there in chunks.
+        request.upload_handlers = [TemporaryFileUploadHandler(request)]
+        return csrf_protect(super().dispatch)(request, *args, **kwargs)
+
+    def form_valid(self, form):
+        if "avatar" not in form.changed_data:
+            return super().form_valid(form)
+        user = form.instance
+        # form.initial still holds the file the user had before this upload.
+        stale = avatar_files(form.initial["avatar"].name, user.avatar_renditions)
+        user.avatar_renditions = {}
+        response = super().form_valid(form)
+        transaction.on_commit(
+            partial(
+                generate_avatar_renditions.delay,
+                user.pk,
+                user.avatar.name,
+                stale=stale,
+            ),
+        )
+        return response
+
     def get_success_url(self):
         # for mypy to know that the user is authenticated
         assert self.request.user.is_authenticated
@@ -36,11 +100,24 @@ class UserUpdateView(LoginRequiredMixin, SuccessMessageMixin, UpdateView):
 user_update_view = UserUpdateView.as_view()
 
 
-class UserRedirectView(LoginRequiredMixin, RedirectView):
+class UserRedirectView(AsyncLoginRequiredMixin, RedirectView):
     permanent = False
+    # Async views need every handler to be async; only these are.
+    http_method_names = ["get", "head", "options"]
+
+    async def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+    head = get
 
     def get_redirect_url(self):
         return reverse("users:detail", kwargs={"pk": self.request.user.pk})
 
 
-user_redirect_view = UserRedirectView.as_view()
+user_redirect_view = transaction.non_atomic_requests(UserRedirectView.as_view())
+
+
+@transaction.non_atomic_requests
+@cache_page(settings.AVATAR_PLACEHOLDER_MAX_AGE)
+def identicon_view(request, pk):
+    return HttpResponse(identicon(pk), content_type="image/svg+xml")